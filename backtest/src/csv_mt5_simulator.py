@@ -79,6 +79,8 @@ class TradeResult:
     price: float = 0.0
     volume: float = 0.0
     error: str = ""
+    retcode: int = 0
+    sl_modified: bool = False
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -426,6 +428,15 @@ class CSVMT5Simulator:
             spread=spread,
         )
     
+    def get_ticks(self, symbols) -> Dict[str, TickData]:
+        """Get current ticks for several symbols (skips symbols without data)."""
+        ticks = {}
+        for symbol in symbols:
+            tick = self.get_tick(symbol)
+            if tick is not None:
+                ticks[symbol] = tick
+        return ticks
+    
     def get_ohlcv(
         self,
         symbol: str,
@@ -684,6 +695,10 @@ class CSVMT5Simulator:
             volume=close_volume,
         )
     
+    def close_positions_bulk(self, tickets: List[int]) -> List[TradeResult]:
+        """Close several positions; one TradeResult per ticket."""
+        return [self.close_position(ticket) for ticket in tickets]
+    
     def _calculate_pnl_at_price(self, pos: Position, close_price: float, volume: float = None) -> float:
         """Calculate P&L for closing a position at a specific price.
         
@@ -729,6 +744,13 @@ class CSVMT5Simulator:
         """Partially close a position (alias for close_position with volume)."""
         return self.close_position(ticket, volume, close_price)
     
+    def partial_close_and_modify(self, ticket: int, volume: float, new_sl: float) -> TradeResult:
+        """Partial close followed by SL move (MT5Client interface)."""
+        result = self.partial_close(ticket, volume)
+        if result.success and ticket in self._positions:
+            result.sl_modified = self.modify_sl_tp(ticket, sl=new_sl).success
+        return result
+    
     # ═══════════════════════════════════════════════════════════════════════
     # MT5Client INTERFACE - ORDERS
     # ═══════════════════════════════════════════════════════════════════════
@@ -863,6 +885,10 @@ class CSVMT5Simulator:
             return True
         return False
     
+    def cancel_pending_orders_bulk(self, tickets: List[int]) -> List[bool]:
+        """Cancel several pending orders; one success flag per ticket."""
+        return [self.cancel_pending_order(ticket) for ticket in tickets]
+    
     def get_pending_orders(self, symbol: str = None) -> List[PendingOrder]:
         """Get pending orders."""
         orders = list(self._pending_orders.values())
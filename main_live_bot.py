@@ -28,12 +28,19 @@ Configuration:
 """
 
 import os
+import re
+import bisect
+import heapq
+import random
 import sys
 import time
+import threading
 import json
+import logging
 import argparse
 import signal as sig_module
 from datetime import datetime, timezone, timedelta
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
@@ -123,7 +130,71 @@ import weekend_gap_manager as wgm
 CHALLENGE_MODE = True
 
 
-@dataclass
+# MT5 trade return codes worth retrying (transient); anything else fails fast.
+# 0 = no reply / unknown error, kept retryable to match the old behaviour.
+MT5_RETRYABLE_RETCODES = frozenset({
+    0,
+    10004,  # TRADE_RETCODE_REQUOTE
+    10012,  # TRADE_RETCODE_TIMEOUT
+    10020,  # TRADE_RETCODE_PRICE_CHANGED
+    10021,  # TRADE_RETCODE_PRICE_OFF
+    10024,  # TRADE_RETCODE_TOO_MANY_REQUESTS
+    10031,  # TRADE_RETCODE_CONNECTION
+})
+
+
+def _write_json_atomic(path, data):
+    """Write JSON to a temp file and swap it in, so a crash never leaves a half-written state file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for pacing MT5 requests.
+    
+    acquire() only sleeps when the bucket is empty, so bursts up to
+    `capacity` go through immediately and the long-run rate stays <= `rate`/s.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, n: float = 1.0):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            wait = (n - self.tokens) / self.rate if self.tokens < n else 0.0
+            # Reserve the tokens now; waiting callers queue up behind each other
+            self.tokens -= n
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Symbol classification for pip-value fallback - compiled once, one pass per group
+_GBP_INDEX_RE = re.compile(r"UK100|FTSE")
+_USD_INDEX_RE = re.compile(r"NAS100|SPX500|SP500|US100|US500|US30")
+_USD_ASSET_RE = re.compile(r"XAU|XAG|BTC|ETH")
+
+# Known correct pip values for metals/crypto (safety net):
+# XAU: pip_size=0.01, 100oz → $1.00/pip/lot
+# XAG: pip_size=0.001, 5000oz → $5.00/pip/lot
+METAL_PIP_RANGES = {
+    "XAU": (0.5, 2.0),    # $1/pip ± margin for tick_value variation
+    "XAG": (3.0, 8.0),    # $5/pip ± margin
+    "BTC": (0.5, 2.0),
+    "ETH": (0.5, 2.0),
+}
+
+
+@dataclass(slots=True)
 class PendingSetup:
     """Tracks a pending trade setup waiting for entry."""
     symbol: str
@@ -140,6 +211,7 @@ class PendingSetup:
     quality_factors: int = 0
     entry_distance_r: float = 0.0
     created_at: str = ""
+    created_at_ts: float = 0.0  # Epoch seconds of created_at, for cheap age checks
     order_ticket: Optional[int] = None
     status: str = "pending"
     lot_size: float = 0.0
@@ -151,6 +223,16 @@ class PendingSetup:
     tp4_hit: bool = False  # Added for 5-TP system
     tp5_hit: bool = False  # Added for 5-TP system
     progressive_trail_applied: bool = False  # Progressive trailing: SL moved to TP1 at 0.8R
+    inv_risk: float = 0.0  # 1 / |entry - SL|, cached at fill (entry and SL are fixed from then on)
+    direction_sign: int = 0  # +1 bullish, -1 bearish, 0 = not cached yet
+    signed_risk: float = 0.0  # entry - SL: +risk bullish, -risk bearish (trail SL = entry + signed_risk * R)
+    
+    def cache_risk(self) -> None:
+        """Cache inverse risk, direction sign and signed risk for per-tick R calculations."""
+        risk = abs(self.entry_price - self.stop_loss)
+        self.inv_risk = 1.0 / risk if risk > 0 else 0.0
+        self.direction_sign = 1 if self.direction == "bullish" else -1
+        self.signed_risk = self.entry_price - self.stop_loss
     
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -189,7 +271,8 @@ RANGE_MIN_CONFLUENCE = 4
 TRADABLE_SYMBOLS = BROKER_CONFIG.get_tradable_symbols()
 
 log = setup_logger("tradr", log_file="logs/tradr_live.log")
-running = True
+# Set on shutdown - waits on it (instead of time.sleep) return as soon as the bot stops
+shutdown_event = threading.Event()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -458,9 +541,8 @@ def load_best_params_from_file():
 
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully."""
-    global running
     log.info("Shutdown signal received, stopping bot...")
-    running = False
+    shutdown_event.set()
 
 
 sig_module.signal(sig_module.SIGINT, signal_handler)
@@ -493,20 +575,18 @@ class LiveTradingBot:
         
         Strictly compares current equity to fixed day_start_equity from challenge_risk_state.json.
         """
-        import threading
         from datetime import date
         
         def ddd_protection_worker():
-            from time import sleep
             last_log_time = 0
             
-            while running:
+            while not shutdown_event.is_set():
                 try:
                     # Get current account info
                     account = self.mt5.get_account_info()
                     if not account:
                         log.warning("[DDD Protection] Could not get MT5 account info - connection lost?")
-                        sleep(5)
+                        shutdown_event.wait(5)
                         continue
                     current_equity = account.get("equity", 0)
                     current_balance = account.get("balance", 0)
@@ -514,9 +594,12 @@ class LiveTradingBot:
                     # Get fixed day_start_equity from challenge_manager (never updated during day)
                     if not self.challenge_manager:
                         log.error("[DDD Protection] CRITICAL: challenge_manager is None! Protection NOT active!")
-                        sleep(5)
+                        shutdown_event.wait(5)
                         continue
                     
+                    # One UTC timestamp per check, reused by the halt branches below
+                    now_utc = datetime.now(timezone.utc)
+                    
                     # AUTOMATIC RESET: Check if DDD halt is from a PREVIOUS day and auto-reset
                     today = date.today()
                     today_str = today.strftime("%Y-%m-%d")
@@ -533,12 +616,9 @@ class LiveTradingBot:
                         self.challenge_manager.daily_loss_pct = 0.0
                         self.challenge_manager._save_state()
                         # Clear halt
-                        self.ddd_halted = False
-                        self.ddd_halt_reason = ""
-                        self.ddd_halt_date = None
-                        self._save_ddd_halt_state()
+                        self._clear_ddd_halt()
                         log.info(f"[DDD Protection] ✅ Trading re-enabled for new day with fresh DDD baseline: ${current_equity:,.2f}")
-                        sleep(5)
+                        shutdown_event.wait(5)
                         continue
                     
                     # CRITICAL FIX: Check if new day and sync
@@ -555,10 +635,7 @@ class LiveTradingBot:
                             self.challenge_manager.day_start_balance = current_balance
                             self.challenge_manager.current_date = today
                             self.challenge_manager._save_state()
-                            self.ddd_halted = False
-                            self.ddd_halt_reason = ""
-                            self.ddd_halt_date = None
-                            self._save_ddd_halt_state()
+                            self._clear_ddd_halt()
                             log.info(f"[DDD Protection] ✅ Trading re-enabled for new day with fresh DDD baseline")
                         else:
                             # Normal new day transition - sync with MT5
@@ -616,10 +693,10 @@ class LiveTradingBot:
                         
                         self.ddd_halted = True
                         self.ddd_halt_reason = f"TDD {total_dd_pct:.2f}% >= {tdd_halt_pct:.2f}% - ACCOUNT BREACHED"
-                        self.ddd_halt_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+                        self.ddd_halt_date = now_utc.strftime("%Y-%m-%d")
                         self._save_ddd_halt_state()  # Persist halt state
                         log.error(f"  🛑 TRADING PERMANENTLY HALTED. {self.ddd_halt_reason}")
-                        sleep(60)  # Sleep longer - this is permanent
+                        shutdown_event.wait(60)  # Sleep longer - this is permanent
                         continue
                     
                     # === TIER 3: DDD >= 3.5% → CLOSE ALL ===
@@ -635,11 +712,11 @@ class LiveTradingBot:
                         # Set a flag to halt trading until next day
                         self.ddd_halted = True
                         self.ddd_halt_reason = f"DDD {daily_loss_pct:.2f}% >= {halt_pct:.2f}%"
-                        self.ddd_halt_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+                        self.ddd_halt_date = now_utc.strftime("%Y-%m-%d")
                         self._save_ddd_halt_state()  # Persist halt state for restart survival
                         log.error(f"  🛑 Trading halted until next day. Reason: {self.ddd_halt_reason}")
                         # Sleep longer to avoid repeated closes
-                        sleep(30)
+                        shutdown_event.wait(30)
                     
                     # === TIER 2: DDD >= 3.0% → REDUCE RISK (cancel pending orders only) ===
                     elif daily_loss_pct >= reduce_pct:
@@ -685,13 +762,13 @@ class LiveTradingBot:
                         self._ddd_warning_logged = False
                         self._ddd_reduce_logged = False
                     
-                    sleep(5)
+                    shutdown_event.wait(5)
                 except Exception as e:
                     log.error(f"[DDD Protection] Exception: {e}")
                     import traceback
                     log.error(traceback.format_exc())
-                    sleep(5)
-        t = threading.Thread(target=ddd_protection_worker, daemon=True)
+                    shutdown_event.wait(5)
+        t = threading.Thread(target=ddd_protection_worker, name="ddd-protection", daemon=True)
         t.start()
     
     def _emergency_close_all(self):
@@ -776,6 +853,19 @@ class LiveTradingBot:
     MAX_SPREAD_WAIT_HOURS = 120  # 5 days - matches backtest max_wait_bars=5
     MAX_ENTRY_WAIT_HOURS = 120  # 5 days - matches backtest max_wait_bars=5
     WEEKEND_GAP_THRESHOLD_PCT = 1.0  # 1% gap threshold
+    RECONNECT_MIN_DELAY_SECONDS = 5    # First wait after a failed reconnect
+    RECONNECT_MAX_DELAY_SECONDS = 60   # Backoff cap (was a fixed 60s)
+    RISK_SNAPSHOT_EPSILON_USD = 1.0  # Pre-scan risk check reuses last result below this equity move
+    # Scan request pacing (token bucket) - tune per broker request limits
+    SCAN_MT5_RATE_PER_SEC = 5.0
+    SCAN_MT5_BURST = 10
+    # monitor_live_pnl thresholds (daily % of day-start balance, DD % of initial balance)
+    PNL_CANCEL_DAILY_PCT = 3.0   # Cancel pending orders
+    PNL_CANCEL_DD_PCT = 6.0
+    PNL_CLOSE_DAILY_PCT = 3.5    # Start closing worst positions
+    PNL_CLOSE_DD_PCT = 7.0
+    PNL_BREACH_DAILY_PCT = 5.0   # Hard limit breached
+    PNL_BREACH_DD_PCT = 10.0
     
     def __init__(self, immediate_scan: bool = False):
         self.ddd_halted = False
@@ -799,7 +889,26 @@ class LiveTradingBot:
         self.last_entry_check_time: Optional[datetime] = None  # Track entry proximity checks
         self.scan_count = 0
         self.pending_setups: Dict[str, PendingSetup] = {}
+        self._pending_dirty = False  # Set by _mark_pending_dirty, cleared on flush
+        # Background writer for pending_setups.json (started by run(), None = write inline)
+        self._pending_writer = None
+        self._pending_write_cond = None
+        self._pending_snapshot: Optional[Dict] = None  # Newest snapshot not yet on disk
+        self._pending_writing = False  # Writer thread is busy writing a snapshot
+        self._pending_last_saved: Optional[Dict] = None  # Last snapshot successfully written (skip identical saves)
         self.symbol_map: Dict[str, str] = {}  # our_symbol -> broker_symbol
+        self._lot_limits: Dict[str, Dict] = {}  # broker_symbol -> min_lot/max_lot/lot_step
+        # Crypto (24/7) symbols - TRADABLE_SYMBOLS is static, classify once
+        self._crypto_symbols = frozenset(s for s in TRADABLE_SYMBOLS if is_crypto_pair(s))
+        # (date, day_start, balance, equity, daily_loss_pct, total_dd_pct) of the last pre-scan risk check
+        self._last_risk_snapshot: Optional[tuple] = None
+        # get_my_positions() snapshot shared within one run() loop iteration
+        self._positions_cache: Optional[List] = None
+        self._positions_cache_key: Optional[datetime] = None
+        # Fallback news blackout windows per weekday (static config - build once)
+        self._news_windows = self._build_news_windows()
+        # Paces scan-time MT5 requests instead of fixed per-symbol sleeps
+        self._mt5_bucket = TokenBucket(rate=self.SCAN_MT5_RATE_PER_SEC, capacity=self.SCAN_MT5_BURST)
         self.challenge_manager: Optional[ChallengeRiskManager] = None
         # First run detection
         self.immediate_scan_requested = immediate_scan
@@ -898,7 +1007,7 @@ class LiveTradingBot:
             log.info(f"⏰ MIDNIGHT SYNC: Day start equity PRESERVED (manually set today): ${old_day_start:,.2f}")
         elif manually_set_date:
             # Manual set from previous day - clear it and update
-            log.info(f"⏰ MIDNIGHT SYNC: Manual override from {manually_set_date} expired - updating now")
+            log.info("⏰ MIDNIGHT SYNC: Manual override from %s expired - updating now", manually_set_date)
             self.challenge_manager.day_start_equity_manually_set_date = ""
             self.challenge_manager.update_day_start_equity(current_equity, current_balance)
             new_value = max(current_equity, current_balance)
@@ -907,14 +1016,15 @@ class LiveTradingBot:
             # Normal midnight sync per 5ers rules
             self.challenge_manager.update_day_start_equity(current_equity, current_balance)
             new_value = max(current_equity, current_balance)
-            log.info("=" * 70)
-            log.info(f"⏰ MIDNIGHT EQUITY SYNC (5ers DDD baseline)")
-            log.info(f"  Previous day_start_equity: ${old_day_start:,.2f}")
-            log.info(f"  Midnight equity: ${current_equity:,.2f}")
-            log.info(f"  Midnight balance: ${current_balance:,.2f}")
-            log.info(f"  → NEW day_start_equity = MAX(equity, balance) = ${new_value:,.2f}")
-            log.info(f"  → DDD limit (5%) = ${new_value * 0.95:,.2f}")
-            log.info("=" * 70)
+            if log.isEnabledFor(logging.INFO):
+                log.info("=" * 70)
+                log.info(f"⏰ MIDNIGHT EQUITY SYNC (5ers DDD baseline)")
+                log.info(f"  Previous day_start_equity: ${old_day_start:,.2f}")
+                log.info(f"  Midnight equity: ${current_equity:,.2f}")
+                log.info(f"  Midnight balance: ${current_balance:,.2f}")
+                log.info(f"  → NEW day_start_equity = MAX(equity, balance) = ${new_value:,.2f}")
+                log.info(f"  → DDD limit (5%) = ${new_value * 0.95:,.2f}")
+                log.info("=" * 70)
         
         # Track that we've done today's sync
         self.last_midnight_sync_date = today
@@ -922,7 +1032,7 @@ class LiveTradingBot:
         
         # Schedule next midnight sync
         self.next_midnight_sync_time = get_next_midnight_sync_time()
-        log.info(f"⏰ Next midnight sync: {self.next_midnight_sync_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        log.info("⏰ Next midnight sync: %s", self.next_midnight_sync_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
 
     # ═══════════════════════════════════════════════════════════════════════════
     # DDD HALT STATE PERSISTENCE - Survives bot restarts within same day
@@ -1013,10 +1123,7 @@ class LiveTradingBot:
                 else:
                     # New day - clear old halt
                     log.info(f"DDD halt from {halt_date} expired (new day: {today})")
-                    self.ddd_halted = False
-                    self.ddd_halt_reason = ""
-                    self.ddd_halt_date = None
-                    self._save_ddd_halt_state()  # Clear the file
+                    self._clear_ddd_halt()  # Clear the file
         except Exception as e:
             log.error(f"Error loading DDD halt state: {e}")
             self.ddd_halted = False
@@ -1025,17 +1132,24 @@ class LiveTradingBot:
     def _save_ddd_halt_state(self):
         """Save DDD halt state to file."""
         try:
+            now_utc = datetime.now(timezone.utc)
             state = {
                 "halted": self.ddd_halted,
                 "reason": self.ddd_halt_reason,
-                "halt_date": self.ddd_halt_date or datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-                "saved_at": datetime.now(timezone.utc).isoformat(),
+                "halt_date": self.ddd_halt_date or now_utc.strftime("%Y-%m-%d"),
+                "saved_at": now_utc.isoformat(),
             }
-            with open(self.DDD_HALT_STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
+            _write_json_atomic(self.DDD_HALT_STATE_FILE, state)
         except Exception as e:
             log.error(f"Error saving DDD halt state: {e}")
     
+    def _clear_ddd_halt(self):
+        """Clear all DDD halt fields and persist them with a single write."""
+        self.ddd_halted = False
+        self.ddd_halt_reason = ""
+        self.ddd_halt_date = None
+        self._save_ddd_halt_state()
+    
     # ═══════════════════════════════════════════════════════════════════════════
     # FIRST RUN DETECTION - Scan immediately after restart/weekend
     # ═══════════════════════════════════════════════════════════════════════════
@@ -1066,6 +1180,30 @@ class LiveTradingBot:
         
         return False
     
+    def _build_news_windows(self) -> Dict[int, tuple]:
+        """
+        Precompute fallback blackout windows from FIVEERS_CONFIG.major_news_events.
+        
+        Returns {weekday: (starts, ends, event_minutes)} in minutes since midnight UTC,
+        sorted by event time. All windows share the same width, so starts and ends
+        are both sorted and one bisect on `ends` finds the only candidate window.
+        """
+        before = FIVEERS_CONFIG.news_blackout_minutes_before
+        after = FIVEERS_CONFIG.news_blackout_minutes_after
+        by_day: Dict[int, List[int]] = {}
+        for day_of_week, hour, minute in FIVEERS_CONFIG.major_news_events:
+            by_day.setdefault(day_of_week, []).append(hour * 60 + minute)
+        
+        windows = {}
+        for day_of_week, minutes in by_day.items():
+            minutes.sort()
+            windows[day_of_week] = (
+                [m - before for m in minutes],
+                [m + after for m in minutes],
+                minutes,
+            )
+        return windows
+    
     def is_news_blackout(self) -> bool:
         """
         Check if currently in news event blackout period.
@@ -1100,19 +1238,14 @@ class LiveTradingBot:
             log.debug(f"MT5 calendar lookup failed, using fallback: {e}")
         
         # Fallback: hardcoded schedule (conservative - triggers on all potential days)
-        for day_of_week, hour, minute in FIVEERS_CONFIG.major_news_events:
-            if now.weekday() != day_of_week:
-                continue
-            
-            # Create news event time for today
-            news_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # Calculate blackout window
-            blackout_start = news_time - timedelta(minutes=FIVEERS_CONFIG.news_blackout_minutes_before)
-            blackout_end = news_time + timedelta(minutes=FIVEERS_CONFIG.news_blackout_minutes_after)
-            
-            if blackout_start <= now <= blackout_end:
-                log.warning(f"📰 NEWS BLACKOUT (Fallback): {now.strftime('%H:%M UTC')} - Scheduled event at {news_time.strftime('%H:%M UTC')}")
+        day_windows = self._news_windows.get(now.weekday())
+        if day_windows:
+            starts, ends, event_minutes = day_windows
+            now_minute = now.hour * 60 + now.minute + (now.second + now.microsecond / 1e6) / 60
+            i = bisect.bisect_left(ends, now_minute)
+            if i < len(ends) and starts[i] <= now_minute:
+                news_minute = event_minutes[i]
+                log.warning(f"📰 NEWS BLACKOUT (Fallback): {now.strftime('%H:%M UTC')} - Scheduled event at {news_minute // 60:02d}:{news_minute % 60:02d} UTC")
                 return True
         
         return False
@@ -1137,8 +1270,7 @@ class LiveTradingBot:
     def _save_awaiting_spread(self):
         """Save signals waiting for better spread."""
         try:
-            with open(self.AWAITING_SPREAD_FILE, 'w') as f:
-                json.dump(self.awaiting_spread, f, indent=2, default=str)
+            _write_json_atomic(self.AWAITING_SPREAD_FILE, self.awaiting_spread)
         except Exception as e:
             log.error(f"Error saving awaiting_spread: {e}")
     
@@ -1162,8 +1294,7 @@ class LiveTradingBot:
     def _save_awaiting_entry(self):
         """Save signals waiting for price proximity."""
         try:
-            with open(self.AWAITING_ENTRY_FILE, 'w') as f:
-                json.dump(self.awaiting_entry, f, indent=2, default=str)
+            _write_json_atomic(self.AWAITING_ENTRY_FILE, self.awaiting_entry)
         except Exception as e:
             log.error(f"Error saving awaiting_entry: {e}")
     
@@ -1225,7 +1356,7 @@ class LiveTradingBot:
         else:
             log.info(f"[{symbol}] Added to entry queue - waiting for price proximity")
     
-    def check_awaiting_entry_signals(self):
+    def check_awaiting_entry_signals(self, now: Optional[datetime] = None):
         """
         Check signals waiting for price to approach entry level.
         Called every ENTRY_CHECK_INTERVAL_MINUTES (default: 30 min).
@@ -1244,7 +1375,8 @@ class LiveTradingBot:
         if not self.awaiting_entry:
             return
         
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         signals_to_remove = []
         proximity_r = FIVEERS_CONFIG.limit_order_proximity_r  # 0.3R
         
@@ -1295,7 +1427,7 @@ class LiveTradingBot:
             # broker_symbol already defined above
             tick = self.mt5.get_tick(broker_symbol)
             if not tick:
-                log.debug(f"[{symbol}] Cannot get tick, will retry later")
+                log.debug("[%s] Cannot get tick, will retry later", symbol)
                 continue
             
             entry = setup.get("entry", 0)
@@ -1320,7 +1452,7 @@ class LiveTradingBot:
             
             # Log distance for monitoring
             if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
-                log.debug(f"[{symbol}] Entry {entry_distance_r:.2f}R away (beyond {FIVEERS_CONFIG.max_entry_distance_r}R) - keeping order, price may return")
+                log.debug("[%s] Entry %.2fR away (beyond %sR) - keeping order, price may return", symbol, entry_distance_r, FIVEERS_CONFIG.max_entry_distance_r)
             
             # Check if price is close enough to place limit order
             if entry_distance_r <= proximity_r:
@@ -1343,7 +1475,7 @@ class LiveTradingBot:
                 # Still too far
                 setup["check_count"] = setup.get("check_count", 0) + 1
                 setup["last_check"] = now.isoformat()
-                log.debug(f"[{symbol}] Price at {entry_distance_r:.2f}R from entry, waiting for {proximity_r}R")
+                log.debug("[%s] Price at %.2fR from entry, waiting for %sR", symbol, entry_distance_r, proximity_r)
         
         # Remove processed signals
         for symbol in signals_to_remove:
@@ -1378,7 +1510,7 @@ class LiveTradingBot:
         self._save_awaiting_spread()
         log.info(f"[{symbol}] Added to spread queue - waiting for better conditions")
     
-    def check_awaiting_spread_signals(self):
+    def check_awaiting_spread_signals(self, now: Optional[datetime] = None):
         """
         Check signals waiting for better spread.
         Called every SPREAD_CHECK_INTERVAL_MINUTES.
@@ -1391,7 +1523,8 @@ class LiveTradingBot:
         if not self.awaiting_spread:
             return
         
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         signals_to_remove = []
         
         log.info(f"Checking {len(self.awaiting_spread)} signals waiting for spread improvement...")
@@ -1463,7 +1596,7 @@ class LiveTradingBot:
                 if self.place_setup_order(setup, check_spread=False):
                     signals_to_remove.append(symbol)
             else:
-                log.debug(f"[{symbol}] Still waiting - {conditions['reason']}")
+                log.debug("[%s] Still waiting - %s", symbol, conditions['reason'])
                 setup["check_count"] = setup.get("check_count", 0) + 1
                 setup["last_check"] = now.isoformat()
         
@@ -1617,7 +1750,7 @@ class LiveTradingBot:
     # WEEKEND GAP RISK MANAGEMENT - Tier 1 Conservative Strategy
     # ═══════════════════════════════════════════════════════════════════════════
 
-    def handle_friday_position_closing(self):
+    def handle_friday_position_closing(self, now: Optional[datetime] = None):
         """
         TIER 1: Correlation-aware Friday position closing
         Runs Friday 16:00+ UTC to reduce weekend gap exposure
@@ -1629,7 +1762,8 @@ class LiveTradingBot:
         - Hold positions 0.5R-1.6R in sweet spot (max 2 per correlation group, max 5 total)
         - Hold ALL crypto (BTC/ETH - no weekend gap risk)
         """
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
 
         # Only run Friday 16:00+ UTC
         if now.weekday() != 4 or now.hour < 16:
@@ -1960,6 +2094,9 @@ class LiveTradingBot:
                 log.info(f"[{internal_symbol}] Lot size change: {old_lot_size:.2f} → {new_lot_size:.2f} ({lot_change_pct:+.1f}%)")
                 
                 # Cancel old order and place new one
+                # (MT5 TRADE_ACTION_MODIFY cannot change volume of a pending order,
+                # so cancel + replace is the only way to resize it. Filled positions
+                # are never resized - lot size is fixed at order placement.)
                 cancel_result = self.mt5.cancel_pending_order(order.ticket)
                 
                 if cancel_result:
@@ -1984,16 +2121,18 @@ class LiveTradingBot:
                         orders_updated += 1
                         
                         # Update setup with new ticket
-                        if setup and hasattr(setup, 'order_ticket'):
+                        if setup:
                             setup.order_ticket = new_order_result.order_id
-                            self._save_pending_setups()
+                            self._mark_pending_dirty()
                     else:
                         log.error(f"  ✗ Failed to place new order - order cancelled but not replaced!")
                 else:
                     log.error(f"  ✗ Failed to cancel old order {order.ticket}")
             else:
-                log.debug(f"[{internal_symbol}] Lot size OK: {old_lot_size:.2f} (change: {lot_change_pct:.1f}%)")
+                log.debug("[%s] Lot size OK: %.2f (change: %.1f%%)", internal_symbol, old_lot_size, lot_change_pct)
         
+        # One save for all replaced tickets
+        self._flush_pending_setups()
         self.last_limit_order_update = now
         
         total_checked = len(pending_orders) - orders_skipped
@@ -2005,7 +2144,7 @@ class LiveTradingBot:
             log.warning(f"⚠️ Skipped {orders_skipped} orders (no SL or entry)")
         log.info("=" * 70)
 
-    def handle_sunday_gap_detection(self):
+    def handle_sunday_gap_detection(self, now: Optional[datetime] = None):
         """
         SUNDAY EVENING GAP DETECTION
         Runs Sunday 22:00-23:59 UTC when forex markets reopen
@@ -2015,7 +2154,8 @@ class LiveTradingBot:
         - Close positions where SL was gapped through
         - Close positions with catastrophic gaps (> 2% adverse)
         """
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
 
         day_of_week = now.weekday()
         hour = now.hour
@@ -2137,14 +2277,107 @@ class LiveTradingBot:
             self.pending_setups = {}
     
     def _save_pending_setups(self):
-        """Save pending setups to file."""
+        """
+        Save pending setups to file.
+        
+        The snapshot is always taken here, on the calling thread. When the
+        background writer is running the disk write is handed off to it
+        (newest snapshot wins), otherwise it is written inline.
+        """
         try:
             data = {symbol: setup.to_dict() for symbol, setup in self.pending_setups.items()}
-            with open(self.PENDING_SETUPS_FILE, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            self._pending_dirty = False
+            
+            cond = self._pending_write_cond
+            if cond is not None:
+                with cond:
+                    if self._pending_writer is not None:
+                        # Identical to what is on disk and nothing queued/in flight - nothing to write
+                        if (self._pending_snapshot is None and not self._pending_writing
+                                and data == self._pending_last_saved):
+                            return
+                        self._pending_snapshot = data
+                        cond.notify()
+                        return
+            
+            # Identical to what was last saved - nothing to write
+            if data == self._pending_last_saved:
+                return
+            
+            _write_json_atomic(self.PENDING_SETUPS_FILE, data)
+            self._pending_last_saved = data
         except Exception as e:
             log.error(f"Error saving pending setups: {e}")
     
+    def _start_pending_writer(self):
+        """Start the background thread that writes pending_setups.json off the trading loop."""
+        if self._pending_writer is not None:
+            return
+        
+        cond = threading.Condition()
+        
+        def pending_writer_worker():
+            while True:
+                with cond:
+                    while self._pending_snapshot is None and self._pending_writer is not None:
+                        cond.wait()
+                    data, self._pending_snapshot = self._pending_snapshot, None
+                    self._pending_writing = data is not None
+                
+                if data is None:
+                    return  # Stopped and nothing left to write
+                
+                try:
+                    _write_json_atomic(self.PENDING_SETUPS_FILE, data)
+                    saved = data
+                except Exception as e:
+                    log.error(f"Error saving pending setups: {e}")
+                    saved = None  # Unknown state on disk - next save must write again
+                
+                with cond:
+                    self._pending_last_saved = saved
+                    self._pending_writing = False
+        
+        self._pending_write_cond = cond
+        self._pending_writer = threading.Thread(target=pending_writer_worker, name="pending-writer", daemon=True)
+        self._pending_writer.start()
+    
+    def _stop_pending_writer(self):
+        """Stop the background writer after it has written any queued snapshot."""
+        writer = self._pending_writer
+        if writer is None:
+            return
+        
+        with self._pending_write_cond:
+            self._pending_writer = None
+            self._pending_write_cond.notify()
+        writer.join(timeout=10)
+    
+    def _positions_cached(self, now: Optional[datetime] = None) -> List:
+        """
+        get_my_positions(), memoized per run() loop iteration (keyed on its `now`).
+        
+        Without `now` (called outside the loop) this always fetches fresh.
+        """
+        if now is None or self._positions_cache_key != now:
+            self._positions_cache = self.mt5.get_my_positions()
+            self._positions_cache_key = now
+        return self._positions_cache
+    
+    def _invalidate_positions_cache(self):
+        """Drop the loop's positions snapshot after positions were closed/modified."""
+        self._positions_cache = None
+        self._positions_cache_key = None
+    
+    def _mark_pending_dirty(self):
+        """Record a pending_setups change; written once by _flush_pending_setups()."""
+        self._pending_dirty = True
+    
+    def _flush_pending_setups(self):
+        """Save pending setups only if something changed since the last save."""
+        if self._pending_dirty:
+            self._save_pending_setups()
+    
     def _load_trading_days(self):
         """Load trading days from file for FTMO minimum trading days tracking."""
         try:
@@ -2296,7 +2529,9 @@ class LiveTradingBot:
             broker_symbol = get_broker_symbol(our_symbol, broker_type)
             
             # First try the mapped symbol
-            if self.mt5.get_symbol_info(broker_symbol):
+            info = self.mt5.get_symbol_info(broker_symbol)
+            if info:
+                self._cache_lot_limits(broker_symbol, info)
                 self.symbol_map[our_symbol] = broker_symbol
                 mapped_count += 1
                 log.info(f"✓ {our_symbol:15s} -> {broker_symbol}")
@@ -2640,7 +2875,7 @@ class LiveTradingBot:
                             rescaled_count += 1
                             log.info(f"[{internal_symbol}]   ✓ Rescaled: ticket {order.ticket} → {new_result.order_id}")
                             # Update pending_setups with new ticket
-                            if setup and hasattr(setup, 'order_ticket'):
+                            if setup:
                                 setup.order_ticket = new_result.order_id
                                 setup.lot_size = new_lot
                                 self._save_pending_setups()
@@ -2749,6 +2984,7 @@ class LiveTradingBot:
                 quality_factors=0,
                 entry_distance_r=0.0,
                 created_at=datetime.now(timezone.utc).isoformat(),
+                created_at_ts=time.time(),
                 order_ticket=pos.ticket,
                 status="filled",
                 lot_size=pos.volume,
@@ -2986,6 +3222,21 @@ class LiveTradingBot:
         }
         return data
     
+    def _prefetch_candle_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch candle data for many symbols up front, one symbol after another.
+        
+        Symbols that fail are left out - scan_symbol fetches them itself.
+        """
+        candle_data = {}
+        for symbol in symbols:
+            try:
+                self._mt5_bucket.acquire()
+                candle_data[symbol] = self.get_candle_data(symbol)
+            except Exception as e:
+                log.warning(f"[{symbol}] Candle prefetch failed: {e}")
+        return candle_data
+    
     def check_existing_position(self, symbol: str) -> bool:
         """Check if we already have a position on this symbol."""
         # symbol is in OANDA format, convert to broker format for checking
@@ -3063,46 +3314,37 @@ class LiveTradingBot:
             log.warning(f"[{symbol}] Error getting MT5 tick_value: {e}")
         
         # FALLBACK: Calculate based on exchange rates
-        log.debug(f"[{symbol}] Using exchange rate calculation for pip value")
+        log.debug("[%s] Using exchange rate calculation for pip value", symbol)
         
         # Normalize symbol
         sym_upper = symbol.upper().replace("_", "")
         
         # UK100 is GBP-denominated
-        if "UK100" in sym_upper or "FTSE" in sym_upper:
+        if _GBP_INDEX_RE.search(sym_upper):
             try:
                 gbpusd_tick = self.mt5.get_tick("GBPUSD")
                 if gbpusd_tick and gbpusd_tick.bid > 0:
                     gbpusd_rate = (gbpusd_tick.bid + gbpusd_tick.ask) / 2
                     pip_value = 1.0 * gbpusd_rate
-                    log.debug(f"[{symbol}] Fallback pip value: £1 × GBPUSD({gbpusd_rate:.4f}) = ${pip_value:.4f}/point")
+                    log.debug("[%s] Fallback pip value: £1 × GBPUSD(%.4f) = $%.4f/point", symbol, gbpusd_rate, pip_value)
                     return pip_value
             except Exception:
                 pass
             return 1.40  # Safe estimate
         
         # US indices - already in USD
-        if any(x in sym_upper for x in ["NAS100", "SPX500", "SP500", "US100", "US500", "US30"]):
+        if _USD_INDEX_RE.search(sym_upper):
             return base_pip_value
         
         # Metals and Crypto - already in USD
         # CRITICAL: Validate against known ranges for metals
-        if any(x in sym_upper for x in ["XAU", "XAG", "BTC", "ETH"]):
-            # Known correct pip values for metals (safety net):
-            # XAU: pip_size=0.01, 100oz → $1.00/pip/lot
-            # XAG: pip_size=0.001, 5000oz → $5.00/pip/lot
-            METAL_PIP_RANGES = {
-                "XAU": (0.5, 2.0),    # $1/pip ± margin for tick_value variation
-                "XAG": (3.0, 8.0),    # $5/pip ± margin
-                "BTC": (0.5, 2.0),
-                "ETH": (0.5, 2.0),
-            }
-            for metal, (low, high) in METAL_PIP_RANGES.items():
-                if metal in sym_upper:
-                    if not (low <= base_pip_value <= high):
-                        log.warning(f"[{symbol}] Specs pip_value ${base_pip_value:.2f} outside expected range ${low}-${high} for {metal}, using midpoint")
-                        base_pip_value = (low + high) / 2
-                    break
+        match = _USD_ASSET_RE.search(sym_upper)
+        if match:
+            metal = match.group(0)
+            low, high = METAL_PIP_RANGES[metal]
+            if not (low <= base_pip_value <= high):
+                log.warning(f"[{symbol}] Specs pip_value ${base_pip_value:.2f} outside expected range ${low}-${high} for {metal}, using midpoint")
+                base_pip_value = (low + high) / 2
             return base_pip_value
         
         # FOREX - check quote currency
@@ -3161,9 +3403,34 @@ class LiveTradingBot:
                 log.warning(f"[{symbol}] Error calculating pip value for {quote_currency}: {e}")
         
         # Final fallback - always return a valid positive value
-        log.debug(f"[{symbol}] Using base pip value: ${base_pip_value:.2f}")
+        log.debug("[%s] Using base pip value: $%.2f", symbol, base_pip_value)
         return base_pip_value
     
+    def _cache_lot_limits(self, broker_symbol: str, info: Dict) -> Dict:
+        """Store broker volume limits from a get_symbol_info() result."""
+        limits = {
+            'min_lot': info.get('min_lot', 0.01),
+            'max_lot': info.get('max_lot', 100.0),
+            'lot_step': info.get('lot_step', 0.01),
+        }
+        self._lot_limits[broker_symbol] = limits
+        return limits
+    
+    def _get_lot_limits(self, broker_symbol: str) -> Optional[Dict]:
+        """
+        Get min_lot / max_lot / lot_step for a broker symbol.
+        
+        These are contract constants, so MT5 is only asked once per symbol.
+        (tick_value is NOT cached - it moves with exchange rates.)
+        """
+        limits = self._lot_limits.get(broker_symbol)
+        if limits is None:
+            info = self.mt5.get_symbol_info(broker_symbol)
+            if not info:
+                return None
+            limits = self._cache_lot_limits(broker_symbol, info)
+        return limits
+    
     def _calculate_lot_size_at_fill(
         self,
         symbol: str,
@@ -3194,12 +3461,19 @@ class LiveTradingBot:
             Lot size (float), or 0.0 if cannot calculate
         """
         from tradr.risk.position_sizing import calculate_lot_size
-        from ftmo_config import FIVEERS_CONFIG
         
         if not CHALLENGE_MODE or not self.challenge_manager:
             log.error(f"[{symbol}] Cannot calculate lot size - challenge manager not available")
             return 0.0
 
+        # Bind config thresholds once - avoids repeated attribute chains below
+        cfg = FIVEERS_CONFIG
+        daily_loss_halt_pct = cfg.daily_loss_halt_pct
+        daily_loss_reduce_pct = cfg.daily_loss_reduce_pct
+        daily_loss_warning_pct = cfg.daily_loss_warning_pct
+        total_dd_emergency_pct = cfg.total_dd_emergency_pct
+        total_dd_warning_pct = cfg.total_dd_warning_pct
+
         # Get CURRENT account snapshot (not stale snapshot from signal moment)
         snapshot = self.challenge_manager.get_account_snapshot()
         if snapshot is None:
@@ -3221,12 +3495,12 @@ class LiveTradingBot:
         log.info(f"[{symbol}] DDD/TDD check at fill: day_start_equity=${day_start_equity:.2f}, starting_balance=${starting_balance:.2f}, current_equity=${current_equity:.2f}, daily_loss_pct={daily_loss_pct:.2f}%, total_dd_pct={total_dd_pct:.2f}%")
 
         # Check if trading is halted
-        if daily_loss_pct >= FIVEERS_CONFIG.daily_loss_halt_pct:
-            log.warning(f"[{symbol}] Trading halted: daily loss {daily_loss_pct:.1f}% >= {FIVEERS_CONFIG.daily_loss_halt_pct}% (NO TRADE)")
+        if daily_loss_pct >= daily_loss_halt_pct:
+            log.warning(f"[{symbol}] Trading halted: daily loss {daily_loss_pct:.1f}% >= {daily_loss_halt_pct}% (NO TRADE)")
             return 0.0
 
-        if total_dd_pct >= FIVEERS_CONFIG.total_dd_emergency_pct:
-            log.warning(f"[{symbol}] Trading halted: total DD {total_dd_pct:.1f}% >= {FIVEERS_CONFIG.total_dd_emergency_pct}% (NO TRADE)")
+        if total_dd_pct >= total_dd_emergency_pct:
+            log.warning(f"[{symbol}] Trading halted: total DD {total_dd_pct:.1f}% >= {total_dd_emergency_pct}% (NO TRADE)")
             return 0.0
 
         # Get win/loss streaks
@@ -3236,13 +3510,13 @@ class LiveTradingBot:
         # Calculate risk percentage
         # Use risk_per_trade_pct from params (matches optimizer output)
         # but still apply DDD/TDD safety reductions
-        base_risk = getattr(self.params, 'risk_per_trade_pct', FIVEERS_CONFIG.risk_per_trade_pct)
+        base_risk = getattr(self.params, 'risk_per_trade_pct', cfg.risk_per_trade_pct)
         
         # Apply safety reductions based on drawdown levels
-        if daily_loss_pct >= FIVEERS_CONFIG.daily_loss_reduce_pct or total_dd_pct >= FIVEERS_CONFIG.total_dd_emergency_pct:
-            risk_pct = min(base_risk, FIVEERS_CONFIG.ultra_safe_risk_pct)
-        elif daily_loss_pct >= FIVEERS_CONFIG.daily_loss_warning_pct or total_dd_pct >= FIVEERS_CONFIG.total_dd_warning_pct:
-            risk_pct = min(base_risk, FIVEERS_CONFIG.max_risk_conservative_pct)
+        if daily_loss_pct >= daily_loss_reduce_pct or total_dd_pct >= total_dd_emergency_pct:
+            risk_pct = min(base_risk, cfg.ultra_safe_risk_pct)
+        elif daily_loss_pct >= daily_loss_warning_pct or total_dd_pct >= total_dd_warning_pct:
+            risk_pct = min(base_risk, cfg.max_risk_conservative_pct)
         else:
             risk_pct = base_risk
         
@@ -3252,8 +3526,8 @@ class LiveTradingBot:
             log.warning(f"[{symbol}] Risk percentage is 0 - trading halted (NO TRADE)")
             return 0.0
 
-        # Get symbol info
-        symbol_info = self.mt5.get_symbol_info(broker_symbol)
+        # Get broker volume limits (cached - contract constants)
+        symbol_info = self._get_lot_limits(broker_symbol)
         max_lot = symbol_info.get('max_lot', 100.0) if symbol_info else 100.0
         min_lot = symbol_info.get('min_lot', 0.01) if symbol_info else 0.01
 
@@ -3387,7 +3661,7 @@ class LiveTradingBot:
         
         return sum(true_ranges[-period:]) / period
     
-    def scan_symbol(self, symbol: str) -> Optional[Dict]:
+    def scan_symbol(self, symbol: str, data: Optional[Dict] = None) -> Optional[Dict]:
         """
         Scan a single symbol for trade setup.
         
@@ -3406,34 +3680,40 @@ class LiveTradingBot:
         6. Validate SL is appropriate
         
         Returns trade setup dict if signal is active AND tradeable, None otherwise.
+        
+        data: candle data already fetched by scan_all_symbols (fetched here if None).
         """
-        from ftmo_config import FIVEERS_CONFIG, get_pip_size, get_sl_limits
+        from ftmo_config import get_pip_size, get_sl_limits
+        
+        # Bind config thresholds once for this scan
+        max_entry_distance_r = FIVEERS_CONFIG.max_entry_distance_r
+        min_sl_atr_ratio = FIVEERS_CONFIG.min_sl_atr_ratio
         
         if symbol not in self.symbol_map:
-            log.debug(f"[{symbol}] Not available on this broker, skipping")
+            log.debug("[%s] Not available on this broker, skipping", symbol)
             return None
         
         broker_symbol = self.symbol_map[symbol]
-        log.info(f"[{symbol}] Scanning (OANDA: {symbol}, FTMO: {broker_symbol})...")
+        log.info("[%s] Scanning (OANDA: %s, FTMO: %s)...", symbol, symbol, broker_symbol)
         
         # Check if symbol was closed today (manual close or SL hit) - no re-entry until tomorrow
         if self.is_symbol_closed_today(symbol):
-            log.info(f"[{symbol}] Was closed today - no re-entry until tomorrow, skipping")
+            log.info("[%s] Was closed today - no re-entry until tomorrow, skipping", symbol)
             return None
         
         if self.check_existing_position(symbol):  # Use OANDA format - function converts internally
-            log.info(f"[{symbol}] Already in position, skipping")
+            log.info("[%s] Already in position, skipping", symbol)
             return None
         
         # DEDUP CHECK: Also check awaiting_entry and awaiting_spread queues
         # This prevents placing a new order if the symbol is already queued
         if symbol in self.awaiting_entry:
-            log.debug(f"[{symbol}] Already in entry queue - removing old signal, will re-evaluate")
+            log.debug("[%s] Already in entry queue - removing old signal, will re-evaluate", symbol)
             del self.awaiting_entry[symbol]
             self._save_awaiting_entry()
         
         if symbol in self.awaiting_spread:
-            log.debug(f"[{symbol}] Already in spread queue - removing old signal, will re-evaluate")
+            log.debug("[%s] Already in spread queue - removing old signal, will re-evaluate", symbol)
             del self.awaiting_spread[symbol]
             self._save_awaiting_spread()
         
@@ -3444,22 +3724,25 @@ class LiveTradingBot:
             existing = self.pending_setups[symbol]
             if existing.status == "filled":
                 # Already have open position - don't stack
-                log.info(f"[{symbol}] Already have filled position, skipping")
+                log.info("[%s] Already have filled position, skipping", symbol)
                 return None
             elif existing.status in ("pending", "halted"):
                 # Replace old pending with new signal
                 # IMPORTANT: Cancel the old MT5 pending order first!
                 if existing.order_ticket:
-                    log.info(f"[{symbol}] Cancelling old pending order (ticket {existing.order_ticket}) before replacing")
+                    log.info("[%s] Cancelling old pending order (ticket %s) before replacing", symbol, existing.order_ticket)
                     cancel_ok = self.mt5.cancel_pending_order(existing.order_ticket)
                     if not cancel_ok:
                         # Cancel FAILED - do NOT proceed, keep old order to avoid duplicates
                         log.error(f"[{symbol}] FAILED to cancel old order {existing.order_ticket} - keeping old setup to prevent duplicate")
                         return None
-                log.info(f"[{symbol}] Replacing old {existing.status} setup with new signal")
+                log.info("[%s] Replacing old %s setup with new signal", symbol, existing.status)
                 del self.pending_setups[symbol]
         
-        data = self.get_candle_data(symbol)
+        if data is None:
+            # Only waits when the broker request budget is used up
+            self._mt5_bucket.acquire()
+            data = self.get_candle_data(symbol)
         
         if not data["daily"] or len(data["daily"]) < 50:
             log.warning(f"[{symbol}] Insufficient daily data ({len(data.get('daily', []))} candles)")
@@ -3495,15 +3778,9 @@ class LiveTradingBot:
         # compute_confluence returns 5 TP levels; unpack all to avoid tuple mismatch errors
         entry, sl, tp1, tp2, tp3, tp4, tp5 = trade_levels
         
-        confluence_score = sum(1 for v in flags.values() if v)
-        
-        has_confirmation = flags.get("confirmation", False)
-        has_rr = flags.get("rr", False)
-        has_location = flags.get("location", False)
-        has_fib = flags.get("fib", False)
-        has_liquidity = flags.get("liquidity", False)
-        has_structure = flags.get("structure", False)
-        has_htf_bias = flags.get("htf_bias", False)
+        # Count every flag compute_confluence returns (same score as strategy_core);
+        # map(bool) keeps the iteration in C instead of a generator frame
+        confluence_score = sum(map(bool, flags.values()))
         
         # ALIGNED WITH strategy_core.py generate_signals() - quality derived from confluence
         # This ensures live bot signals match ftmo_challenge_analyzer signals
@@ -3529,12 +3806,14 @@ class LiveTradingBot:
             status = "scan_only"
         
         regime_str = "TREND" if atr_regime_ok else "RANGE"
-        log.info(f"[{symbol}] {direction.upper()} | Conf: {confluence_score} (min: {min_confluence}, {regime_str}) | Quality: {quality_factors} | Status: {status}")
+        log.info("[%s] %s | Conf: %s (min: %s, %s) | Quality: %s | Status: %s",
+                 symbol, direction.upper(), confluence_score, min_confluence, regime_str, quality_factors, status)
         
-        for pillar, is_met in flags.items():
-            marker = "✓" if is_met else "✗"
-            note = notes.get(pillar, "")[:50]
-            log.debug(f"  [{marker}] {pillar}: {note}")
+        if log.isEnabledFor(logging.DEBUG):
+            for pillar, is_met in flags.items():
+                marker = "✓" if is_met else "✗"
+                note = notes.get(pillar, "")[:50]
+                log.debug("  [%s] %s: %s", marker, pillar, note)
         
         if status != "active":
             return None
@@ -3558,11 +3837,12 @@ class LiveTradingBot:
         entry_distance = abs(current_price - entry)
         entry_distance_r = entry_distance / risk
         
-        if entry_distance_r > FIVEERS_CONFIG.max_entry_distance_r:
-            log.info(f"[{symbol}] Entry too far: {entry:.5f} is {entry_distance_r:.2f}R from current {current_price:.5f} (max: {FIVEERS_CONFIG.max_entry_distance_r}R)")
+        if entry_distance_r > max_entry_distance_r:
+            log.info("[%s] Entry too far: %.5f is %.2fR from current %.5f (max: %sR)",
+                     symbol, entry, entry_distance_r, current_price, max_entry_distance_r)
             return None
         
-        log.info(f"[{symbol}] Entry proximity OK: {entry_distance_r:.2f}R from current price")
+        log.info("[%s] Entry proximity OK: %.2fR from current price", symbol, entry_distance_r)
         
         # SL validation with asset-specific limits
         pip_size = get_pip_size(symbol)
@@ -3571,28 +3851,28 @@ class LiveTradingBot:
         
         # Min SL check - adjust if needed
         if sl_pips < min_sl_pips:
-            log.info(f"[{symbol}] SL too tight: {sl_pips:.1f} pips (min: {min_sl_pips})")
+            log.info("[%s] SL too tight: %.1f pips (min: %s)", symbol, sl_pips, min_sl_pips)
             if direction == "bullish":
                 sl = entry - (min_sl_pips * pip_size)
             else:
                 sl = entry + (min_sl_pips * pip_size)
             risk = abs(entry - sl)
             sl_pips = min_sl_pips
-            log.info(f"[{symbol}] SL adjusted to minimum: {sl:.5f} ({sl_pips:.1f} pips)")
+            log.info("[%s] SL adjusted to minimum: %.5f (%.1f pips)", symbol, sl, sl_pips)
         
         # ATR-based SL validation (same as backtest)
         atr = self._calculate_atr(daily_candles, period=14)
         if atr > 0:
             sl_atr_ratio = abs(entry - sl) / atr
             
-            if sl_atr_ratio < FIVEERS_CONFIG.min_sl_atr_ratio:
-                log.info(f"[{symbol}] SL too tight in ATR terms: {sl_atr_ratio:.2f} ATR (min: {FIVEERS_CONFIG.min_sl_atr_ratio})")
+            if sl_atr_ratio < min_sl_atr_ratio:
+                log.info("[%s] SL too tight in ATR terms: %.2f ATR (min: %s)", symbol, sl_atr_ratio, min_sl_atr_ratio)
                 if direction == "bullish":
-                    sl = entry - (atr * FIVEERS_CONFIG.min_sl_atr_ratio)
+                    sl = entry - (atr * min_sl_atr_ratio)
                 else:
-                    sl = entry + (atr * FIVEERS_CONFIG.min_sl_atr_ratio)
+                    sl = entry + (atr * min_sl_atr_ratio)
                 risk = abs(entry - sl)
-                log.info(f"[{symbol}] SL adjusted to {FIVEERS_CONFIG.min_sl_atr_ratio} ATR: {sl:.5f}")
+                log.info("[%s] SL adjusted to %s ATR: %.5f", symbol, min_sl_atr_ratio, sl)
             
         # ════════════════════════════════════════════════════════════════════════
         # 5-TP SYSTEM: Use tp*_r_multiple from current_params.json
@@ -3620,21 +3900,22 @@ class LiveTradingBot:
                 log.warning(f"[{symbol}] Current price {current_price:.5f} already above SL {sl:.5f} - skipping")
                 return None
         
-        log.info(f"[{symbol}] ✓ ACTIVE SIGNAL VALIDATED!")
-        log.info(f"  Direction: {direction.upper()}")
-        log.info(f"  Confluence: {confluence_score}/7")
-        log.info(f"  Current Price: {current_price:.5f}")
-        log.info(f"  Entry: {entry:.5f} ({entry_distance_r:.2f}R away)")
-        log.info(f"  SL: {sl:.5f} ({sl_pips:.1f} pips)")
-        log.info(f"  TP1: {tp1:.5f} ({self.params.tp1_r_multiple}R) -> {self.params.tp1_close_pct*100:.0f}%")
-        log.info(f"  TP2: {tp2:.5f} ({self.params.tp2_r_multiple}R) -> {self.params.tp2_close_pct*100:.0f}%")
-        log.info(f"  TP3: {tp3:.5f} ({self.params.tp3_r_multiple}R) -> {self.params.tp3_close_pct*100:.0f}%")
-        tp4_r = getattr(self.params, 'tp4_r_multiple', 0)
-        tp5_r = getattr(self.params, 'tp5_r_multiple', 0)
-        if tp4_r > 0:
-            log.info(f"  TP4: {tp4:.5f} ({tp4_r}R) -> {getattr(self.params, 'tp4_close_pct', 0.05)*100:.0f}%")
-        if tp5_r > 0:
-            log.info(f"  TP5: {tp5:.5f} ({tp5_r}R) -> CLOSE ALL remaining ({getattr(self.params, 'tp5_close_pct', 0.15)*100:.0f}%)")
+        if log.isEnabledFor(logging.INFO):
+            log.info(f"[{symbol}] ✓ ACTIVE SIGNAL VALIDATED!")
+            log.info(f"  Direction: {direction.upper()}")
+            log.info(f"  Confluence: {confluence_score}/7")
+            log.info(f"  Current Price: {current_price:.5f}")
+            log.info(f"  Entry: {entry:.5f} ({entry_distance_r:.2f}R away)")
+            log.info(f"  SL: {sl:.5f} ({sl_pips:.1f} pips)")
+            log.info(f"  TP1: {tp1:.5f} ({self.params.tp1_r_multiple}R) -> {self.params.tp1_close_pct*100:.0f}%")
+            log.info(f"  TP2: {tp2:.5f} ({self.params.tp2_r_multiple}R) -> {self.params.tp2_close_pct*100:.0f}%")
+            log.info(f"  TP3: {tp3:.5f} ({self.params.tp3_r_multiple}R) -> {self.params.tp3_close_pct*100:.0f}%")
+            tp4_r = getattr(self.params, 'tp4_r_multiple', 0)
+            tp5_r = getattr(self.params, 'tp5_r_multiple', 0)
+            if tp4_r > 0:
+                log.info(f"  TP4: {tp4:.5f} ({tp4_r}R) -> {getattr(self.params, 'tp4_close_pct', 0.05)*100:.0f}%")
+            if tp5_r > 0:
+                log.info(f"  TP5: {tp5:.5f} ({tp5_r}R) -> CLOSE ALL remaining ({getattr(self.params, 'tp5_close_pct', 0.15)*100:.0f}%)")
         
         return {
             "symbol": symbol,
@@ -3696,8 +3977,8 @@ class LiveTradingBot:
         worst_setup = None
         
         for sym, setup in pending_orders:
-            entry_dist_r = getattr(setup, 'entry_distance_r', 1.0)
-            confluence = getattr(setup, 'confluence_score', 4)
+            entry_dist_r = setup.entry_distance_r
+            confluence = setup.confluence_score
             score = confluence - entry_dist_r
             
             if score < worst_score:
@@ -3761,13 +4042,15 @@ class LiveTradingBot:
         confluence = setup["confluence"]
         quality_factors = setup["quality_factors"]
         entry_distance_r = setup.get("entry_distance_r", 0)
+        limit_order_proximity_r = FIVEERS_CONFIG.limit_order_proximity_r
+        immediate_entry_r = FIVEERS_CONFIG.immediate_entry_r
         
         # ═══════════════════════════════════════════════════════════════
         # ENTRY PROXIMITY CHECK - Wait for price to approach entry
         # If price is > 0.3R from entry, add to awaiting_entry queue
         # ═══════════════════════════════════════════════════════════════
-        if not skip_proximity_check and entry_distance_r > FIVEERS_CONFIG.limit_order_proximity_r:
-            log.info(f"[{symbol}] Price too far from entry ({entry_distance_r:.2f}R > {FIVEERS_CONFIG.limit_order_proximity_r}R)")
+        if not skip_proximity_check and entry_distance_r > limit_order_proximity_r:
+            log.info(f"[{symbol}] Price too far from entry ({entry_distance_r:.2f}R > {limit_order_proximity_r}R)")
             log.info(f"[{symbol}] Adding to entry queue - will check every {self.ENTRY_CHECK_INTERVAL_MINUTES} min")
             self.add_to_awaiting_entry(setup)
             return False
@@ -3776,7 +4059,7 @@ class LiveTradingBot:
         # SPREAD & VOLUME CHECK - Only for MARKET orders (immediate entry)
         # For LIMIT orders, spread at placement doesn't matter - we wait for our price
         # ═══════════════════════════════════════════════════════════════
-        is_market_order = entry_distance_r <= FIVEERS_CONFIG.immediate_entry_r
+        is_market_order = entry_distance_r <= immediate_entry_r
         
         if check_spread and is_market_order:
             conditions = self.check_market_conditions(symbol)
@@ -3816,7 +4099,7 @@ class LiveTradingBot:
         if symbol in self.pending_setups:
             existing = self.pending_setups[symbol]
             if existing.status in ("pending", "filled"):
-                log.info(f"[{symbol}] Already have {existing.status} setup at {existing.entry_price:.5f}, skipping")
+                log.info("[%s] Already have %s setup at %.5f, skipping", symbol, existing.status, existing.entry_price)
                 return False
         
         # Also check if we have an open position for this symbol
@@ -3839,9 +4122,9 @@ class LiveTradingBot:
                 log.error(f"[{symbol}] Cannot get account snapshot")
                 return False
             
-            # Challenge snapshot uses daily_loss_pct; fall back gracefully if fields are missing
-            daily_loss_pct = getattr(snapshot, "daily_loss_pct", 0)
-            total_dd_pct = getattr(snapshot, "total_dd_pct", 0)
+            # AccountSnapshot always carries these fields (dataclass with defaults)
+            daily_loss_pct = snapshot.daily_loss_pct
+            total_dd_pct = snapshot.total_dd_pct
             profit_pct = (snapshot.equity - self.challenge_manager.initial_balance) / self.challenge_manager.initial_balance * 100
             
             if daily_loss_pct >= FIVEERS_CONFIG.daily_loss_halt_pct:
@@ -3855,8 +4138,8 @@ class LiveTradingBot:
             # STATIC POSITION LIMIT - Match simulator behavior
             # Simple hard cap at 100 positions (unlimited trades)
             max_trades = 100
-            pending_count = len([s for s in self.pending_setups.values() if s.status == "pending"])
-            open_positions = getattr(snapshot, "open_positions", len(self.mt5.get_my_positions()) if self.mt5 else 0)
+            pending_count = sum(1 for s in self.pending_setups.values() if s.status == "pending")
+            open_positions = snapshot.open_positions
             total_exposure = open_positions + pending_count
 
             # Check against static max trades limit
@@ -3900,7 +4183,7 @@ class LiveTradingBot:
             self.add_to_awaiting_entry(setup)
             return False
         
-        if entry_distance_r <= FIVEERS_CONFIG.immediate_entry_r:
+        if is_market_order:
             order_type = "MARKET"
             log.info(f"[{symbol}] Price at entry ({entry_distance_r:.2f}R) - using MARKET ORDER")
             
@@ -3929,10 +4212,11 @@ class LiveTradingBot:
                 log.error(f"[{symbol}] Market order FAILED: {result.error}")
                 return False
             
-            log.info(f"[{symbol}] MARKET ORDER FILLED!")
-            log.info(f"  Order Ticket: {result.order_id}")
-            log.info(f"  Fill Price: {result.price:.5f}")
-            log.info(f"  Volume: {result.volume}")
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"[{symbol}] MARKET ORDER FILLED!")
+                log.info(f"  Order Ticket: {result.order_id}")
+                log.info("  Fill Price: %.5f", result.price)
+                log.info(f"  Volume: {result.volume}")
             
             self.risk_manager.record_trade_open(
                 symbol=broker_symbol,
@@ -3958,10 +4242,12 @@ class LiveTradingBot:
                 quality_factors=quality_factors,
                 entry_distance_r=entry_distance_r,
                 created_at=datetime.now(timezone.utc).isoformat(),
+                created_at_ts=time.time(),
                 order_ticket=result.order_id,
                 status="filled",
                 lot_size=lot_size,  # Actual lot size used for market order
             )
+            pending_setup.cache_risk()
             
         else:
             order_type = "PENDING"
@@ -3981,14 +4267,18 @@ class LiveTradingBot:
                 log.error(f"[{symbol}] Invalid lot size calculation: {lot_size}")
                 return False
             
-            log.info(f"[{symbol}] Placing PENDING ORDER:")
-            log.info(f"  Direction: {direction.upper()}")
-            log.info(f"  Entry Level: {entry:.5f}")
-            log.info(f"  SL: {sl:.5f}")
-            log.info(f"  TP1: {tp1:.5f}")
-            log.info(f"  TP3: {tp3:.5f} (closes ALL remaining)" if tp3 else "  TP3: N/A")
-            log.info(f"  Lot Size: {lot_size} (calculated at signal time)")
-            log.info(f"  Expiration: {FIVEERS_CONFIG.pending_order_expiry_hours} hours")
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"[{symbol}] Placing PENDING ORDER:")
+                log.info(f"  Direction: {direction.upper()}")
+                log.info("  Entry Level: %.5f", entry)
+                log.info("  SL: %.5f", sl)
+                log.info("  TP1: %.5f", tp1)
+                if tp3:
+                    log.info("  TP3: %.5f (closes ALL remaining)", tp3)
+                else:
+                    log.info("  TP3: N/A")
+                log.info(f"  Lot Size: {lot_size} (calculated at signal time)")
+                log.info(f"  Expiration: {FIVEERS_CONFIG.pending_order_expiry_hours} hours")
             
             result = self.mt5.place_pending_order(
                 symbol=broker_symbol,
@@ -4004,10 +4294,11 @@ class LiveTradingBot:
                 log.error(f"[{symbol}] Pending order FAILED: {result.error}")
                 return False
             
-            log.info(f"[{symbol}] PENDING ORDER PLACED SUCCESSFULLY!")
-            log.info(f"  Order Ticket: {result.order_id}")
-            log.info(f"  Entry Level: {result.price:.5f}")
-            log.info(f"  Volume: {result.volume}")
+            if log.isEnabledFor(logging.INFO):
+                log.info(f"[{symbol}] PENDING ORDER PLACED SUCCESSFULLY!")
+                log.info(f"  Order Ticket: {result.order_id}")
+                log.info("  Entry Level: %.5f", result.price)
+                log.info(f"  Volume: {result.volume}")
             
             pending_setup = PendingSetup(
                 symbol=symbol,
@@ -4024,6 +4315,7 @@ class LiveTradingBot:
                 quality_factors=quality_factors,
                 entry_distance_r=entry_distance_r,
                 created_at=datetime.now(timezone.utc).isoformat(),
+                created_at_ts=time.time(),
                 order_ticket=result.order_id,
                 status="pending",
                 lot_size=lot_size,  # Lot size calculated at order placement
@@ -4037,55 +4329,75 @@ class LiveTradingBot:
         
         return True
     
-    def check_position_updates(self):
+    def check_position_updates(self, now: Optional[datetime] = None):
         """
         Check for position closures (TP/SL hits) and update state.
         
         This syncs our internal state with actual MT5 positions.
         """
-        my_positions = self.mt5.get_my_positions()
+        # Nothing tracked as open - no need to ask MT5 for positions
+        if not any(p.get("order_id") is not None for p in self.risk_manager.state.open_positions):
+            return
+        
+        my_positions = self._positions_cached(now)
         open_tickets = {p.ticket for p in my_positions}
         
-        state_positions = self.risk_manager.state.open_positions.copy()
+        # Diff tracked tickets against MT5 first - usually nothing closed, so stop here
+        closed_ids = [
+            pos_dict["order_id"]
+            for pos_dict in self.risk_manager.state.open_positions
+            if pos_dict.get("order_id") is not None and pos_dict["order_id"] not in open_tickets
+        ]
+        if not closed_ids:
+            return
         
-        for pos_dict in state_positions:
-            order_id = pos_dict.get("order_id")
-            if order_id is None:
+        # Index filled setups by ticket once (first match wins, as before)
+        filled_by_ticket = {}
+        for symbol, setup in self.pending_setups.items():
+            if setup.order_ticket and setup.status == "filled":
+                filled_by_ticket.setdefault(setup.order_ticket, symbol)
+        
+        entry_queue_changed = False
+        spread_queue_changed = False
+        
+        for order_id in closed_ids:
+            log.info(f"Position {order_id} closed (detected from MT5)")
+            
+            self.risk_manager.record_trade_close(
+                order_id=order_id,
+                exit_price=0.0,
+                pnl_usd=0.0,
+            )
+            
+            # BUGFIX: Remove closed position from pending_setups AND queues
+            # This prevents re-entry of the same setup after position closes
+            symbol_to_remove = filled_by_ticket.pop(order_id, None)
+            if not symbol_to_remove:
                 continue
             
-            if order_id not in open_tickets:
-                log.info(f"Position {order_id} closed (detected from MT5)")
-                
-                self.risk_manager.record_trade_close(
-                    order_id=order_id,
-                    exit_price=0.0,
-                    pnl_usd=0.0,
-                )
-                
-                # BUGFIX: Remove closed position from pending_setups AND queues
-                # This prevents re-entry of the same setup after position closes
-                symbol_to_remove = None
-                for symbol, setup in list(self.pending_setups.items()):
-                    if setup.order_ticket == order_id and setup.status == "filled":
-                        log.info(f"[{symbol}] Removing closed position from pending_setups (ticket {order_id})")
-                        symbol_to_remove = symbol
-                        del self.pending_setups[symbol]
-                        self._save_pending_setups()
-                        break
-                
-                # Also remove from entry/spread queues to prevent re-execution
-                if symbol_to_remove:
-                    if symbol_to_remove in self.awaiting_entry:
-                        log.info(f"[{symbol_to_remove}] Removing from entry queue after position close")
-                        del self.awaiting_entry[symbol_to_remove]
-                        self._save_awaiting_entry()
-                    
-                    if symbol_to_remove in self.awaiting_spread:
-                        log.info(f"[{symbol_to_remove}] Removing from spread queue after position close")
-                        del self.awaiting_spread[symbol_to_remove]
-                        self._save_awaiting_spread()
+            log.info(f"[{symbol_to_remove}] Removing closed position from pending_setups (ticket {order_id})")
+            del self.pending_setups[symbol_to_remove]
+            self._mark_pending_dirty()
+            
+            # Also remove from entry/spread queues to prevent re-execution
+            if symbol_to_remove in self.awaiting_entry:
+                log.info(f"[{symbol_to_remove}] Removing from entry queue after position close")
+                del self.awaiting_entry[symbol_to_remove]
+                entry_queue_changed = True
+            
+            if symbol_to_remove in self.awaiting_spread:
+                log.info(f"[{symbol_to_remove}] Removing from spread queue after position close")
+                del self.awaiting_spread[symbol_to_remove]
+                spread_queue_changed = True
+        
+        # Persist once per pass instead of once per closed position
+        self._flush_pending_setups()
+        if entry_queue_changed:
+            self._save_awaiting_entry()
+        if spread_queue_changed:
+            self._save_awaiting_spread()
     
-    def check_pending_orders(self):
+    def check_pending_orders(self, now: Optional[datetime] = None):
         """
         Check status of pending orders every minute (like backtest simulation).
         
@@ -4097,38 +4409,55 @@ class LiveTradingBot:
         if not self.pending_setups:
             return
         
-        my_positions = self.mt5.get_my_positions()
+        symbol_map = self.symbol_map
+        pending_broker_symbols = {
+            symbol_map.get(symbol, symbol)
+            for symbol, setup in self.pending_setups.items()
+            if setup.status == "pending"
+        }
+        if not pending_broker_symbols:
+            return
+        
+        my_positions = self._positions_cached(now)
         position_symbols = {p.symbol for p in my_positions}
         
         my_pending_orders = self.mt5.get_my_pending_orders()
         pending_order_tickets = {o.ticket for o in my_pending_orders}
         
+        # Fetch all ticks in one pass instead of one MT5 round-trip per setup
+        ticks = self.mt5.get_ticks(pending_broker_symbols)
+        
         setups_to_remove = []
-        now = datetime.now(timezone.utc)
+        now_ts = time.time()
         expiry_hours = FIVEERS_CONFIG.pending_order_expiry_hours
         
         for symbol, setup in self.pending_setups.items():
             if setup.status != "pending":
                 continue
             
-            if setup.created_at:
+            created_ts = setup.created_at_ts
+            if not created_ts and setup.created_at:
+                # Setup saved before created_at_ts existed - parse once and backfill
                 try:
-                    created_time = datetime.fromisoformat(setup.created_at.replace("Z", "+00:00"))
-                    age_hours = (now - created_time).total_seconds() / 3600
-                    
-                    if age_hours >= expiry_hours:
-                        log.info(f"[{symbol}] Pending order EXPIRED after {age_hours:.1f} hours (max {expiry_hours}h) - deleting")
-                        if setup.order_ticket:
-                            self.mt5.cancel_pending_order(setup.order_ticket)
-                        setup.status = "expired"
-                        setups_to_remove.append(symbol)
-                        continue
+                    created_ts = datetime.fromisoformat(setup.created_at.replace("Z", "+00:00")).timestamp()
+                    setup.created_at_ts = created_ts
                 except (ValueError, TypeError) as e:
                     log.warning(f"[{symbol}] Could not parse created_at: {setup.created_at} - {e}")
             
-            broker_symbol = self.symbol_map.get(symbol, symbol)
+            if created_ts:
+                age_hours = (now_ts - created_ts) / 3600
+                
+                if age_hours >= expiry_hours:
+                    log.info("[%s] Pending order EXPIRED after %.1f hours (max %sh) - deleting", symbol, age_hours, expiry_hours)
+                    if setup.order_ticket:
+                        self.mt5.cancel_pending_order(setup.order_ticket)
+                    setup.status = "expired"
+                    setups_to_remove.append(symbol)
+                    continue
+            
+            broker_symbol = symbol_map.get(symbol, symbol)
             if broker_symbol in position_symbols:
-                log.info(f"[{symbol}] Pending order FILLED! Position now open (broker: {broker_symbol})")
+                log.info("[%s] Pending order FILLED! Position now open (broker: %s)", symbol, broker_symbol)
 
                 # COMPOUNDING FIX: Recalculate lot size at FILL MOMENT using CURRENT balance
                 # This ensures proper compounding when account grows while orders are pending
@@ -4141,15 +4470,17 @@ class LiveTradingBot:
                         broker_symbol=broker_symbol,
                         entry=setup.entry_price,
                         sl=setup.stop_loss,
-                        confluence=setup.confluence_score if hasattr(setup, 'confluence_score') else 10,
+                        confluence=setup.confluence_score,
                     )
                     
+                    setup.cache_risk()
+                    
                     if new_lot_size > 0:
                         old_lot = filled_position.volume
                         setup.lot_size = new_lot_size
                         setup.status = "filled"
                         setup.order_ticket = filled_position.ticket
-                        log.info(f"[{symbol}] ✅ Lot size recalculated at fill: {old_lot:.2f} -> {new_lot_size:.2f} (compounding)")
+                        log.info("[%s] ✅ Lot size recalculated at fill: %.2f -> %.2f (compounding)", symbol, old_lot, new_lot_size)
                     else:
                         # Risk check failed at fill - use original lot size
                         setup.lot_size = filled_position.volume
@@ -4169,26 +4500,26 @@ class LiveTradingBot:
                     log.error(f"[{symbol}] Position marked as filled but not found in MT5!")
                     setup.status = "filled"
                 
-                self._save_pending_setups()
+                self._mark_pending_dirty()
                 self.record_trading_day()
                 continue
             
             if setup.order_ticket and setup.order_ticket not in pending_order_tickets:
-                log.info(f"[{symbol}] Pending order EXPIRED or CANCELLED (ticket {setup.order_ticket})")
+                log.info("[%s] Pending order EXPIRED or CANCELLED (ticket %s)", symbol, setup.order_ticket)
                 setup.status = "expired"
                 setups_to_remove.append(symbol)
                 continue
             
-            tick = self.mt5.get_tick(broker_symbol)
+            tick = ticks.get(broker_symbol)
             if tick:
                 if setup.direction == "bullish" and tick.bid <= setup.stop_loss:
-                    log.warning(f"[{symbol}] Price ({tick.bid:.5f}) breached SL ({setup.stop_loss:.5f}) - cancelling pending order")
+                    log.warning("[%s] Price (%.5f) breached SL (%.5f) - cancelling pending order", symbol, tick.bid, setup.stop_loss)
                     if setup.order_ticket:
                         self.mt5.cancel_pending_order(setup.order_ticket)
                     setup.status = "cancelled"
                     setups_to_remove.append(symbol)
                 elif setup.direction == "bearish" and tick.ask >= setup.stop_loss:
-                    log.warning(f"[{symbol}] Price ({tick.ask:.5f}) breached SL ({setup.stop_loss:.5f}) - cancelling pending order")
+                    log.warning("[%s] Price (%.5f) breached SL (%.5f) - cancelling pending order", symbol, tick.ask, setup.stop_loss)
                     if setup.order_ticket:
                         self.mt5.cancel_pending_order(setup.order_ticket)
                     setup.status = "cancelled"
@@ -4198,7 +4529,8 @@ class LiveTradingBot:
             del self.pending_setups[symbol]
         
         if setups_to_remove:
-            self._save_pending_setups()
+            self._mark_pending_dirty()
+        self._flush_pending_setups()
     
     # DISABLED: validate_setup() - align with simulator
     # def validate_setup(self, symbol: str) -> bool:
@@ -4321,28 +4653,36 @@ class LiveTradingBot:
         day_start = self.risk_manager.state.day_start_balance
         initial = self.risk_manager.state.initial_balance
         
-        daily_loss_pct = 0.0
-        if current_equity < day_start:
-            daily_loss_pct = ((day_start - current_equity) / day_start) * 100
+        # day_start / initial are fixed for this call - divide once
+        inv_day_start = 100.0 / day_start if day_start > 0 else 0.0
+        inv_initial = 100.0 / initial if initial > 0 else 0.0
         
-        total_dd_pct = 0.0
-        if current_equity < initial:
-            total_dd_pct = ((initial - current_equity) / initial) * 100
+        def loss_pcts(equity: float):
+            """Return (daily_loss_pct, total_dd_pct) for the given equity."""
+            return (
+                max(0.0, (day_start - equity) * inv_day_start),
+                max(0.0, (initial - equity) * inv_initial),
+            )
+        
+        daily_loss_pct, total_dd_pct = loss_pcts(current_equity)
+        
+        # Healthy account (the common case) - nothing to cancel or close
+        if daily_loss_pct < self.PNL_CANCEL_DAILY_PCT and total_dd_pct < self.PNL_CANCEL_DD_PCT:
+            return False
         
         # Cancel pending orders if approaching limits (above 3.0% daily or 6% total)
         # IMPROVED: Cancel earlier to prevent slippage issues
-        if daily_loss_pct >= 3.0 or total_dd_pct >= 6.0:
+        if daily_loss_pct >= self.PNL_CANCEL_DAILY_PCT or total_dd_pct >= self.PNL_CANCEL_DD_PCT:
             pending_orders = self.mt5.get_my_pending_orders()
             if pending_orders:
                 log.warning(f"Approaching limits (Daily: {daily_loss_pct:.1f}%, DD: {total_dd_pct:.1f}%) - cancelling {len(pending_orders)} pending orders")
-                for order in pending_orders:
-                    self.mt5.cancel_pending_order(order.ticket)
+                self.mt5.cancel_pending_orders_bulk([order.ticket for order in pending_orders])
                 self.pending_setups.clear()
                 self._save_pending_setups()
         
         # Start closing positions if above 3.5% daily or 7.0% total
         # IMPROVED: Close earlier to account for slippage (0.3-0.5% buffer to 5% limit)
-        if daily_loss_pct >= 3.5 or total_dd_pct >= 7.0:
+        if daily_loss_pct >= self.PNL_CLOSE_DAILY_PCT or total_dd_pct >= self.PNL_CLOSE_DD_PCT:
             positions = self.mt5.get_my_positions()
             if not positions:
                 return False
@@ -4353,60 +4693,62 @@ class LiveTradingBot:
             log.warning(f"Closing positions gradually to stay under limits")
             log.warning("=" * 70)
             
-            # Sort positions by unrealized loss (worst first)
-            positions_sorted = sorted(positions, key=lambda p: p.profit)
+            # Walk positions by unrealized loss (worst first) in small batches -
+            # usually only a few closes are needed, so skip sorting the whole book
+            batch_size = max(5, len(positions) // 4)
+            remaining = positions
+            breach = False
             
-            for pos in positions_sorted:
-                log.warning(f"Closing {pos.symbol} (P/L: ${pos.profit:.2f}, Volume: {pos.volume})")
-                result = self.mt5.close_position(pos.ticket)
+            # Equity read right after the most recent close (None if stale)
+            last_equity = None
+            
+            while remaining and not breach:
+                worst = heapq.nsmallest(batch_size, remaining, key=lambda p: p.profit)
+                worst_tickets = {p.ticket for p in worst}
+                remaining = [p for p in remaining if p.ticket not in worst_tickets]
                 
-                if result.success:
-                    log.info(f"  ✓ Closed at {result.price}, P/L: ${pos.profit:.2f}")
-                    self.risk_manager.record_trade_close(
-                        order_id=pos.ticket,
-                        exit_price=result.price,
-                        pnl_usd=pos.profit,
-                    )
+                for pos in worst:
+                    log.warning(f"Closing {pos.symbol} (P/L: ${pos.profit:.2f}, Volume: {pos.volume})")
+                    result = self.mt5.close_position(pos.ticket)
                     
-                    # Re-check after closing
-                    account = self.mt5.get_account_info()
-                    if account:
-                        new_equity = account.get('equity', 0)
-                        new_daily_loss = 0.0
-                        new_total_dd = 0.0
-                        
-                        if new_equity < day_start:
-                            new_daily_loss = ((day_start - new_equity) / day_start) * 100
-                        if new_equity < initial:
-                            new_total_dd = ((initial - new_equity) / initial) * 100
-                        
-                        log.info(f"  After close: Daily Loss: {new_daily_loss:.2f}%, Total DD: {new_total_dd:.2f}%")
-                        
-                        # Stop if we're back under 3.5% daily and 7% total
-                        if new_daily_loss < 3.5 and new_total_dd < 7.0:
-                            log.info("  Back under safe thresholds - stopping protective close")
-                            return False
+                    if result.success:
+                        log.info(f"  ✓ Closed at {result.price}, P/L: ${pos.profit:.2f}")
+                        self.risk_manager.record_trade_close(
+                            order_id=pos.ticket,
+                            exit_price=result.price,
+                            pnl_usd=pos.profit,
+                        )
                         
-                        # Emergency if we've breached hard limits
-                        if new_daily_loss >= 5.0 or new_total_dd >= 10.0:
-                            log.error("  BREACH DETECTED - closing all remaining positions immediately!")
-                            break
-                else:
-                    log.error(f"  ✗ Failed to close: {result.error}")
-            
-            # Check final state
-            account = self.mt5.get_account_info()
-            if account:
-                final_equity = account.get('equity', 0)
-                final_daily = 0.0
-                final_dd = 0.0
-                
-                if final_equity < day_start:
-                    final_daily = ((day_start - final_equity) / day_start) * 100
-                if final_equity < initial:
-                    final_dd = ((initial - final_equity) / initial) * 100
+                        # Re-check after closing
+                        account = self.mt5.get_account_info()
+                        last_equity = account.get('equity', 0) if account else None
+                        if account:
+                            new_daily_loss, new_total_dd = loss_pcts(last_equity)
+                            
+                            log.info(f"  After close: Daily Loss: {new_daily_loss:.2f}%, Total DD: {new_total_dd:.2f}%")
+                            
+                            # Stop if we're back under 3.5% daily and 7% total
+                            if new_daily_loss < self.PNL_CLOSE_DAILY_PCT and new_total_dd < self.PNL_CLOSE_DD_PCT:
+                                log.info("  Back under safe thresholds - stopping protective close")
+                                return False
+                            
+                            # Emergency if we've breached hard limits
+                            if new_daily_loss >= self.PNL_BREACH_DAILY_PCT or new_total_dd >= self.PNL_BREACH_DD_PCT:
+                                log.error("  BREACH DETECTED - closing all remaining positions immediately!")
+                                breach = True
+                                break
+                    else:
+                        log.error(f"  ✗ Failed to close: {result.error}")
+                        last_equity = None
+            
+            # Check final state - reuse the equity read after the last close if still fresh
+            if last_equity is None:
+                account = self.mt5.get_account_info()
+                last_equity = account.get('equity', 0) if account else None
+            if last_equity is not None:
+                final_daily, final_dd = loss_pcts(last_equity)
                 
-                if final_daily >= 5.0 or final_dd >= 10.0:
+                if final_daily >= self.PNL_BREACH_DAILY_PCT or final_dd >= self.PNL_BREACH_DD_PCT:
                     log.error(f"LIMIT BREACH AFTER CLOSE: Daily {final_daily:.2f}%, DD {final_dd:.2f}%")
                     self.risk_manager.state.failed = True
                     self.risk_manager.state.fail_reason = f"Limit breached: Daily {final_daily:.1f}%, DD {final_dd:.1f}%"
@@ -4417,7 +4759,28 @@ class LiveTradingBot:
         
         return False
     
-    def manage_partial_takes(self):
+    def _retry_mt5_call(self, call, broker_symbol: str, label: str, attempts: int = 3, base_delay: float = 0.3):
+        """
+        Run an MT5 trade call (returning TradeResult) with retries.
+        
+        Retries only transient failures (MT5_RETRYABLE_RETCODES) with exponential
+        backoff + jitter; deterministic rejections return immediately.
+        """
+        result = None
+        for attempt in range(attempts):
+            result = call()
+            if result.success:
+                return result
+            if result.retcode not in MT5_RETRYABLE_RETCODES:
+                break
+            if attempt < attempts - 1:
+                log.warning(f"[{broker_symbol}] {label} attempt {attempt+1} failed, retrying...")
+                # Interruptible backoff: a shutdown stops retrying immediately
+                if shutdown_event.wait(base_delay * 2 ** attempt + random.uniform(0, 0.1)):
+                    break
+        return result
+    
+    def manage_partial_takes(self, now: Optional[datetime] = None):
         """
         Manage partial take profits for active positions.
         
@@ -4435,91 +4798,105 @@ class LiveTradingBot:
         
         Tracks partial close state in pending_setups.partial_closes (0-3).
         """
-        positions = self.mt5.get_my_positions()
+        positions = self._positions_cached(now)
         if not positions:
             return
         
+        ticks = self.mt5.get_ticks({pos.symbol for pos in positions})
+        
+        # TP levels / close percentages are fixed for the run - read them once per pass
+        params = self.params
+        tp1_r = params.tp1_r_multiple
+        tp2_r = params.tp2_r_multiple
+        tp3_r = params.tp3_r_multiple
+        tp4_r = getattr(params, 'tp4_r_multiple', 2.5)  # Default 2.5R
+        tp5_r = getattr(params, 'tp5_r_multiple', 3.5)  # Default 3.5R
+        tp1_close_pct = params.tp1_close_pct
+        tp2_close_pct = params.tp2_close_pct
+        tp3_close_pct = params.tp3_close_pct
+        tp4_close_pct = getattr(params, 'tp4_close_pct', 0.20)
+        tp5_close_pct = getattr(params, 'tp5_close_pct', 0.45)
+        progressive_trigger_r = getattr(params, 'progressive_trigger_r', 0.8)
+        progressive_trail_target_r = getattr(params, 'progressive_trail_target_r', 0.4)
+        # Lowest R that can trigger an action, indexed by partial_closes (0-4).
+        # Positions below it skip all TP/trail branches (state 1 also covers the progressive trail).
+        next_trigger_r = (tp1_r, min(progressive_trigger_r, tp2_r), tp3_r, tp4_r, tp5_r)
+        
+        # Index setups once: by order ticket and by broker symbol (first match wins)
+        setups_by_ticket = {}
+        setups_by_broker = {}
+        for sym, s in self.pending_setups.items():
+            if s.order_ticket:
+                setups_by_ticket.setdefault(s.order_ticket, s)
+            setups_by_broker.setdefault(self.symbol_map.get(sym, sym), s)
+        
         for pos in positions:
-            # Find matching setup - try broker symbol first, then internal symbol
-            setup = None
+            # Find matching setup - by ticket first, then by broker symbol
             broker_symbol = pos.symbol
-            
-            # Try to find by broker symbol or internal symbol
-            for sym, s in self.pending_setups.items():
-                if s.order_ticket == pos.ticket:
-                    setup = s
-                    break
-                mapped_broker = self.symbol_map.get(sym, sym)
-                if mapped_broker == broker_symbol:
-                    setup = s
-                    break
+            setup = setups_by_ticket.get(pos.ticket) or setups_by_broker.get(broker_symbol)
             
             if not setup or setup.status != "filled":
                 continue
             
-            tick = self.mt5.get_tick(broker_symbol)
+            tick = ticks.get(broker_symbol)
             if not tick:
                 continue
             
-            current_price = tick.bid if setup.direction == "bullish" else tick.ask
-            entry = setup.entry_price
-            risk = abs(entry - setup.stop_loss)
+            if not setup.direction_sign or not setup.signed_risk:
+                # Filled before the cache existed (older JSON / recovered position)
+                setup.cache_risk()
             
-            if risk <= 0:
+            inv_risk = setup.inv_risk
+            if inv_risk <= 0:
                 continue
             
+            sign = setup.direction_sign
+            current_price = tick.bid if sign > 0 else tick.ask
+            entry = setup.entry_price
+            
             # Calculate current R
-            if setup.direction == "bullish":
-                current_r = (current_price - entry) / risk
-            else:
-                current_r = (entry - current_price) / risk
+            current_r = (current_price - entry) * inv_risk * sign
             
-            # Get TP levels from params (5-TP system for optimization)
-            tp1_r = self.params.tp1_r_multiple
-            tp2_r = self.params.tp2_r_multiple
-            tp3_r = self.params.tp3_r_multiple
-            tp4_r = getattr(self.params, 'tp4_r_multiple', 2.5)  # Default 2.5R
-            tp5_r = getattr(self.params, 'tp5_r_multiple', 3.5)  # Default 3.5R
+            partial_state = setup.partial_closes
+            if partial_state >= len(next_trigger_r) or current_r < next_trigger_r[partial_state]:
+                continue
             
-            # Get close percentages
-            tp4_close_pct = getattr(self.params, 'tp4_close_pct', 0.20)
-            tp5_close_pct = getattr(self.params, 'tp5_close_pct', 0.45)
+            # Risk distance pointing in the trade direction (+risk bullish, -risk bearish)
+            signed_risk = setup.signed_risk
             
             original_volume = setup.lot_size
             current_volume = pos.volume
-            partial_state = setup.partial_closes if hasattr(setup, 'partial_closes') else 0
             
             # ═══════════════════════════════════════════════════════════════
             # TP1 HIT - Close tp1_close_pct, move SL to breakeven
             # ═══════════════════════════════════════════════════════════════
             if current_r >= tp1_r and partial_state == 0:
-                close_pct = self.params.tp1_close_pct
+                close_pct = tp1_close_pct
                 close_volume = max(0.01, round(original_volume * close_pct, 2))
                 close_volume = min(close_volume, current_volume)
                 
-                log.info(f"[{broker_symbol}] TP1 HIT at {current_r:.2f}R! Closing {close_pct*100:.0f}%")
+                log.info("[%s] TP1 HIT at %.2fR! Closing %.0f%%", broker_symbol, current_r, close_pct * 100)
                 
-                # Retry logic for partial close (up to 3 attempts)
-                result = None
-                for attempt in range(3):
-                    result = self.mt5.partial_close(pos.ticket, close_volume)
-                    if result.success:
-                        break
-                    if attempt < 2:
-                        log.warning(f"[{broker_symbol}] Partial close attempt {attempt+1} failed, retrying...")
-                        time.sleep(0.5 * (attempt + 1))
+                # Move SL to breakeven (matches simulator), sent with the partial close
+                new_sl = entry
+                
+                # Retry transient failures (up to 3 attempts)
+                result = self._retry_mt5_call(
+                    lambda: self.mt5.partial_close_and_modify(pos.ticket, close_volume, new_sl),
+                    broker_symbol, "Partial close",
+                )
                 
                 if result and result.success:
-                    log.info(f"[{broker_symbol}] ✅ Partial close at {result.price}")
+                    log.info("[%s] ✅ Partial close at %s", broker_symbol, result.price)
                     setup.partial_closes = 1
                     setup.tp1_hit = True
                     
-                    # Move SL to breakeven (matches simulator)
-                    new_sl = entry
-                    self.mt5.modify_sl_tp(pos.ticket, sl=new_sl)
-                    log.info(f"[{broker_symbol}] SL moved to breakeven: {new_sl:.5f}")
+                    if result.sl_modified:
+                        log.info("[%s] SL moved to breakeven: %.5f", broker_symbol, new_sl)
+                    else:
+                        log.warning("[%s] Failed to move SL to breakeven: %.5f", broker_symbol, new_sl)
                     
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.error(f"[{broker_symbol}] Partial close failed: {result.error}")
             
@@ -4529,27 +4906,21 @@ class LiveTradingBot:
             # Backtested: +$103K improvement (+25%) over standard trailing
             # Now parameterized for optimization
             # ═══════════════════════════════════════════════════════════════
-            progressive_trigger_r = getattr(self.params, 'progressive_trigger_r', 0.8)
-            progressive_trail_target_r = getattr(self.params, 'progressive_trail_target_r', 0.4)
-            
             if (partial_state == 1 and 
                 current_r >= progressive_trigger_r and 
                 current_r < tp2_r and
-                not getattr(setup, 'progressive_trail_applied', False)):
+                not setup.progressive_trail_applied):
                 
                 # Calculate BE + progressive_trail_target_r for trailing SL
-                if setup.direction == "bullish":
-                    new_sl = entry + (risk * progressive_trail_target_r)
-                else:
-                    new_sl = entry - (risk * progressive_trail_target_r)
+                new_sl = entry + signed_risk * progressive_trail_target_r
                 
-                log.info(f"[{broker_symbol}] Progressive trail at {current_r:.2f}R! Moving SL to BE+{progressive_trail_target_r}R: {new_sl:.5f}")
+                log.info("[%s] Progressive trail at %.2fR! Moving SL to BE+%sR: %.5f", broker_symbol, current_r, progressive_trail_target_r, new_sl)
                 
                 modify_result = self.mt5.modify_sl_tp(pos.ticket, sl=new_sl)
                 if modify_result:
-                    log.info(f"[{broker_symbol}] ✅ SL trailed to BE+{progressive_trail_target_r}R: {new_sl:.5f}")
+                    log.info("[%s] ✅ SL trailed to BE+%sR: %.5f", broker_symbol, progressive_trail_target_r, new_sl)
                     setup.progressive_trail_applied = True
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.warning(f"[{broker_symbol}] Failed to apply progressive trail")
             
@@ -4557,37 +4928,32 @@ class LiveTradingBot:
             # TP2 HIT - Close tp2_close_pct, trail SL to TP1 + 0.5R
             # ═══════════════════════════════════════════════════════════════
             if current_r >= tp2_r and partial_state == 1:
-                close_pct = self.params.tp2_close_pct
+                close_pct = tp2_close_pct
                 close_volume = max(0.01, round(original_volume * close_pct, 2))
                 close_volume = min(close_volume, current_volume)
                 
-                log.info(f"[{broker_symbol}] TP2 HIT at {current_r:.2f}R! Closing {close_pct*100:.0f}%")
+                log.info("[%s] TP2 HIT at %.2fR! Closing %.0f%%", broker_symbol, current_r, close_pct * 100)
                 
-                # Retry logic for partial close (up to 3 attempts)
-                result = None
-                for attempt in range(3):
-                    result = self.mt5.partial_close(pos.ticket, close_volume)
-                    if result.success:
-                        break
-                    if attempt < 2:
-                        log.warning(f"[{broker_symbol}] Partial close attempt {attempt+1} failed, retrying...")
-                        time.sleep(0.5 * (attempt + 1))
+                # Trail SL to TP1 + 0.5R (matches simulator), sent with the partial close
+                new_sl = entry + signed_risk * (tp1_r + 0.5)
+                
+                # Retry transient failures (up to 3 attempts)
+                result = self._retry_mt5_call(
+                    lambda: self.mt5.partial_close_and_modify(pos.ticket, close_volume, new_sl),
+                    broker_symbol, "Partial close",
+                )
                 
                 if result and result.success:
-                    log.info(f"[{broker_symbol}] ✅ Partial close at {result.price}")
+                    log.info("[%s] ✅ Partial close at %s", broker_symbol, result.price)
                     setup.partial_closes = 2
                     setup.tp2_hit = True
                     
-                    # Trail SL to TP1 + 0.5R (matches simulator)
-                    if setup.direction == "bullish":
-                        new_sl = entry + (risk * tp1_r) + (0.5 * risk)
+                    if result.sl_modified:
+                        log.info("[%s] SL trailed to TP1+0.5R: %.5f", broker_symbol, new_sl)
                     else:
-                        new_sl = entry - (risk * tp1_r) - (0.5 * risk)
+                        log.warning("[%s] Failed to trail SL to TP1+0.5R: %.5f", broker_symbol, new_sl)
                     
-                    self.mt5.modify_sl_tp(pos.ticket, sl=new_sl)
-                    log.info(f"[{broker_symbol}] SL trailed to TP1+0.5R: {new_sl:.5f}")
-                    
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.error(f"[{broker_symbol}] Partial close failed: {result.error}")
             
@@ -4596,37 +4962,32 @@ class LiveTradingBot:
             # (5-TP system: continues to TP4/TP5 instead of closing all)
             # ═══════════════════════════════════════════════════════════════
             if current_r >= tp3_r and partial_state == 2:
-                close_pct = self.params.tp3_close_pct
+                close_pct = tp3_close_pct
                 close_volume = max(0.01, round(original_volume * close_pct, 2))
                 close_volume = min(close_volume, current_volume)
                 
-                log.info(f"[{broker_symbol}] TP3 HIT at {current_r:.2f}R! Closing {close_pct*100:.0f}%")
+                log.info("[%s] TP3 HIT at %.2fR! Closing %.0f%%", broker_symbol, current_r, close_pct * 100)
                 
-                # Retry logic for partial close (up to 3 attempts)
-                result = None
-                for attempt in range(3):
-                    result = self.mt5.partial_close(pos.ticket, close_volume)
-                    if result.success:
-                        break
-                    if attempt < 2:
-                        log.warning(f"[{broker_symbol}] Partial close attempt {attempt+1} failed, retrying...")
-                        time.sleep(0.5 * (attempt + 1))
+                # Trail SL to TP2 + 0.5R, sent with the partial close
+                new_sl = entry + signed_risk * (tp2_r + 0.5)
+                
+                # Retry transient failures (up to 3 attempts)
+                result = self._retry_mt5_call(
+                    lambda: self.mt5.partial_close_and_modify(pos.ticket, close_volume, new_sl),
+                    broker_symbol, "Partial close",
+                )
                 
                 if result and result.success:
-                    log.info(f"[{broker_symbol}] ✅ Partial close at {result.price}")
+                    log.info("[%s] ✅ Partial close at %s", broker_symbol, result.price)
                     setup.partial_closes = 3
                     setup.tp3_hit = True
                     
-                    # Trail SL to TP2 + 0.5R
-                    if setup.direction == "bullish":
-                        new_sl = entry + (risk * tp2_r) + (0.5 * risk)
+                    if result.sl_modified:
+                        log.info("[%s] SL trailed to TP2+0.5R: %.5f", broker_symbol, new_sl)
                     else:
-                        new_sl = entry - (risk * tp2_r) - (0.5 * risk)
+                        log.warning("[%s] Failed to trail SL to TP2+0.5R: %.5f", broker_symbol, new_sl)
                     
-                    self.mt5.modify_sl_tp(pos.ticket, sl=new_sl)
-                    log.info(f"[{broker_symbol}] SL trailed to TP2+0.5R: {new_sl:.5f}")
-                    
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.error(f"[{broker_symbol}] Partial close failed: {result.error}")
             
@@ -4638,33 +4999,28 @@ class LiveTradingBot:
                 close_volume = max(0.01, round(original_volume * close_pct, 2))
                 close_volume = min(close_volume, current_volume)
                 
-                log.info(f"[{broker_symbol}] TP4 HIT at {current_r:.2f}R! Closing {close_pct*100:.0f}%")
+                log.info("[%s] TP4 HIT at %.2fR! Closing %.0f%%", broker_symbol, current_r, close_pct * 100)
                 
-                # Retry logic for partial close (up to 3 attempts)
-                result = None
-                for attempt in range(3):
-                    result = self.mt5.partial_close(pos.ticket, close_volume)
-                    if result.success:
-                        break
-                    if attempt < 2:
-                        log.warning(f"[{broker_symbol}] Partial close attempt {attempt+1} failed, retrying...")
-                        time.sleep(0.5 * (attempt + 1))
+                # Trail SL to TP3 + 0.5R, sent with the partial close
+                new_sl = entry + signed_risk * (tp3_r + 0.5)
+                
+                # Retry transient failures (up to 3 attempts)
+                result = self._retry_mt5_call(
+                    lambda: self.mt5.partial_close_and_modify(pos.ticket, close_volume, new_sl),
+                    broker_symbol, "Partial close",
+                )
                 
                 if result and result.success:
-                    log.info(f"[{broker_symbol}] ✅ Partial close at {result.price}")
+                    log.info("[%s] ✅ Partial close at %s", broker_symbol, result.price)
                     setup.partial_closes = 4
                     setup.tp4_hit = True
                     
-                    # Trail SL to TP3 + 0.5R
-                    if setup.direction == "bullish":
-                        new_sl = entry + (risk * tp3_r) + (0.5 * risk)
+                    if result.sl_modified:
+                        log.info("[%s] SL trailed to TP3+0.5R: %.5f", broker_symbol, new_sl)
                     else:
-                        new_sl = entry - (risk * tp3_r) - (0.5 * risk)
-                    
-                    self.mt5.modify_sl_tp(pos.ticket, sl=new_sl)
-                    log.info(f"[{broker_symbol}] SL trailed to TP3+0.5R: {new_sl:.5f}")
+                        log.warning("[%s] Failed to trail SL to TP3+0.5R: %.5f", broker_symbol, new_sl)
                     
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.error(f"[{broker_symbol}] Partial close failed: {result.error}")
             
@@ -4672,35 +5028,37 @@ class LiveTradingBot:
             # TP5 HIT - Close ALL REMAINING (final TP level)
             # ═══════════════════════════════════════════════════════════════
             if current_r >= tp5_r and partial_state == 4:
-                log.info(f"[{broker_symbol}] TP5 HIT at {current_r:.2f}R! Closing ALL remaining")
+                log.info("[%s] TP5 HIT at %.2fR! Closing ALL remaining", broker_symbol, current_r)
                 
-                # Retry logic for position close (up to 3 attempts)
-                result = None
-                for attempt in range(3):
-                    result = self.mt5.close_position(pos.ticket)
-                    if result.success:
-                        break
-                    if attempt < 2:
-                        log.warning(f"[{broker_symbol}] Close position attempt {attempt+1} failed, retrying...")
-                        time.sleep(0.5 * (attempt + 1))
+                # Retry transient failures (up to 3 attempts)
+                result = self._retry_mt5_call(
+                    lambda: self.mt5.close_position(pos.ticket),
+                    broker_symbol, "Close position",
+                )
                 
                 if result and result.success:
-                    log.info(f"[{broker_symbol}] ✅ Position FULLY CLOSED at {result.price}")
+                    log.info("[%s] ✅ Position FULLY CLOSED at %s", broker_symbol, result.price)
                     setup.partial_closes = 5
                     setup.tp5_hit = True
                     setup.status = "closed"
                     
                     # Calculate total R for this trade (5-TP system)
-                    total_r = (tp1_r * self.params.tp1_close_pct +
-                              tp2_r * self.params.tp2_close_pct +
-                              tp3_r * self.params.tp3_close_pct +
+                    total_r = (tp1_r * tp1_close_pct +
+                              tp2_r * tp2_close_pct +
+                              tp3_r * tp3_close_pct +
                               tp4_r * tp4_close_pct +
                               tp5_r * tp5_close_pct)
-                    log.info(f"[{broker_symbol}] Total R: ~{total_r:.2f}R (perfect 5-TP exit)")
+                    log.info("[%s] Total R: ~%.2fR (perfect 5-TP exit)", broker_symbol, total_r)
                     
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
                 else:
                     log.error(f"[{broker_symbol}] Failed to close position: {result.error}")
+        
+        # Every successful close/modify marks dirty - positions changed, refetch next time
+        if self._pending_dirty:
+            self._invalidate_positions_cache()
+        # Persist all TP / trail updates from this pass in one write
+        self._flush_pending_setups()
     
     def execute_protection_actions(self) -> bool:
         """
@@ -4724,10 +5082,14 @@ class LiveTradingBot:
         if not actions:
             return False
         
-        actions_sorted = sorted(actions, key=lambda a: a.priority, reverse=True)
+        actions.sort(key=attrgetter('priority'), reverse=True)  # fresh list per check - sort in place
         emergency_triggered = False
         
-        for action in actions_sorted:
+        # {ticket: position}, fetched once on first use and reused by later actions
+        # in this pass; reset to None whenever an action closes positions
+        positions_by_ticket = None
+        
+        for action in actions:
             log.warning(f"[RISK] Executing protection action: {action.action.value} - {action.reason}")
             
             try:
@@ -4737,9 +5099,10 @@ class LiveTradingBot:
                     log.error(f"Reason: {action.reason}")
                     log.error("=" * 70)
                     
+                    # Close every position back-to-back, then book the results
                     positions = self.mt5.get_my_positions()
-                    for pos in positions:
-                        result = self.mt5.close_position(pos.ticket)
+                    results = self.mt5.close_positions_bulk([pos.ticket for pos in positions])
+                    for pos, result in zip(positions, results):
                         if result.success:
                             log.info(f"  ✓ Closed {pos.symbol} at {result.price}")
                             self.risk_manager.record_trade_close(
@@ -4751,31 +5114,38 @@ class LiveTradingBot:
                             log.error(f"  ✗ Failed to close {pos.symbol}: {result.error}")
                     
                     pending_orders = self.mt5.get_my_pending_orders()
-                    for order in pending_orders:
-                        self.mt5.cancel_pending_order(order.ticket)
-                        log.info(f"  ✓ Cancelled pending order {order.ticket}")
+                    cancelled = self.mt5.cancel_pending_orders_bulk([order.ticket for order in pending_orders])
+                    for order, ok in zip(pending_orders, cancelled):
+                        if ok:
+                            log.info(f"  ✓ Cancelled pending order {order.ticket}")
+                        else:
+                            log.error(f"  ✗ Failed to cancel pending order {order.ticket}")
                     
                     self.pending_setups.clear()
-                    self._save_pending_setups()
+                    self._mark_pending_dirty()
+                    positions_by_ticket = None
                     
                     action.executed = True
                     emergency_triggered = True
+                    # Everything is closed/cancelled - lower-priority actions have nothing left to act on
+                    break
                     
                 elif action.action == ActionType.CLOSE_PENDING:
-                    # Cancel all pending orders
+                    # Cancel all pending orders in one pass, then log per ticket
                     pending_orders = self.mt5.get_my_pending_orders()
-                    for order in pending_orders:
-                        result = self.mt5.cancel_pending_order(order.ticket)
-                        if result:
+                    cancelled = self.mt5.cancel_pending_orders_bulk([order.ticket for order in pending_orders])
+                    for order, ok in zip(pending_orders, cancelled):
+                        if ok:
                             log.info(f"  ✓ Cancelled pending order {order.ticket}")
                         else:
                             log.error(f"  ✗ Failed to cancel pending order {order.ticket}")
                     action.executed = True
                     
                 elif action.action == ActionType.MOVE_SL_BREAKEVEN:
+                    if positions_by_ticket is None:
+                        positions_by_ticket = {p.ticket: p for p in self.mt5.get_my_positions()}
                     for ticket in action.positions_affected:
-                        positions = self.mt5.get_my_positions()
-                        pos = next((p for p in positions if p.ticket == ticket), None)
+                        pos = positions_by_ticket.get(ticket)
                         if pos:
                             result = self.mt5.modify_sl_tp(ticket, sl=pos.price_open)
                             if result:
@@ -4787,17 +5157,23 @@ class LiveTradingBot:
                     action.executed = True
                     
                 elif action.action == ActionType.CLOSE_WORST:
-                    for ticket in action.positions_affected:
-                        result = self.mt5.close_position(ticket)
+                    if positions_by_ticket is None:
+                        positions_by_ticket = {p.ticket: p for p in self.mt5.get_my_positions()}
+                    tickets = list(action.positions_affected)
+                    results = self.mt5.close_positions_bulk(tickets)
+                    for ticket, result in zip(tickets, results):
+                        pos = positions_by_ticket.get(ticket)
+                        label = f"{pos.symbol} ({ticket})" if pos else ticket
                         if result.success:
-                            log.info(f"  ✓ Closed worst position {ticket} at {result.price}")
+                            log.info(f"  ✓ Closed worst position {label} at {result.price}")
                             self.risk_manager.record_trade_close(
                                 order_id=ticket,
                                 exit_price=result.price,
                                 pnl_usd=0.0,
                             )
                         else:
-                            log.error(f"  ✗ Failed to close position {ticket}: {result.error}")
+                            log.error(f"  ✗ Failed to close position {label}: {result.error}")
+                    positions_by_ticket = None
                     action.executed = True
                     
                 elif action.action == ActionType.HALT_TRADING:
@@ -4819,17 +5195,18 @@ class LiveTradingBot:
                     pending_orders = self.mt5.get_my_pending_orders()
                     if pending_orders:
                         log.warning(f"  Cancelling {len(pending_orders)} pending orders to reduce exposure...")
-                        for order in pending_orders:
-                            try:
-                                self.mt5.cancel_pending_order(order.ticket)
+                        cancelled = self.mt5.cancel_pending_orders_bulk([order.ticket for order in pending_orders])
+                        for order, ok in zip(pending_orders, cancelled):
+                            if ok:
                                 log.info(f"  ✓ Cancelled pending order {order.ticket} ({order.symbol})")
-                            except Exception as e:
-                                log.error(f"  ✗ Failed to cancel {order.ticket}: {e}")
+                            else:
+                                log.error(f"  ✗ Failed to cancel {order.ticket} ({order.symbol})")
                     action.executed = True
                     
             except Exception as e:
                 log.error(f"[RISK] Error executing action {action.action.value}: {e}")
         
+        self._flush_pending_setups()
         return emergency_triggered
     
     def scan_all_symbols(self):
@@ -4861,29 +5238,53 @@ class LiveTradingBot:
         
         # DDD/TDD CHECK BEFORE SCAN - Block new orders if in danger zone
         if CHALLENGE_MODE and self.challenge_manager:
-            # Sync with MT5 to get current equity
+            # Sync with MT5 to get current equity (one account_info call for both values)
+            account = None
             try:
-                current_equity = self.mt5.get_account_equity()
-                current_balance = self.mt5.get_account_balance()
-                self.challenge_manager.sync_with_mt5(current_balance, current_equity)
+                account = self.mt5.get_account_info()
             except Exception as e:
                 log.error(f"Failed to sync risk manager: {e}")
             
-            # Get current DDD/TDD percentages
-            day_start = self.challenge_manager.day_start_equity
-            starting = self.challenge_manager.starting_balance
-            equity = self.challenge_manager.current_equity
-            
-            daily_loss_pct = abs(min(0, equity - day_start)) / day_start * 100 if day_start > 0 else 0
-            total_dd_pct = max(0, (starting - equity) / starting * 100) if starting > 0 else 0
-            
-            log.info("=" * 70)
-            log.info(f"📊 PRE-SCAN RISK CHECK")
-            log.info(f"  Day Start Equity: ${day_start:,.2f}")
-            log.info(f"  Current Equity: ${equity:,.2f}")
-            log.info(f"  DDD: {daily_loss_pct:.2f}% (halt at 3.5%, reduce at 3.0%)")
-            log.info(f"  TDD: {total_dd_pct:.2f}% (halt at 10%)")
-            log.info("=" * 70)
+            last = self._last_risk_snapshot
+            today = datetime.now().date()  # sync_with_mt5 rolls the day on date.today()
+            if (account and last and last[0] == today
+                    and last[1] == self.challenge_manager.day_start_equity
+                    and account.get('balance', 0.0) == last[2]
+                    and abs(account.get('equity', 0.0) - last[3]) < self.RISK_SNAPSHOT_EPSILON_USD):
+                # Same day/day-start, balance unchanged, equity moved < epsilon - reuse last check
+                daily_loss_pct, total_dd_pct = last[4], last[5]
+                log.debug("Pre-scan risk unchanged: DDD %.2f%%, TDD %.2f%%", daily_loss_pct, total_dd_pct)
+            else:
+                synced = False
+                if account:
+                    try:
+                        self.challenge_manager.sync_with_mt5(account.get('balance', 0.0), account.get('equity', 0.0))
+                        synced = True
+                    except Exception as e:
+                        log.error(f"Failed to sync risk manager: {e}")
+                
+                # Get current DDD/TDD percentages
+                day_start = self.challenge_manager.day_start_equity
+                starting = self.challenge_manager.starting_balance
+                equity = self.challenge_manager.current_equity
+                
+                daily_loss_pct = abs(min(0, equity - day_start)) / day_start * 100 if day_start > 0 else 0
+                total_dd_pct = max(0, (starting - equity) / starting * 100) if starting > 0 else 0
+                
+                # Only reuse percentages that were computed from a successful sync
+                if synced:
+                    self._last_risk_snapshot = (
+                        today, day_start, account.get('balance', 0.0), account.get('equity', 0.0),
+                        daily_loss_pct, total_dd_pct,
+                    )
+                
+                log.info("=" * 70)
+                log.info(f"📊 PRE-SCAN RISK CHECK")
+                log.info(f"  Day Start Equity: ${day_start:,.2f}")
+                log.info(f"  Current Equity: ${equity:,.2f}")
+                log.info(f"  DDD: {daily_loss_pct:.2f}% (halt at 3.5%, reduce at 3.0%)")
+                log.info(f"  TDD: {total_dd_pct:.2f}% (halt at 10%)")
+                log.info("=" * 70)
             
             # Block scan entirely if DDD >= 3.5% (HALT tier)
             if daily_loss_pct >= 3.5:
@@ -4901,11 +5302,12 @@ class LiveTradingBot:
                 log.error("=" * 70)
                 return
         
-        log.info("=" * 70)
-        log.info(f"MARKET SCAN - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
-        log.info(f"Strategy Mode: {SIGNAL_MODE} (Min Confluence: TREND={TREND_MIN_CONFLUENCE}, RANGE={RANGE_MIN_CONFLUENCE})")
-        log.info(f"Using PENDING ORDERS (like backtest)")
-        log.info("=" * 70)
+        if log.isEnabledFor(logging.INFO):
+            log.info("=" * 70)
+            log.info(f"MARKET SCAN - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+            log.info(f"Strategy Mode: {SIGNAL_MODE} (Min Confluence: TREND={TREND_MIN_CONFLUENCE}, RANGE={RANGE_MIN_CONFLUENCE})")
+            log.info(f"Using PENDING ORDERS (like backtest)")
+            log.info("=" * 70)
         
         self.scan_count += 1
         signals_found = 0
@@ -4920,18 +5322,28 @@ class LiveTradingBot:
         # Use is_market_open() which correctly handles Sunday 22:00 UTC open
         forex_market_open = is_market_open()
         
+        # ═══════════════════════════════════════════════════════════
+        # WEEKEND LOGIC - Skip forex when market closed, ALWAYS scan crypto
+        # ═══════════════════════════════════════════════════════════
+        scan_symbols = []
+        crypto_symbols = self._crypto_symbols
         for symbol in available_symbols:
+            if not forex_market_open and symbol not in crypto_symbols:
+                log.debug("[%s] Skipping - forex market closed", symbol)
+                continue
+            scan_symbols.append(symbol)
+        
+        # NOTE: Scan stays in this process. The MT5 terminal serializes every
+        # request from one account, so worker processes with their own MT5
+        # connection would just queue on the same terminal (and MT5 does not
+        # support several initialize() sessions reliably).
+        # The MT5 binding is not documented as thread-safe either, so the candle
+        # fetches run sequentially up front, before scan_symbol / place_setup_order.
+        candle_data = self._prefetch_candle_data(scan_symbols)
+        
+        for symbol in scan_symbols:
             try:
-                # ═══════════════════════════════════════════════════════════
-                # WEEKEND LOGIC - Skip forex when market closed, ALWAYS scan crypto
-                # ═══════════════════════════════════════════════════════════
-                is_crypto = is_crypto_pair(symbol)
-                
-                if not forex_market_open and not is_crypto:
-                    log.debug(f"[{symbol}] Skipping - forex market closed")
-                    continue
-                
-                setup = self.scan_symbol(symbol)
+                setup = self.scan_symbol(symbol, data=candle_data.get(symbol))
                 
                 if setup:
                     signals_found += 1
@@ -4939,58 +5351,60 @@ class LiveTradingBot:
                     if self.place_setup_order(setup):
                         orders_placed += 1
                 
-                time.sleep(0.5)
-                
             except Exception as e:
                 log.error(f"[{symbol}] Error during scan: {e}")
                 continue
-            time.sleep(0.1)
         
-        log.info("=" * 70)
-        log.info("SCAN COMPLETE")
-        log.info(f"  Symbols scanned: {len(available_symbols)}/{len(TRADABLE_SYMBOLS)}")
-        log.info(f"  Active signals: {signals_found}")
-        log.info(f"  Pending orders placed: {orders_placed}")
-        
-        positions = self.mt5.get_my_positions()
-        pending_orders = self.mt5.get_my_pending_orders()
-        log.info(f"  Open positions: {len(positions)}")
-        log.info(f"  Pending orders: {len(pending_orders)}")
-        log.info(f"  Tracked setups: {len(self.pending_setups)}")
-        
-        # Get status from CHALLENGE manager (not risk_manager) for accurate DDD/TDD
-        if CHALLENGE_MODE and self.challenge_manager:
-            day_start = self.challenge_manager.day_start_equity
-            starting = self.challenge_manager.starting_balance
-            equity = self.challenge_manager.current_equity
-            balance = self.challenge_manager.current_balance
-            
-            daily_loss_pct = abs(min(0, equity - day_start)) / day_start * 100 if day_start > 0 else 0
-            total_dd_pct = max(0, (starting - equity) / starting * 100) if starting > 0 else 0
-            profit_pct = (balance - starting) / starting * 100 if starting > 0 else 0
-            
-            phase = 1 if profit_pct < 8.0 else 2
-            target_pct = 8.0 if phase == 1 else 5.0
-            
-            log.info(f"  Challenge Phase: {phase}")
-            log.info(f"  Balance: ${balance:,.2f}")
-            log.info(f"  Profit: {profit_pct:+.2f}% (Target: {target_pct}%)")
-            log.info(f"  📊 DDD: {daily_loss_pct:.2f}%/5% (Day Start: ${day_start:,.2f})")
-            log.info(f"  📊 TDD: {total_dd_pct:.2f}%/10% (Starting: ${starting:,.2f})")
-            log.info(f"  Profitable Days: {len(self.challenge_manager.trading_days)}/3")
-        else:
-            status = self.risk_manager.get_status()
-            log.info(f"  Challenge Phase: {status['phase']}")
-            log.info(f"  Balance: ${status['balance']:,.2f}")
-            log.info(f"  Profit: {status['profit_pct']:+.2f}% (Target: {status['target_pct']}%)")
-            log.info(f"  Daily DD: {status['daily_loss_pct']:.2f}%/5%")
-            log.info(f"  Max DD: {status['drawdown_pct']:.2f}%/10%")
-            log.info(f"  Profitable Days: {status['profitable_days']}/{status['min_profitable_days']}")
-        log.info("=" * 70)
+        if log.isEnabledFor(logging.INFO):
+            log.info("=" * 70)
+            log.info("SCAN COMPLETE")
+            log.info(f"  Symbols scanned: {len(available_symbols)}/{len(TRADABLE_SYMBOLS)}")
+            log.info(f"  Active signals: {signals_found}")
+            log.info(f"  Pending orders placed: {orders_placed}")
+
+            positions = self.mt5.get_my_positions()
+            pending_orders = self.mt5.get_my_pending_orders()
+            log.info(f"  Open positions: {len(positions)}")
+            log.info(f"  Pending orders: {len(pending_orders)}")
+            log.info(f"  Tracked setups: {len(self.pending_setups)}")
+
+            # Get status from CHALLENGE manager (not risk_manager) for accurate DDD/TDD
+            if CHALLENGE_MODE and self.challenge_manager:
+                day_start = self.challenge_manager.day_start_equity
+                starting = self.challenge_manager.starting_balance
+                equity = self.challenge_manager.current_equity
+                balance = self.challenge_manager.current_balance
+
+                daily_loss_pct = abs(min(0, equity - day_start)) / day_start * 100 if day_start > 0 else 0
+                total_dd_pct = max(0, (starting - equity) / starting * 100) if starting > 0 else 0
+                profit_pct = (balance - starting) / starting * 100 if starting > 0 else 0
+
+                phase = 1 if profit_pct < 8.0 else 2
+                target_pct = 8.0 if phase == 1 else 5.0
+
+                log.info(f"  Challenge Phase: {phase}")
+                log.info(f"  Balance: ${balance:,.2f}")
+                log.info(f"  Profit: {profit_pct:+.2f}% (Target: {target_pct}%)")
+                log.info(f"  📊 DDD: {daily_loss_pct:.2f}%/5% (Day Start: ${day_start:,.2f})")
+                log.info(f"  📊 TDD: {total_dd_pct:.2f}%/10% (Starting: ${starting:,.2f})")
+                log.info(f"  Profitable Days: {len(self.challenge_manager.trading_days)}/3")
+            else:
+                status = self.risk_manager.get_status()
+                log.info(f"  Challenge Phase: {status['phase']}")
+                log.info(f"  Balance: ${status['balance']:,.2f}")
+                log.info(f"  Profit: {status['profit_pct']:+.2f}% (Target: {status['target_pct']}%)")
+                log.info(f"  Daily DD: {status['daily_loss_pct']:.2f}%/5%")
+                log.info(f"  Max DD: {status['drawdown_pct']:.2f}%/10%")
+                log.info(f"  Profitable Days: {status['profitable_days']}/{status['min_profitable_days']}")
+            log.info("=" * 70)
         
         self.last_scan_time = datetime.now(timezone.utc)
         self._save_scan_state()  # Persist scan time to prevent duplicate scans after restart
     
+    def _scheduled_deadlines(self) -> List[datetime]:
+        """All pending scheduled-event deadlines; run() sleeps until the earliest one. Register new events here."""
+        return [d for d in (self.next_scan_time, self.next_midnight_sync_time) if d]
+    
     def run(self):
         """
         Main trading loop - runs 24/7 for 5ers 60K High Stakes Challenge.
@@ -5051,13 +5465,14 @@ class LiveTradingBot:
         # CRITICAL FIX JAN 20, 2026: Start DDD protection loop AFTER connect()
         # Otherwise challenge_manager is None and the protection never works!
         self.start_ddd_protection_loop()
+        
+        # Persist pending_setups from a background thread while the loop runs
+        self._start_pending_writer()
         log.info("🛡️ DDD/TDD Protection loop started")
         
         log.info("Starting trading loop...")
         log.info("Press Ctrl+C to stop")
         
-        global running
-        
         # ═══════════════════════════════════════════════════════════════════
         # FIRST RUN CHECK - Immediate scan if needed (but check if scan already done today)
         # ═══════════════════════════════════════════════════════════════════
@@ -5075,13 +5490,13 @@ class LiveTradingBot:
             today_date = datetime.now(timezone.utc).date()
             if last_scan_date == today_date:
                 already_scanned_today = True
-                log.info(f"✓ Already scanned today at {self.last_scan_time.strftime('%H:%M:%S UTC')} (from scan_state.json)")
+                log.info("✓ Already scanned today at %s (from scan_state.json)", self.last_scan_time.strftime('%H:%M:%S UTC'))
         
         # Method 2: Check first_run_complete.flag (fallback for when scan_state.json doesn't exist yet)
         if not already_scanned_today and self.first_run_complete:
             # Flag exists and is recent (< 24h) - assume we already scanned
             already_scanned_today = True
-            log.info(f"✓ First run flag is recent - assuming already scanned today")
+            log.info("✓ First run flag is recent - assuming already scanned today")
         
         if not already_scanned_today and self.should_do_immediate_scan():
             log.info("=" * 70)
@@ -5097,15 +5512,15 @@ class LiveTradingBot:
             if server_now >= today_scan and today_scan.weekday() < 5:
                 # Only trigger immediate scan if we haven't scanned today
                 self.next_scan_time = today_scan_utc
-                log.info(f"Missed today's scan - will scan immediately")
-                log.info(f"Scheduled scan time was: {self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                log.info("Missed today's scan - will scan immediately")
+                log.info("Scheduled scan time was: %s", self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
             else:
                 self.next_scan_time = get_next_scan_time()
-                log.info(f"Skipping immediate scan - next scheduled: {self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                log.info("Skipping immediate scan - next scheduled: %s", self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
         else:
             # Already scanned today - just set next scan time
             self.next_scan_time = get_next_scan_time()
-            log.info(f"Next scheduled scan: {self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+            log.info("Next scheduled scan: %s", self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
         
         # Weekend gap check (only on Monday morning)
         self.handle_weekend_gap_positions()
@@ -5116,29 +5531,42 @@ class LiveTradingBot:
         self.next_midnight_sync_time = get_next_midnight_sync_time()
         today_server_date = get_server_date().isoformat()
         if self.last_midnight_sync_date == today_server_date:
-            log.info(f"✓ Midnight equity sync already done for {today_server_date}")
+            log.info("✓ Midnight equity sync already done for %s", today_server_date)
         else:
             # If we just started after midnight but before scan, do sync now
             server_now = get_server_time()
             today_midnight = server_now.replace(hour=0, minute=0, second=0, microsecond=0)
             if server_now >= today_midnight and server_now.weekday() < 5:
-                log.info(f"⏰ Missed midnight sync for {today_server_date} - syncing now")
+                log.info("⏰ Missed midnight sync for %s - syncing now", today_server_date)
                 self._do_midnight_equity_sync()
-        log.info(f"Next midnight sync: {self.next_midnight_sync_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        
-        self.last_validate_time = datetime.now(timezone.utc)
-        self.last_spread_check_time = datetime.now(timezone.utc)
-        last_protection_check = datetime.now(timezone.utc)
+        log.info("Next midnight sync: %s", self.next_midnight_sync_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
+        
+        start_now = datetime.now(timezone.utc)
+        self.last_validate_time = start_now
+        self.last_spread_check_time = start_now
+        # Interval pacing uses time.monotonic() (immune to wall-clock jumps);
+        # the datetime attributes are kept for status/logging.
+        last_protection_mono = last_spread_mono = time.monotonic()
+        last_entry_mono = None
+        reconnect_delay = self.RECONNECT_MIN_DELAY_SECONDS
         emergency_triggered = False
         
-        while running:
+        # Stable references / constants used every iteration - bind once as locals
+        mt5 = self.mt5
+        loop_interval = self.MAIN_LOOP_INTERVAL_SECONDS
+        spread_check_minutes = self.SPREAD_CHECK_INTERVAL_MINUTES
+        entry_check_minutes = self.ENTRY_CHECK_INTERVAL_MINUTES
+        
+        while not shutdown_event.is_set():
             # If DDD halt is active, skip trading actions
             if getattr(self, 'ddd_halted', False):
-                log.warning(f"🚨 DDD HALT ACTIVE: {getattr(self, 'ddd_halt_reason', '')} - Trading paused until next day.")
-                time.sleep(10)
+                log.warning("🚨 DDD HALT ACTIVE: %s - Trading paused until next day.", getattr(self, 'ddd_halt_reason', ''))
+                shutdown_event.wait(10)
                 continue
             try:
+                # One wall-clock + monotonic reading per iteration, shared by all checks
                 now = datetime.now(timezone.utc)
+                mono = time.monotonic()
                 
                 # ═══════════════════════════════════════════════════════════════
                 # 5ERS DD MONITORING (no daily DD limit!)
@@ -5152,11 +5580,11 @@ class LiveTradingBot:
                 if CHALLENGE_MODE and self.challenge_manager and self.challenge_manager.halted:
                     if not emergency_triggered:
                         emergency_triggered = True
-                        log.error(f"Challenge Manager halted trading: {self.challenge_manager.halt_reason}")
+                        log.error("Challenge Manager halted trading: %s", self.challenge_manager.halt_reason)
                 
                 if not emergency_triggered:
-                    time_since_protection_check = (now - last_protection_check).total_seconds()
-                    if time_since_protection_check >= self.MAIN_LOOP_INTERVAL_SECONDS:
+                    time_since_protection_check = mono - last_protection_mono
+                    if time_since_protection_check >= loop_interval:
                         # Protection checks
                         if CHALLENGE_MODE and self.challenge_manager:
                             if self.execute_protection_actions():
@@ -5170,46 +5598,51 @@ class LiveTradingBot:
                                 continue
                         
                         # 5-TP partial close management
-                        self.manage_partial_takes()
+                        self.manage_partial_takes(now)
 
                         # Weekend gap risk management
-                        self.handle_friday_position_closing()  # Friday 16:00+ UTC
-                        self.handle_sunday_gap_detection()  # Sunday 22:00+ UTC
+                        self.handle_friday_position_closing(now)  # Friday 16:00+ UTC
+                        self.handle_sunday_gap_detection(now)  # Sunday 22:00+ UTC
                         self.handle_monday_order_resume()  # Monday 01:00+ server time
                         
                         # Limit order compounding - update lot sizes every 30 min
                         self.update_limit_orders_for_compounding()
 
-                        last_protection_check = now
+                        # Weekend handlers may have closed positions
+                        self._invalidate_positions_cache()
+                        last_protection_mono = mono
 
                 if emergency_triggered:
-                    time.sleep(60)
+                    shutdown_event.wait(60)
                     continue
                 
                 # ═══════════════════════════════════════════════════════════════
                 # SPREAD QUEUE CHECK - Every SPREAD_CHECK_INTERVAL_MINUTES
                 # ═══════════════════════════════════════════════════════════════
-                if self.last_spread_check_time:
-                    time_since_spread = (now - self.last_spread_check_time).total_seconds() / 60
-                    if time_since_spread >= self.SPREAD_CHECK_INTERVAL_MINUTES:
-                        self.check_awaiting_spread_signals()
-                        self.last_spread_check_time = now
+                time_since_spread = (mono - last_spread_mono) / 60
+                if time_since_spread >= spread_check_minutes:
+                    self.check_awaiting_spread_signals(now)
+                    self.last_spread_check_time = now
+                    last_spread_mono = mono
                 
                 # ═══════════════════════════════════════════════════════════════
                 # ENTRY QUEUE CHECK - Every ENTRY_CHECK_INTERVAL_MINUTES
                 # Check signals waiting for price to approach entry level
                 # ═══════════════════════════════════════════════════════════════
-                if self.last_entry_check_time is None:
+                if last_entry_mono is None:
                     self.last_entry_check_time = now
+                    last_entry_mono = mono
                 else:
-                    time_since_entry = (now - self.last_entry_check_time).total_seconds() / 60
-                    if time_since_entry >= self.ENTRY_CHECK_INTERVAL_MINUTES:
-                        self.check_awaiting_entry_signals()
+                    time_since_entry = (mono - last_entry_mono) / 60
+                    if time_since_entry >= entry_check_minutes:
+                        self.check_awaiting_entry_signals(now)
                         self.last_entry_check_time = now
+                        last_entry_mono = mono
                 
                 # Pending orders and position updates
-                self.check_pending_orders()
-                self.check_position_updates()
+                # Both read the same positions snapshot for this iteration
+                self.check_pending_orders(now)
+                self.check_position_updates(now)
                 
                 # Validate setups - DISABLED to align with simulator
                 # Simulator trusts signal at scan time, only expires via time/SL breach
@@ -5228,10 +5661,7 @@ class LiveTradingBot:
                         # CRITICAL: Reset DDD halt at midnight (new trading day)
                         if self.ddd_halted:
                             log.info("✅ NEW TRADING DAY (midnight) - Resetting DDD halt from previous day")
-                            self.ddd_halted = False
-                            self.ddd_halt_reason = ""
-                            self.ddd_halt_date = None
-                            self._save_ddd_halt_state()
+                            self._clear_ddd_halt()
                             log.info("✅ Trading re-enabled!")
                     else:
                         # Weekend - schedule next weekday
@@ -5242,9 +5672,10 @@ class LiveTradingBot:
                 # ═══════════════════════════════════════════════════════════════
                 if self.next_scan_time and now >= self.next_scan_time:
                     if is_market_open():
-                        log.info("=" * 70)
-                        log.info(f"📊 DAILY SCAN - {get_server_time().strftime('%Y-%m-%d %H:%M')} Server Time")
-                        log.info("=" * 70)
+                        if log.isEnabledFor(logging.INFO):
+                            log.info("=" * 70)
+                            log.info("📊 DAILY SCAN - %s Server Time", get_server_time().strftime('%Y-%m-%d %H:%M'))
+                            log.info("=" * 70)
 
                         # Update daily tracking and reset for new day
                         self.risk_manager._check_new_day()
@@ -5260,41 +5691,377 @@ class LiveTradingBot:
 
                         # Calculate next scan time after successful scan
                         self.next_scan_time = get_next_scan_time()
-                        log.info(f"Next scan scheduled: {self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                        log.info("Next scan scheduled: %s", self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
                     else:
                         log.info("Market closed (weekend), skipping scan")
                         # Calculate next scan time (will skip to Monday)
                         self.next_scan_time = get_next_scan_time()
-                        log.info(f"Next scan scheduled: {self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+                        log.info("Next scan scheduled: %s", self.next_scan_time.strftime('%Y-%m-%d %H:%M:%S UTC'))
                 
-                # Reconnection handling
-                if not self.mt5.connected:
+                # Reconnection handling - short first retry, backing off to 60s
+                if not mt5.connected:
                     log.warning("MT5 connection lost, attempting reconnect...")
                     if self.connect():
                         log.info("Reconnected successfully")
+                        reconnect_delay = self.RECONNECT_MIN_DELAY_SECONDS
                     else:
-                        log.error("Reconnect failed, waiting 60s...")
-                        time.sleep(60)
+                        log.error("Reconnect failed, waiting %ss...", reconnect_delay)
+                        shutdown_event.wait(reconnect_delay)
+                        reconnect_delay = min(reconnect_delay * 2, self.RECONNECT_MAX_DELAY_SECONDS)
                         continue
                 
-                time.sleep(self.MAIN_LOOP_INTERVAL_SECONDS)
+                # Sleep the regular interval, but wake exactly at the next scan /
+                # midnight sync deadline if that comes first (instead of up to 10s late).
+                # Deadlines already past (e.g. a failed sync) keep the regular interval.
+                wait_seconds = loop_interval
+                wake_now = datetime.now(timezone.utc)
+                upcoming = [d for d in self._scheduled_deadlines() if d > wake_now]
+                if upcoming:
+                    wait_seconds = min(wait_seconds, (min(upcoming) - wake_now).total_seconds())
+                if shutdown_event.wait(wait_seconds):
+                    break
                 
             except KeyboardInterrupt:
+                # Also stops the DDD protection worker
+                shutdown_event.set()
                 break
             except Exception as e:
-                log.error(f"Error in main loop: {e}")
+                log.error("Error in main loop: %s", e)
                 import traceback
                 log.error(traceback.format_exc())
-                time.sleep(60)
+                shutdown_event.wait(60)
         
         log.info("Shutting down...")
         
+        # Drain the background writer first, then write the final state inline
+        self._stop_pending_writer()
         self._save_pending_setups()
         self._save_awaiting_spread()
         self.disconnect()
         log.info("Bot stopped")
 
 
+def _confirm(msg: str) -> bool:
+    """Print a warning and ask for y/N confirmation on the console."""
+    print(msg)
+    return input("Continue anyway? (y/N): ").strip().lower() == 'y'
+
+
+def _cmd_reset_state():
+    """Remove challenge state files so the bot starts fresh (--reset-state)."""
+    print("=" * 70)
+    print("🔄 RESETTING CHALLENGE STATE")
+    print("=" * 70)
+    
+    state_files = ["challenge_risk_state.json", "trading_days.json"]
+    for file in state_files:
+        try:
+            Path(file).unlink()
+            print(f"✓ Removed {file}")
+        except FileNotFoundError:
+            print(f"⚠ {file} not found")
+    
+    print("State files reset. Bot will start with fresh state.")
+    print("=" * 70)
+
+
+def _cmd_reset_day_start(bot):
+    """Reset day_start_equity to current MT5 equity/balance (--reset-day-start)."""
+    print("=" * 70)
+    print("🔄 RESETTING DAY START EQUITY")
+    print("=" * 70)
+    
+    if not bot.connect():
+        print("ERROR: Could not connect to MT5 for day start reset")
+        sys.exit(1)
+    
+    # Get current account info
+    account = bot.mt5.get_account_info()
+    if account:
+        current_equity = account.get("equity", 0)
+        current_balance = account.get("balance", 0)
+        print(f"Current MT5 equity: ${current_equity:,.2f}")
+        print(f"Current MT5 balance: ${current_balance:,.2f}")
+        
+        if bot.challenge_manager:
+            print(f"Old day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
+            # Use the new method to properly update day_start_equity (5ers rule: MAX of equity/balance)
+            bot.challenge_manager.update_day_start_equity(current_equity, current_balance)
+            print(f"New day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
+            print(f"✓ Day start equity = MAX(${current_equity:,.2f}, ${current_balance:,.2f}) per 5ers rules")
+        else:
+            print("ERROR: Challenge manager not initialized")
+            sys.exit(1)
+    else:
+        print("ERROR: Could not get MT5 account info")
+        sys.exit(1)
+    
+    print("Day start equity reset complete.")
+    print("=" * 70)
+    bot.disconnect()
+    sys.exit(0)
+
+
+def _cmd_set_day_start(bot, manual_value):
+    """Manually set day_start_equity to a dashboard value (--set-day-start-equity)."""
+    print("=" * 70)
+    print("🔧 MANUALLY SETTING DAY START EQUITY")
+    print("=" * 70)
+    
+    print(f"Requested value: ${manual_value:,.2f}")
+    
+    if manual_value <= 0:
+        print("ERROR: Day start equity must be greater than 0")
+        sys.exit(1)
+    
+    if not bot.connect():
+        print("ERROR: Could not connect to MT5")
+        sys.exit(1)
+    
+    # Get current account info for validation
+    account = bot.mt5.get_account_info()
+    if account:
+        current_equity = account.get("equity", 0)
+        print(f"Current MT5 equity: ${current_equity:,.2f}")
+        
+        if bot.challenge_manager:
+            print(f"Old day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
+            
+            # Validate the manual value is reasonable (within 0.5x - 1.5x of current equity)
+            ratio = manual_value / current_equity if current_equity else float('inf')
+            if ratio > 1.5 or ratio < 0.5:
+                direction = "higher" if ratio > 1.5 else "lower"
+                if not _confirm(f"WARNING: Manual value (${manual_value:,.2f}) is much {direction} than current equity (${current_equity:,.2f})"):
+                    print("Aborted.")
+                    bot.disconnect()
+                    sys.exit(0)
+            
+            # Set the manual value
+            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            bot.challenge_manager.day_start_equity = manual_value
+            bot.challenge_manager.day_start_equity_manually_set_date = today  # Mark with today's date
+            bot.challenge_manager._save_state()
+            print(f"New day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
+            print(f"✓ Day start equity manually set for {today} (will NOT be overridden by daily scan TODAY, but WILL update tomorrow)")
+            
+            # Calculate current DDD with new value
+            daily_loss = manual_value - current_equity
+            daily_loss_pct = (daily_loss / manual_value) * 100 if manual_value > 0 else 0
+            
+            print("")
+            print(f"📊 DDD STATUS WITH NEW VALUE:")
+            print(f"  Day Start (previous close): ${manual_value:,.2f}")
+            print(f"  Current Equity: ${current_equity:,.2f}")
+            print(f"  Daily P&L: ${current_equity - manual_value:+,.2f}")
+            print(f"  DDD: {daily_loss_pct:.2f}%")
+            
+            # Check if halt should be active
+            halt_threshold = 3.5
+            if daily_loss_pct >= halt_threshold:
+                print("")
+                print(f"🚨 DDD {daily_loss_pct:.2f}% >= {halt_threshold}% - HALT WILL BE ACTIVE!")
+                print(f"   Bot will NOT trade until next daily close (00:00 server time)")
+                print(f"   At 01:00 server time the scan will execute for new day")
+                # Set halt state
+                bot.ddd_halted = True
+                bot.ddd_halt_reason = f"DDD {daily_loss_pct:.2f}% (manual equity set)"
+                bot.ddd_halt_date = today
+                bot._save_ddd_halt_state()
+                print("   ✓ DDD halt state saved")
+            else:
+                print("")
+                print(f"✅ DDD {daily_loss_pct:.2f}% < {halt_threshold}% - Trading allowed")
+                # Clear any previous halt
+                if bot.ddd_halted:
+                    bot.ddd_halted = False
+                    bot.ddd_halt_reason = ""
+                    bot._save_ddd_halt_state()
+                    print("   ✓ Previous DDD halt cleared")
+        else:
+            print("ERROR: Challenge manager not initialized")
+            sys.exit(1)
+    else:
+        print("ERROR: Could not get MT5 account info")
+        sys.exit(1)
+    
+    print("")
+    print("Manual day start equity setting complete.")
+    print("=" * 70)
+    bot.disconnect()
+    sys.exit(0)
+
+
+def _cmd_force_friday_close(bot):
+    """One-shot Friday closing, pending-order cleanup and crypto scan (--force-friday-close)."""
+    print("=" * 70)
+    print("🔒 FORCING FRIDAY POSITION CLOSING")
+    print("=" * 70)
+    
+    if not bot.connect():
+        print("ERROR: Could not connect to MT5")
+        sys.exit(1)
+    
+    # Reset the flag and force run
+    bot.friday_closing_done = False
+    
+    # Get positions
+    positions = bot.mt5.get_my_positions()
+    if not positions:
+        print("No positions to manage for weekend")
+    else:
+        print(f"Found {len(positions)} positions")
+        
+        # Call the weekend gap manager directly
+        import weekend_gap_manager as wgm
+        
+        now = datetime.now(timezone.utc)
+        result = wgm.select_positions_for_weekend_tier1(
+            positions=positions,
+            mt5_client=bot.mt5,
+            current_time=now,
+            max_per_group=2,
+            max_total_non_crypto=5,
+        )
+        
+        print("")
+        print(f"📊 RESULT:")
+        print(f"   HOLD: {len(result['HOLD'])} positions")
+        print(f"   CLOSE: {len(result['CLOSE'])} positions")
+        print(f"   REDUCE 50%: {len(result['REDUCE_50'])} positions")
+        print("")
+        
+        # Execute closures
+        for pos in result['CLOSE']:
+            print(f"🔒 Closing {pos.symbol} (ticket {pos.ticket})...")
+            close_result = bot.mt5.close_position(pos.ticket)
+            if hasattr(close_result, 'success') and close_result.success:
+                print(f"   ✓ Closed successfully")
+            else:
+                print(f"   ✗ Failed to close: {getattr(close_result, 'error', 'unknown')}")
+        
+        # Execute 50% reductions
+        for pos in result['REDUCE_50']:
+            current_volume = pos.volume
+            reduce_volume = round(current_volume * 0.5, 2)
+            if reduce_volume >= 0.01:
+                print(f"⚠️ Reducing {pos.symbol} by 50% (ticket {pos.ticket})...")
+                close_result = bot.mt5.partial_close(pos.ticket, reduce_volume)
+                if hasattr(close_result, 'success') and close_result.success:
+                    print(f"   ✓ Reduced from {current_volume:.2f} to {current_volume - reduce_volume:.2f} lots")
+                else:
+                    print(f"   ✗ Failed to reduce: {getattr(close_result, 'error', 'unknown')}")
+        
+        # Store Friday close prices
+        remaining_positions = bot.mt5.get_my_positions()
+        if remaining_positions:
+            bot.friday_close_prices = wgm.store_friday_close_prices(
+                remaining_positions,
+                bot.mt5
+            )
+            print(f"📝 Stored Friday close prices for {len(bot.friday_close_prices)} symbols")
+    
+    # ================================================================
+    # DELETE ALL FOREX PENDING ORDERS (weekend gap risk)
+    # ================================================================
+    print("")
+    print("=" * 70)
+    print("🗑️ DELETING FOREX PENDING ORDERS (weekend gap protection)")
+    print("=" * 70)
+    
+    # Crypto symbols that can stay (trade 24/7)
+    CRYPTO_SYMBOLS = {'BTCUSD', 'ETHUSD', 'BTC_USD', 'ETH_USD'}
+    
+    pending_orders = bot.mt5.get_pending_orders()
+    forex_orders_deleted = 0
+    crypto_orders_kept = 0
+    
+    if pending_orders:
+        for order in pending_orders:
+            symbol = order.symbol if hasattr(order, 'symbol') else str(order)
+            
+            # Check if it's crypto
+            if symbol.upper() in CRYPTO_SYMBOLS or symbol.replace('_', '').upper() in CRYPTO_SYMBOLS:
+                crypto_orders_kept += 1
+                print(f"   ⏸️ KEEP {symbol} (crypto, no weekend gap risk)")
+            else:
+                # Delete forex/metals/indices pending order
+                ticket = order.ticket if hasattr(order, 'ticket') else order
+                result = bot.mt5.cancel_pending_order(ticket)
+                if result:
+                    forex_orders_deleted += 1
+                    print(f"   ✓ Deleted {symbol} limit order (ticket {ticket})")
+                    
+                    # Clear order_ticket in pending_setup so it can be re-placed Monday
+                    # Find the corresponding pending_setup using OANDA symbol format
+                    oanda_symbol = symbol.replace('USD', '_USD').replace('JPY', '_JPY').replace('CHF', '_CHF').replace('CAD', '_CAD').replace('AUD', '_AUD').replace('NZD', '_NZD').replace('GBP', '_GBP').replace('EUR', '_EUR')
+                    # Try common formats
+                    for sym_format in [symbol, oanda_symbol, symbol.replace('_', ''), f"{symbol[:3]}_{symbol[3:]}"]:
+                        if sym_format in bot.pending_setups:
+                            bot.pending_setups[sym_format]['order_ticket'] = None
+                            bot.pending_setups[sym_format]['status'] = 'awaiting_entry'
+                            print(f"      → {sym_format} setup preserved (will re-place Monday)")
+                            break
+                else:
+                    print(f"   ✗ Failed to delete {symbol} (ticket {ticket})")
+        
+        print("")
+        print(f"📊 Pending orders: {forex_orders_deleted} deleted, {crypto_orders_kept} crypto kept")
+    else:
+        print("   No pending orders found")
+    
+    # Save pending_setups with cleared order_tickets (but keep the signals!)
+    if forex_orders_deleted > 0:
+        bot._save_pending_setups()
+        print(f"📋 Preserved {len(bot.pending_setups)} pending setups (signals still valid for 168h)")
+    
+    # ================================================================
+    # SCAN FOR CRYPTO SIGNALS (crypto trades 24/7, no weekend gap)
+    # ================================================================
+    print("")
+    print("=" * 70)
+    print("🔍 SCANNING CRYPTO SIGNALS (24/7 trading, no weekend gap risk)")
+    print("=" * 70)
+    
+    # Get crypto symbols from config
+    crypto_oanda = [sym for sym in TRADABLE_SYMBOLS if 'BTC' in sym or 'ETH' in sym]
+    
+    if crypto_oanda:
+        print(f"Scanning {len(crypto_oanda)} crypto symbols: {', '.join(crypto_oanda)}")
+        
+        # Run scan for each crypto symbol
+        signals_found = 0
+        for symbol in crypto_oanda:
+            if symbol in bot.symbol_map:
+                try:
+                    setup = bot.scan_symbol(symbol)
+                    if setup:
+                        signals_found += 1
+                        print(f"   ✓ {symbol}: {setup.get('direction', 'unknown')} signal")
+                        bot.place_setup_order(setup)
+                    else:
+                        print(f"   • {symbol}: no signal")
+                except Exception as e:
+                    print(f"   ✗ {symbol}: error - {e}")
+            else:
+                print(f"   ⚠️ {symbol}: not available on broker")
+        
+        if signals_found == 0:
+            print("   No crypto signals found")
+    else:
+        print("   No crypto symbols configured")
+    
+    print("")
+    print("✅ Friday close complete")
+    print("=" * 70)
+    bot.disconnect()
+    sys.exit(0)
+
+
+def _cmd_run(bot):
+    """Run the main trading loop."""
+    bot.run()
+
+
 def main():
     """Entry point with command line arguments."""
     import argparse
@@ -5335,321 +6102,21 @@ def main():
     
     # Handle reset-state before initializing bot
     if args.reset_state:
-        print("=" * 70)
-        print("🔄 RESETTING CHALLENGE STATE")
-        print("=" * 70)
-        
-        state_files = ["challenge_risk_state.json", "trading_days.json"]
-        for file in state_files:
-            if os.path.exists(file):
-                os.remove(file)
-                print(f"✓ Removed {file}")
-            else:
-                print(f"⚠ {file} not found")
-        
-        print("State files reset. Bot will start with fresh state.")
-        print("=" * 70)
+        _cmd_reset_state()
     
+    # All remaining commands need a bot; built after the credential check and state reset
     bot = LiveTradingBot(immediate_scan=args.first_run)
     
-    # Handle reset-day-start after bot initialization but before run
     if args.reset_day_start:
-        print("=" * 70)
-        print("🔄 RESETTING DAY START EQUITY")
-        print("=" * 70)
-        
-        if not bot.connect():
-            print("ERROR: Could not connect to MT5 for day start reset")
-            sys.exit(1)
-        
-        # Get current account info
-        account = bot.mt5.get_account_info()
-        if account:
-            current_equity = account.get("equity", 0)
-            current_balance = account.get("balance", 0)
-            print(f"Current MT5 equity: ${current_equity:,.2f}")
-            print(f"Current MT5 balance: ${current_balance:,.2f}")
-            
-            if bot.challenge_manager:
-                print(f"Old day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
-                # Use the new method to properly update day_start_equity (5ers rule: MAX of equity/balance)
-                bot.challenge_manager.update_day_start_equity(current_equity, current_balance)
-                print(f"New day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
-                print(f"✓ Day start equity = MAX(${current_equity:,.2f}, ${current_balance:,.2f}) per 5ers rules")
-            else:
-                print("ERROR: Challenge manager not initialized")
-                sys.exit(1)
-        else:
-            print("ERROR: Could not get MT5 account info")
-            sys.exit(1)
-        
-        print("Day start equity reset complete.")
-        print("=" * 70)
-        bot.disconnect()
-        sys.exit(0)
+        _cmd_reset_day_start(bot)
     
-    # Handle set-day-start-equity
     if args.set_day_start_equity is not None:
-        print("=" * 70)
-        print("🔧 MANUALLY SETTING DAY START EQUITY")
-        print("=" * 70)
-        
-        manual_value = args.set_day_start_equity
-        print(f"Requested value: ${manual_value:,.2f}")
-        
-        if manual_value <= 0:
-            print("ERROR: Day start equity must be greater than 0")
-            sys.exit(1)
-        
-        if not bot.connect():
-            print("ERROR: Could not connect to MT5")
-            sys.exit(1)
-        
-        # Get current account info for validation
-        account = bot.mt5.get_account_info()
-        if account:
-            current_equity = account.get("equity", 0)
-            print(f"Current MT5 equity: ${current_equity:,.2f}")
-            
-            if bot.challenge_manager:
-                print(f"Old day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
-                
-                # Validate the manual value is reasonable
-                if manual_value > current_equity * 1.5:
-                    print(f"WARNING: Manual value (${manual_value:,.2f}) is much higher than current equity (${current_equity:,.2f})")
-                    response = input("Continue anyway? (y/N): ")
-                    if response.lower() != 'y':
-                        print("Aborted.")
-                        bot.disconnect()
-                        sys.exit(0)
-                elif manual_value < current_equity * 0.5:
-                    print(f"WARNING: Manual value (${manual_value:,.2f}) is much lower than current equity (${current_equity:,.2f})")
-                    response = input("Continue anyway? (y/N): ")
-                    if response.lower() != 'y':
-                        print("Aborted.")
-                        bot.disconnect()
-                        sys.exit(0)
-                
-                # Set the manual value
-                today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-                bot.challenge_manager.day_start_equity = manual_value
-                bot.challenge_manager.day_start_equity_manually_set_date = today  # Mark with today's date
-                bot.challenge_manager._save_state()
-                print(f"New day_start_equity: ${bot.challenge_manager.day_start_equity:,.2f}")
-                print(f"✓ Day start equity manually set for {today} (will NOT be overridden by daily scan TODAY, but WILL update tomorrow)")
-                
-                # Calculate current DDD with new value
-                daily_loss = manual_value - current_equity
-                daily_loss_pct = (daily_loss / manual_value) * 100 if manual_value > 0 else 0
-                
-                print("")
-                print(f"📊 DDD STATUS WITH NEW VALUE:")
-                print(f"  Day Start (previous close): ${manual_value:,.2f}")
-                print(f"  Current Equity: ${current_equity:,.2f}")
-                print(f"  Daily P&L: ${current_equity - manual_value:+,.2f}")
-                print(f"  DDD: {daily_loss_pct:.2f}%")
-                
-                # Check if halt should be active
-                halt_threshold = 3.5
-                if daily_loss_pct >= halt_threshold:
-                    print("")
-                    print(f"🚨 DDD {daily_loss_pct:.2f}% >= {halt_threshold}% - HALT WILL BE ACTIVE!")
-                    print(f"   Bot will NOT trade until next daily close (00:00 server time)")
-                    print(f"   At 01:00 server time the scan will execute for new day")
-                    # Set halt state
-                    bot.ddd_halted = True
-                    bot.ddd_halt_reason = f"DDD {daily_loss_pct:.2f}% (manual equity set)"
-                    bot.ddd_halt_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-                    bot._save_ddd_halt_state()
-                    print("   ✓ DDD halt state saved")
-                else:
-                    print("")
-                    print(f"✅ DDD {daily_loss_pct:.2f}% < {halt_threshold}% - Trading allowed")
-                    # Clear any previous halt
-                    if bot.ddd_halted:
-                        bot.ddd_halted = False
-                        bot.ddd_halt_reason = ""
-                        bot._save_ddd_halt_state()
-                        print("   ✓ Previous DDD halt cleared")
-            else:
-                print("ERROR: Challenge manager not initialized")
-                sys.exit(1)
-        else:
-            print("ERROR: Could not get MT5 account info")
-            sys.exit(1)
-        
-        print("")
-        print("Manual day start equity setting complete.")
-        print("=" * 70)
-        bot.disconnect()
-        sys.exit(0)
+        _cmd_set_day_start(bot, args.set_day_start_equity)
     
-    # Handle force-friday-close (one-shot action)
     if args.force_friday_close:
-        print("=" * 70)
-        print("🔒 FORCING FRIDAY POSITION CLOSING")
-        print("=" * 70)
-        
-        if not bot.connect():
-            print("ERROR: Could not connect to MT5")
-            sys.exit(1)
-        
-        # Reset the flag and force run
-        bot.friday_closing_done = False
-        
-        # Get positions
-        positions = bot.mt5.get_my_positions()
-        if not positions:
-            print("No positions to manage for weekend")
-        else:
-            print(f"Found {len(positions)} positions")
-            
-            # Call the weekend gap manager directly
-            import weekend_gap_manager as wgm
-            
-            now = datetime.now(timezone.utc)
-            result = wgm.select_positions_for_weekend_tier1(
-                positions=positions,
-                mt5_client=bot.mt5,
-                current_time=now,
-                max_per_group=2,
-                max_total_non_crypto=5,
-            )
-            
-            print("")
-            print(f"📊 RESULT:")
-            print(f"   HOLD: {len(result['HOLD'])} positions")
-            print(f"   CLOSE: {len(result['CLOSE'])} positions")
-            print(f"   REDUCE 50%: {len(result['REDUCE_50'])} positions")
-            print("")
-            
-            # Execute closures
-            for pos in result['CLOSE']:
-                print(f"🔒 Closing {pos.symbol} (ticket {pos.ticket})...")
-                close_result = bot.mt5.close_position(pos.ticket)
-                if hasattr(close_result, 'success') and close_result.success:
-                    print(f"   ✓ Closed successfully")
-                else:
-                    print(f"   ✗ Failed to close: {getattr(close_result, 'error', 'unknown')}")
-            
-            # Execute 50% reductions
-            for pos in result['REDUCE_50']:
-                current_volume = pos.volume
-                reduce_volume = round(current_volume * 0.5, 2)
-                if reduce_volume >= 0.01:
-                    print(f"⚠️ Reducing {pos.symbol} by 50% (ticket {pos.ticket})...")
-                    close_result = bot.mt5.partial_close(pos.ticket, reduce_volume)
-                    if hasattr(close_result, 'success') and close_result.success:
-                        print(f"   ✓ Reduced from {current_volume:.2f} to {current_volume - reduce_volume:.2f} lots")
-                    else:
-                        print(f"   ✗ Failed to reduce: {getattr(close_result, 'error', 'unknown')}")
-            
-            # Store Friday close prices
-            remaining_positions = bot.mt5.get_my_positions()
-            if remaining_positions:
-                bot.friday_close_prices = wgm.store_friday_close_prices(
-                    remaining_positions,
-                    bot.mt5
-                )
-                print(f"📝 Stored Friday close prices for {len(bot.friday_close_prices)} symbols")
-        
-        # ================================================================
-        # DELETE ALL FOREX PENDING ORDERS (weekend gap risk)
-        # ================================================================
-        print("")
-        print("=" * 70)
-        print("🗑️ DELETING FOREX PENDING ORDERS (weekend gap protection)")
-        print("=" * 70)
-        
-        # Crypto symbols that can stay (trade 24/7)
-        CRYPTO_SYMBOLS = {'BTCUSD', 'ETHUSD', 'BTC_USD', 'ETH_USD'}
-        
-        pending_orders = bot.mt5.get_pending_orders()
-        forex_orders_deleted = 0
-        crypto_orders_kept = 0
-        
-        if pending_orders:
-            for order in pending_orders:
-                symbol = order.symbol if hasattr(order, 'symbol') else str(order)
-                
-                # Check if it's crypto
-                if symbol.upper() in CRYPTO_SYMBOLS or symbol.replace('_', '').upper() in CRYPTO_SYMBOLS:
-                    crypto_orders_kept += 1
-                    print(f"   ⏸️ KEEP {symbol} (crypto, no weekend gap risk)")
-                else:
-                    # Delete forex/metals/indices pending order
-                    ticket = order.ticket if hasattr(order, 'ticket') else order
-                    result = bot.mt5.cancel_pending_order(ticket)
-                    if result:
-                        forex_orders_deleted += 1
-                        print(f"   ✓ Deleted {symbol} limit order (ticket {ticket})")
-                        
-                        # Clear order_ticket in pending_setup so it can be re-placed Monday
-                        # Find the corresponding pending_setup using OANDA symbol format
-                        oanda_symbol = symbol.replace('USD', '_USD').replace('JPY', '_JPY').replace('CHF', '_CHF').replace('CAD', '_CAD').replace('AUD', '_AUD').replace('NZD', '_NZD').replace('GBP', '_GBP').replace('EUR', '_EUR')
-                        # Try common formats
-                        for sym_format in [symbol, oanda_symbol, symbol.replace('_', ''), f"{symbol[:3]}_{symbol[3:]}"]:
-                            if sym_format in bot.pending_setups:
-                                bot.pending_setups[sym_format]['order_ticket'] = None
-                                bot.pending_setups[sym_format]['status'] = 'awaiting_entry'
-                                print(f"      → {sym_format} setup preserved (will re-place Monday)")
-                                break
-                    else:
-                        print(f"   ✗ Failed to delete {symbol} (ticket {ticket})")
-            
-            print("")
-            print(f"📊 Pending orders: {forex_orders_deleted} deleted, {crypto_orders_kept} crypto kept")
-        else:
-            print("   No pending orders found")
-        
-        # Save pending_setups with cleared order_tickets (but keep the signals!)
-        if forex_orders_deleted > 0:
-            bot._save_pending_setups()
-            print(f"📋 Preserved {len(bot.pending_setups)} pending setups (signals still valid for 168h)")
-        
-        # ================================================================
-        # SCAN FOR CRYPTO SIGNALS (crypto trades 24/7, no weekend gap)
-        # ================================================================
-        print("")
-        print("=" * 70)
-        print("🔍 SCANNING CRYPTO SIGNALS (24/7 trading, no weekend gap risk)")
-        print("=" * 70)
-        
-        # Get crypto symbols from config
-        crypto_oanda = [sym for sym in TRADABLE_SYMBOLS if 'BTC' in sym or 'ETH' in sym]
-        
-        if crypto_oanda:
-            print(f"Scanning {len(crypto_oanda)} crypto symbols: {', '.join(crypto_oanda)}")
-            
-            # Run scan for each crypto symbol
-            signals_found = 0
-            for symbol in crypto_oanda:
-                if symbol in bot.symbol_map:
-                    try:
-                        setup = bot.scan_symbol(symbol)
-                        if setup:
-                            signals_found += 1
-                            print(f"   ✓ {symbol}: {setup.get('direction', 'unknown')} signal")
-                            bot.place_setup_order(setup)
-                        else:
-                            print(f"   • {symbol}: no signal")
-                    except Exception as e:
-                        print(f"   ✗ {symbol}: error - {e}")
-                else:
-                    print(f"   ⚠️ {symbol}: not available on broker")
-            
-            if signals_found == 0:
-                print("   No crypto signals found")
-        else:
-            print("   No crypto symbols configured")
-        
-        print("")
-        print("✅ Friday close complete")
-        print("=" * 70)
-        bot.disconnect()
-        sys.exit(0)
+        _cmd_force_friday_close(bot)
     
-    bot.run()
+    _cmd_run(bot)
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from params.params_loader import (
     get_risk_per_trade_pct,
     get_transaction_costs,
     save_optimized_params,
+    invalidate_params_cache,
     ParamsNotFoundError,
 )
 
@@ -23,5 +24,6 @@ __all__ = [
     "get_risk_per_trade_pct",
     "get_transaction_costs",
     "save_optimized_params",
+    "invalidate_params_cache",
     "ParamsNotFoundError",
 ]
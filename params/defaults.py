@@ -16,7 +16,8 @@ CRITICAL: When adding new parameters:
 4. Run scripts/verify_params.py to confirm everything matches
 """
 
-from typing import Dict, Any, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -175,6 +176,22 @@ PARAMETER_DEFAULTS: Dict[str, Any] = {
     'consecutive_loss_halt': 9,       # Halt after this many consecutive losses
 }
 
+# Read-only view of the defaults (no copy needed when the caller only reads)
+_DEFAULTS_VIEW: Mapping[str, Any] = MappingProxyType(PARAMETER_DEFAULTS)
+
+# Boolean / numeric partitions of the defaults (constant - computed once at import)
+_BOOL_PARAMS: Mapping[str, bool] = MappingProxyType(
+    {k: v for k, v in PARAMETER_DEFAULTS.items() if isinstance(v, bool)})
+_NUMERIC_PARAMS: Mapping[str, float] = MappingProxyType(
+    {k: v for k, v in PARAMETER_DEFAULTS.items()
+     if isinstance(v, (int, float)) and not isinstance(v, bool)})
+
+# Key sets for validate_params (built once, not per call)
+_EXPECTED_KEYS = frozenset(PARAMETER_DEFAULTS)
+# Known non-parameter keys in params files
+_METADATA_KEYS = frozenset({'optimization_mode', 'timestamp', 'best_score',
+                            'generated_at', 'generated_by', 'version', 'parameters'})
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
@@ -188,20 +205,24 @@ def get_default(param_name: str) -> Any:
     return PARAMETER_DEFAULTS[param_name]
 
 
-def get_all_defaults() -> Dict[str, Any]:
+def get_all_defaults() -> Mapping[str, Any]:
+    """Get a read-only view of all defaults (use get_all_defaults_mutable() to modify)."""
+    return _DEFAULTS_VIEW
+
+
+def get_all_defaults_mutable() -> Dict[str, Any]:
     """Get copy of all defaults."""
     return PARAMETER_DEFAULTS.copy()
 
 
-def get_boolean_params() -> Dict[str, bool]:
-    """Get all boolean parameters."""
-    return {k: v for k, v in PARAMETER_DEFAULTS.items() if isinstance(v, bool)}
+def get_boolean_params() -> Mapping[str, bool]:
+    """Get all boolean parameters (read-only view)."""
+    return _BOOL_PARAMS
 
 
-def get_numeric_params() -> Dict[str, float]:
-    """Get all numeric parameters (int or float)."""
-    return {k: v for k, v in PARAMETER_DEFAULTS.items() 
-            if isinstance(v, (int, float)) and not isinstance(v, bool)}
+def get_numeric_params() -> Mapping[str, float]:
+    """Get all numeric parameters (int or float, read-only view)."""
+    return _NUMERIC_PARAMS
 
 
 def validate_params(params: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]:
@@ -214,20 +235,15 @@ def validate_params(params: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]
     Returns:
         Tuple of (is_valid, missing_params, extra_params)
     """
-    expected = set(PARAMETER_DEFAULTS.keys())
-    actual = set(params.keys())
-    
-    missing = expected - actual
-    extra = actual - expected
+    actual = params.keys()
     
+    missing = _EXPECTED_KEYS - actual
     # Filter out known non-parameter keys
-    metadata_keys = {'optimization_mode', 'timestamp', 'best_score', 
-                     'generated_at', 'generated_by', 'version', 'parameters'}
-    extra = extra - metadata_keys
+    extra = actual - _EXPECTED_KEYS - _METADATA_KEYS
     
-    is_valid = len(missing) == 0
+    is_valid = not missing
     
-    return is_valid, sorted(list(missing)), sorted(list(extra))
+    return is_valid, sorted(missing), sorted(extra)
 
 
 def merge_with_defaults(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -243,13 +259,7 @@ def merge_with_defaults(params: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Complete dictionary with all parameters
     """
-    result = PARAMETER_DEFAULTS.copy()
-    
-    for key, value in params.items():
-        if key in result:
-            result[key] = value
-    
-    return result
+    return {**PARAMETER_DEFAULTS, **{k: v for k, v in params.items() if k in PARAMETER_DEFAULTS}}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
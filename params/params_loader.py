@@ -11,38 +11,137 @@ Usage:
     costs = get_transaction_costs("EURUSD")  # Returns spread, slippage, commission
 """
 
+import copy
 import json
+import math
+import numbers
 from pathlib import Path
-from typing import Dict, Optional, Any, Tuple
+from typing import Dict, FrozenSet, NamedTuple, Optional, Any, Tuple
 from dataclasses import dataclass
 
+# orjson is optional - parses/serializes the params file several times faster when installed
+try:
+    import orjson as _json_lib
+except ImportError:
+    _json_lib = json
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True if obj contains a NaN or +/-Inf float anywhere (dicts, lists, numpy arrays)."""
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if hasattr(obj, 'dtype') and hasattr(obj, 'tolist'):
+        return _has_non_finite(obj.tolist())
+    if isinstance(obj, numbers.Real) and not isinstance(obj, numbers.Integral):
+        return not math.isfinite(obj)
+    return False
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to 2-space indented JSON bytes.
+    
+    orjson writes NaN/Infinity as null and non-ASCII text as raw UTF-8, so data
+    with non-finite floats, or output that isn't pure ASCII, goes through
+    json.dumps instead. That keeps the NaN/Infinity tokens, which _loads reads back.
+    """
+    if _json_lib is not json and not _has_non_finite(obj):
+        try:
+            blob = _json_lib.dumps(obj, option=_json_lib.OPT_INDENT_2 | _json_lib.OPT_SERIALIZE_NUMPY)
+            if blob.isascii():
+                return blob
+        except TypeError:
+            pass  # Types orjson can't handle - let json decide
+    return json.dumps(obj, indent=2).encode()
+
+
+def _loads(blob: bytes) -> Any:
+    """
+    Parse JSON bytes written by _dumps (or by hand).
+    
+    orjson rejects the NaN/Infinity tokens that json.dumps writes for non-finite
+    floats, so anything orjson can't parse is retried with stdlib json.
+    """
+    if _json_lib is not json:
+        try:
+            return _json_lib.loads(blob)
+        except _json_lib.JSONDecodeError:
+            pass
+    return json.loads(blob)
+
 
 PARAMS_FILE = Path(__file__).parent / "current_params.json"
 
+# Parsed params file keyed by (mtime_ns, size) - re-read only when the file changes
+_params_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+# StrategyParams built from that same parse (key, params object)
+_strategy_params_cache: Optional[Tuple[Tuple[int, int], Any]] = None
+# TopLevelParams built from that same parse (key, record)
+_top_level_cache: Optional[Tuple[Tuple[int, int], "TopLevelParams"]] = None
+# Names of the StrategyParams fields (filled on first load_strategy_params call)
+_VALID_FIELDS: Optional[FrozenSet[str]] = None
+
+# Separators stripped from symbols before the spread lookup (EUR_USD / EUR.USD / EUR/USD -> EURUSD)
+_SYMBOL_STRIP = str.maketrans('', '', '_./')
+
 
 class ParamsNotFoundError(Exception):
     """Raised when params file doesn't exist. Run optimizer first."""
     pass
 
 
-def load_params_dict() -> Dict[str, Any]:
+class TopLevelParams(NamedTuple):
+    """Top-level scalar settings from the params file (with their fallbacks applied)."""
+    min_confluence: int
+    max_concurrent_trades: int
+    risk_per_trade_pct: float
+
+
+def _load_params_cached() -> Dict[str, Any]:
     """
-    Load raw parameters dictionary from JSON file.
+    Return the parsed params file, re-parsing only when its mtime/size changed.
+    
+    The returned dict is shared - callers in this module only read it.
     
-    Returns:
-        Dict with all parameters
-        
     Raises:
         ParamsNotFoundError: If params file doesn't exist
     """
-    if not PARAMS_FILE.exists():
+    global _params_cache
+    try:
+        stat = PARAMS_FILE.stat()
+    except FileNotFoundError:
         raise ParamsNotFoundError(
             f"Parameters file not found: {PARAMS_FILE}\n"
             "Run the optimizer first: python ftmo_challenge_analyzer.py"
         )
     
-    with open(PARAMS_FILE, 'r') as f:
-        return json.load(f)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _params_cache is None or _params_cache[0] != key:
+        _params_cache = (key, _loads(PARAMS_FILE.read_bytes()))
+    return _params_cache[1]
+
+
+def invalidate_params_cache() -> None:
+    """Drop the cached params file (and StrategyParams built from it) so the next load re-reads it."""
+    global _params_cache, _strategy_params_cache, _top_level_cache
+    _params_cache = None
+    _strategy_params_cache = None
+    _top_level_cache = None
+
+
+def load_params_dict() -> Dict[str, Any]:
+    """
+    Load raw parameters dictionary from JSON file.
+    
+    Returns:
+        Dict with all parameters (a private copy - safe to modify)
+        
+    Raises:
+        ParamsNotFoundError: If params file doesn't exist
+    """
+    return copy.deepcopy(_load_params_cached())
 
 
 def load_strategy_params():
@@ -58,11 +157,16 @@ def load_strategy_params():
     Raises:
         ParamsNotFoundError: If params file doesn't exist
     """
+    global _strategy_params_cache, _VALID_FIELDS
+    
+    data = _load_params_cached()
+    # Same parse as last time -> hand out a copy of the StrategyParams built then
+    if _strategy_params_cache is not None and _strategy_params_cache[0] == _params_cache[0]:
+        return copy.copy(_strategy_params_cache[1])
+    
     from strategy_core import StrategyParams
     from params.defaults import PARAMETER_DEFAULTS
     
-    data = load_params_dict()
-    
     # Handle nested 'parameters' key
     if 'parameters' in data:
         params = data['parameters']
@@ -70,35 +174,46 @@ def load_strategy_params():
         params = data
     
     # Start with defaults, overlay with file values
-    final_params = PARAMETER_DEFAULTS.copy()
-    for key, value in params.items():
-        if key in final_params:
-            final_params[key] = value
+    final_params = {**PARAMETER_DEFAULTS, **{k: v for k, v in params.items() if k in PARAMETER_DEFAULTS}}
     
     # Filter to only StrategyParams fields
-    import dataclasses
-    valid_fields = {f.name for f in dataclasses.fields(StrategyParams)}
-    filtered_params = {k: v for k, v in final_params.items() if k in valid_fields}
+    if _VALID_FIELDS is None:
+        import dataclasses
+        _VALID_FIELDS = frozenset(f.name for f in dataclasses.fields(StrategyParams))
+    filtered_params = {k: v for k, v in final_params.items() if k in _VALID_FIELDS}
     
-    return StrategyParams(**filtered_params)
+    params_obj = StrategyParams(**filtered_params)
+    _strategy_params_cache = (_params_cache[0], params_obj)
+    return copy.copy(params_obj)
+
+
+def _top_level() -> TopLevelParams:
+    """TopLevelParams for the current params file (rebuilt only when the file changes)."""
+    global _top_level_cache
+    data = _load_params_cached()
+    key = _params_cache[0]
+    if _top_level_cache is None or _top_level_cache[0] != key:
+        _top_level_cache = (key, TopLevelParams(
+            min_confluence=data.get("min_confluence", 5),
+            max_concurrent_trades=data.get("max_concurrent_trades", 7),
+            risk_per_trade_pct=data.get("risk_per_trade_pct", 0.5),
+        ))
+    return _top_level_cache[1]
 
 
 def get_min_confluence() -> int:
     """Get minimum confluence score from params."""
-    data = load_params_dict()
-    return data.get("min_confluence", 5)
+    return _top_level().min_confluence
 
 
 def get_max_concurrent_trades() -> int:
     """Get maximum concurrent trades from params."""
-    data = load_params_dict()
-    return data.get("max_concurrent_trades", 7)
+    return _top_level().max_concurrent_trades
 
 
 def get_risk_per_trade_pct() -> float:
     """Get risk per trade percentage from params."""
-    data = load_params_dict()
-    return data.get("risk_per_trade_pct", 0.5)
+    return _top_level().risk_per_trade_pct
 
 
 def get_transaction_costs(symbol: str) -> Tuple[float, float, float]:
@@ -111,10 +226,10 @@ def get_transaction_costs(symbol: str) -> Tuple[float, float, float]:
     Returns:
         Tuple of (spread_pips, slippage_pips, commission_per_lot)
     """
-    data = load_params_dict()
+    data = _load_params_cached()
     costs = data.get("transaction_costs", {})
     
-    normalized = symbol.replace("_", "").replace(".", "").replace("/", "").upper()
+    normalized = symbol.translate(_SYMBOL_STRIP).upper()
     
     spread_config = costs.get("spread_pips", {})
     spread = spread_config.get(normalized, spread_config.get("default", 2.5))
@@ -138,23 +253,26 @@ def save_optimized_params(
     Returns:
         Path to saved file
     """
-    from datetime import datetime
+    from datetime import datetime, timezone
     
-    params_dict["generated_at"] = datetime.utcnow().isoformat() + "Z"
+    # One clock read for both the generated_at stamp and the backup filename
+    now = datetime.now(timezone.utc)
+    params_dict["generated_at"] = now.isoformat().replace("+00:00", "Z")
     params_dict["generated_by"] = "ftmo_challenge_analyzer.py"
     
     if "version" not in params_dict:
         params_dict["version"] = "1.0.0"
     
-    with open(PARAMS_FILE, 'w') as f:
-        json.dump(params_dict, f, indent=2)
+    # Serialize once - the backup is byte-identical
+    blob = _dumps(params_dict)
+    PARAMS_FILE.write_bytes(blob)
+    invalidate_params_cache()
     
     if backup:
         history_dir = Path(__file__).parent / "history"
         history_dir.mkdir(exist_ok=True)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         backup_path = history_dir / f"params_{timestamp}.json"
-        with open(backup_path, 'w') as f:
-            json.dump(params_dict, f, indent=2)
+        backup_path.write_bytes(blob)
     
     return PARAMS_FILE
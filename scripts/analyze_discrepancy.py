@@ -18,12 +18,19 @@ Date: January 5, 2026
 
 import sys
 import os
+from functools import cache, lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
 import json
 
+try:
+    import pyarrow  # noqa: F401 - parquet engine for the OHLCV cache
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -38,25 +45,49 @@ from params.params_loader import load_strategy_params
 
 WORKSPACE = Path(__file__).resolve().parent.parent
 DATA_DIR = WORKSPACE / "data" / "ohlcv"
+# Parquet copies of the CSVs - rebuilt whenever the CSV is newer (gitignored).
+# Files are named <csv stem>.<format tag>.parquet; each loader that caches here uses its own tag.
+PARQUET_CACHE_DIR = DATA_DIR / "_parquet_cache"
+# Format tag of this loader's cache files (naive sorted times, NaT rows dropped).
+# Bump it whenever the cleaned frame changes, so files from an older loader are not reused.
+PARQUET_CACHE_FORMAT = "naive-v1"
+# Columns read from the OHLCV CSVs (case-insensitive) - anything else is skipped by the parser
+_OHLCV_COLUMNS = frozenset({"time", "datetime", "open", "high", "low", "close", "volume"})
+# Store prices/volume as float32 (half the memory). Off by default: this tool exists to
+# reproduce live-bot signals exactly, and float32 shifts entry/SL/TP levels on high-priced symbols.
+USE_FLOAT32 = False
+
+# Confluence flags that also count as quality factors
+_QUALITY_FLAGS = frozenset({"location", "fib", "liquidity", "structure", "htf_bias"})
+
+
+# OANDA symbols whose MT5 name is not just the underscore-stripped form
+_OANDA_SPECIAL = {
+    "XAU_USD": "XAUUSD",
+    "XAG_USD": "XAGUSD",
+    "BTC_USD": "BTCUSD",
+    "ETH_USD": "ETHUSD",
+    "NAS100_USD": "NAS100USD",
+    "SPX500_USD": "SPX500USD",
+}
 
 
+@cache
 def oanda_to_mt5_symbol(oanda_symbol: str) -> str:
     """Convert OANDA format (EUR_USD) to MT5 format (EURUSD)."""
-    special = {
-        "XAU_USD": "XAUUSD",
-        "XAG_USD": "XAGUSD",
-        "BTC_USD": "BTCUSD",
-        "ETH_USD": "ETHUSD",
-        "NAS100_USD": "NAS100USD",
-        "SPX500_USD": "SPX500USD",
-    }
-    if oanda_symbol in special:
-        return special[oanda_symbol]
+    if oanda_symbol in _OANDA_SPECIAL:
+        return _OANDA_SPECIAL[oanda_symbol]
     return oanda_symbol.replace("_", "")
 
 
-def load_ohlcv_data(symbol: str, timeframe: str = "D") -> List[Dict]:
-    """Load OHLCV data for a symbol and timeframe."""
+@lru_cache(maxsize=64)
+def _load_ohlcv_df(symbol: str, timeframe: str = "D") -> pd.DataFrame:
+    """
+    Load OHLCV data for a symbol and timeframe as a DataFrame (cached per process).
+    
+    Uses a parquet copy of the CSV when pyarrow is installed and the copy is up to date.
+    The returned frame is shared between callers - do not modify it.
+    """
     mt5_symbol = oanda_to_mt5_symbol(symbol)
     
     tf_map = {
@@ -71,26 +102,57 @@ def load_ohlcv_data(symbol: str, timeframe: str = "D") -> List[Dict]:
     filepath = DATA_DIR / f"{mt5_symbol}_{tf_code}_2003_2025.csv"
     
     if not filepath.exists():
-        return []
+        return pd.DataFrame()
     
     try:
-        df = pd.read_csv(filepath)
+        cache_tag = f"{PARQUET_CACHE_FORMAT}{'-f32' if USE_FLOAT32 else ''}"
+        cache_path = PARQUET_CACHE_DIR / f"{filepath.stem}.{cache_tag}.parquet"
+        if (PARQUET_AVAILABLE and cache_path.exists()
+                and cache_path.stat().st_mtime >= filepath.stat().st_mtime):
+            return pd.read_parquet(cache_path)
+        
+        df = pd.read_csv(filepath, engine='c', usecols=lambda c: c.lower() in _OHLCV_COLUMNS)
         df.columns = df.columns.str.lower()
         
         if 'datetime' in df.columns and 'time' not in df.columns:
             df.rename(columns={'datetime': 'time'}, inplace=True)
         
-        candles = df.to_dict('records')
+        if USE_FLOAT32:
+            value_cols = [c for c in ('open', 'high', 'low', 'close', 'volume') if c in df.columns]
+            df[value_cols] = df[value_cols].astype('float32')
+        
+        # Parse timestamps once, as naive datetime64 (same wall time as the CSV),
+        # sorted so _slice_up_to can binary-search them
+        if 'time' in df.columns:
+            df['time'] = pd.to_datetime(df['time'], format='ISO8601')
+            if df['time'].dt.tz is not None:
+                df['time'] = df['time'].dt.tz_localize(None)
+            df = df.dropna(subset=['time'])
+            if not df['time'].is_monotonic_increasing:
+                df = df.sort_values('time', kind='stable')
+            df = df.reset_index(drop=True)
         
-        for c in candles:
-            if 'time' in c:
-                if isinstance(c['time'], str):
-                    c['time'] = pd.to_datetime(c['time'])
+        if PARQUET_AVAILABLE:
+            try:
+                PARQUET_CACHE_DIR.mkdir(exist_ok=True)
+                df.to_parquet(cache_path)
+            except Exception as e:
+                print(f"Could not write parquet cache {cache_path}: {e}")
         
-        return candles
+        return df
     except Exception as e:
         print(f"Error loading {filepath}: {e}")
+        return pd.DataFrame()
+
+
+def load_ohlcv_data(symbol: str, timeframe: str = "D") -> List[Dict]:
+    """Load OHLCV data for a symbol and timeframe."""
+    df = _load_ohlcv_df(symbol, timeframe)
+    if df.empty:
         return []
+    
+    # 'time' is already parsed to Timestamps by _load_ohlcv_df - no per-row coercion needed
+    return df.to_dict('records')
 
 
 def get_candles_up_to_date(candles: List[Dict], target_date: datetime) -> List[Dict]:
@@ -115,6 +177,61 @@ def get_candles_up_to_date(candles: List[Dict], target_date: datetime) -> List[D
     return result
 
 
+def _slice_up_to(df: pd.DataFrame, target_date: datetime) -> pd.DataFrame:
+    """
+    Rows of df whose candle date is <= target_date's date (no look-ahead).
+    
+    df['time'] is sorted at load, so the cut-off is a binary search and the result a prefix view.
+    """
+    if df.empty or 'time' not in df.columns:
+        return df
+    cutoff = pd.Timestamp(target_date)
+    if cutoff.tzinfo is not None:
+        cutoff = cutoff.tz_localize(None)
+    end = df['time'].searchsorted(cutoff.normalize() + pd.Timedelta(days=1), side='left')
+    return df.iloc[:end]
+
+
+@lru_cache(maxsize=256)
+def _prepare_context(symbol: str, date_str: str) -> Dict[str, Any]:
+    """
+    Direction-independent part of the analysis for one symbol/date (cached).
+    
+    Returns the candle count per timeframe and, if there is enough data, the four
+    timeframe slices as dicts plus the HTF trends. The returned slices are shared
+    between callers - do not modify them.
+    """
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    
+    # Slice to date as cheap DataFrame prefix views first
+    frames = {
+        "daily": _slice_up_to(_load_ohlcv_df(symbol, 'D'), date),
+        "weekly": _slice_up_to(_load_ohlcv_df(symbol, 'W'), date),
+        "monthly": _slice_up_to(_load_ohlcv_df(symbol, 'M'), date),
+        "h4": _slice_up_to(_load_ohlcv_df(symbol, 'H4'), date),
+    }
+    ctx = {
+        "counts": {tf: len(frame) for tf, frame in frames.items()},
+        "htf_trends": None,
+    }
+    
+    # Not enough history (e.g. date before the file starts) -> stop before any dict conversion
+    if ctx["counts"]["daily"] < 50 or ctx["counts"]["weekly"] < 10:
+        return ctx
+    
+    for tf, frame in frames.items():
+        ctx[tf] = frame.to_dict('records')
+    # Entry-timeframe candles for compute_confluence: H4, or the last 20 dailies when there is no H4
+    ctx["entry"] = ctx["h4"] if ctx["h4"] else ctx["daily"][-20:]
+    
+    ctx["htf_trends"] = {
+        "monthly": _infer_trend(ctx["monthly"]) if ctx["monthly"] else "mixed",
+        "weekly": _infer_trend(ctx["weekly"]) if ctx["weekly"] else "mixed",
+        "daily": _infer_trend(ctx["daily"]) if ctx["daily"] else "mixed",
+    }
+    return ctx
+
+
 def analyze_signal_on_date(
     symbol: str,
     date_str: str,
@@ -126,53 +243,47 @@ def analyze_signal_on_date(
     
     Returns comprehensive breakdown of all factors.
     """
-    date = datetime.strptime(date_str, "%Y-%m-%d")
-    
-    # Load all data
-    daily = load_ohlcv_data(symbol, 'D')
-    weekly = load_ohlcv_data(symbol, 'W')
-    monthly = load_ohlcv_data(symbol, 'M')
-    h4 = load_ohlcv_data(symbol, 'H4')
-    
-    # Slice to date
-    daily_slice = get_candles_up_to_date(daily, date)
-    weekly_slice = get_candles_up_to_date(weekly, date)
-    monthly_slice = get_candles_up_to_date(monthly, date)
-    h4_slice = get_candles_up_to_date(h4, date)
+    return _analyze_with_context(
+        _prepare_context(symbol, date_str), symbol, date_str, expected_direction, params)
+
+
+def _analyze_with_context(
+    ctx: Dict[str, Any],
+    symbol: str,
+    date_str: str,
+    expected_direction: str,
+    params: StrategyParams,
+) -> Dict[str, Any]:
+    """analyze_signal_on_date on an already prepared context (see _prepare_context)."""
+    counts = ctx["counts"]
     
     result = {
         "symbol": symbol,
         "date": date_str,
         "expected_direction": expected_direction,
-        "data_availability": {
-            "daily": len(daily_slice),
-            "weekly": len(weekly_slice),
-            "monthly": len(monthly_slice),
-            "h4": len(h4_slice),
-        },
+        "data_availability": dict(counts),
     }
     
     # Check data sufficiency
-    if len(daily_slice) < 50:
+    if counts["daily"] < 50:
         result["status"] = "INSUFFICIENT_DAILY_DATA"
-        result["reason"] = f"Only {len(daily_slice)} daily candles (need 50+)"
+        result["reason"] = f"Only {counts['daily']} daily candles (need 50+)"
         return result
     
-    if len(weekly_slice) < 10:
+    if counts["weekly"] < 10:
         result["status"] = "INSUFFICIENT_WEEKLY_DATA"
-        result["reason"] = f"Only {len(weekly_slice)} weekly candles (need 10+)"
+        result["reason"] = f"Only {counts['weekly']} weekly candles (need 10+)"
         return result
     
+    daily_slice = ctx["daily"]
+    weekly_slice = ctx["weekly"]
+    monthly_slice = ctx["monthly"]
+    
     # HTF trends
-    mn_trend = _infer_trend(monthly_slice) if monthly_slice else "mixed"
-    wk_trend = _infer_trend(weekly_slice) if weekly_slice else "mixed"
-    d_trend = _infer_trend(daily_slice) if daily_slice else "mixed"
-    
-    result["htf_trends"] = {
-        "monthly": mn_trend,
-        "weekly": wk_trend,
-        "daily": d_trend,
-    }
+    result["htf_trends"] = dict(ctx["htf_trends"])
+    mn_trend = result["htf_trends"]["monthly"]
+    wk_trend = result["htf_trends"]["weekly"]
+    d_trend = result["htf_trends"]["daily"]
     
     # Direction from bias
     direction, _, _ = _pick_direction_from_bias(mn_trend, wk_trend, d_trend)
@@ -184,7 +295,7 @@ def analyze_signal_on_date(
         monthly_slice,
         weekly_slice,
         daily_slice,
-        h4_slice if h4_slice else daily_slice[-20:],
+        ctx["entry"],
         direction,
         params,
         historical_sr=None,
@@ -192,15 +303,14 @@ def analyze_signal_on_date(
     
     entry, sl, tp1, tp2, tp3, tp4, tp5 = trade_levels
     
-    confluence_score = sum(1 for v in flags.values() if v)
-    
-    # Quality factors
-    has_location = flags.get("location", False)
-    has_fib = flags.get("fib", False)
-    has_liquidity = flags.get("liquidity", False)
-    has_structure = flags.get("structure", False)
-    has_htf_bias = flags.get("htf_bias", False)
-    quality_factors = sum([has_location, has_fib, has_liquidity, has_structure, has_htf_bias])
+    # Confluence score and quality factors in one pass over the flags
+    confluence_score = 0
+    quality_factors = 0
+    for flag, value in flags.items():
+        if value:
+            confluence_score += 1
+            if flag in _QUALITY_FLAGS:
+                quality_factors += 1
     
     result["confluence"] = {
         "score": confluence_score,
@@ -258,117 +368,126 @@ def analyze_discrepancy(
     """
     Analyze why a signal exists in one system but not the other.
     """
-    print("=" * 70)
-    print(f"DISCREPANCY ANALYSIS")
-    print("=" * 70)
-    print(f"\nSignal only in: {source}")
-    print(f"Date:           {date_str}")
-    print(f"Symbol:         {symbol}")
-    print(f"Direction:      {expected_direction}")
+    out: List[str] = []  # Whole report is written in one go at the end
+    out.append("=" * 70)
+    out.append(f"DISCREPANCY ANALYSIS")
+    out.append("=" * 70)
+    out.append(f"\nSignal only in: {source}")
+    out.append(f"Date:           {date_str}")
+    out.append(f"Symbol:         {symbol}")
+    out.append(f"Direction:      {expected_direction}")
     
     params = load_strategy_params()
-    print(f"\nParameters:")
-    print(f"  min_confluence:      {params.min_confluence}")
-    print(f"  min_quality_factors: {params.min_quality_factors}")
+    out.append(f"\nParameters:")
+    out.append(f"  min_confluence:      {params.min_confluence}")
+    out.append(f"  min_quality_factors: {params.min_quality_factors}")
     
     result = analyze_signal_on_date(symbol, date_str, expected_direction, params)
     
-    print(f"\n" + "-" * 70)
-    print("DATA AVAILABILITY")
-    print("-" * 70)
+    out.append(f"\n" + "-" * 70)
+    out.append("DATA AVAILABILITY")
+    out.append("-" * 70)
     for tf, count in result["data_availability"].items():
         status = "✅" if count >= (50 if tf == "daily" else 10 if tf == "weekly" else 1) else "❌"
-        print(f"  {tf:10}: {count:>4} candles {status}")
+        out.append(f"  {tf:10}: {count:>4} candles {status}")
     
     if "status" in result and result["status"] in ["INSUFFICIENT_DAILY_DATA", "INSUFFICIENT_WEEKLY_DATA"]:
-        print(f"\n❌ REASON: {result['reason']}")
+        out.append(f"\n❌ REASON: {result['reason']}")
+        sys.stdout.write("\n".join(out) + "\n")
         return
     
-    print(f"\n" + "-" * 70)
-    print("HTF TRENDS")
-    print("-" * 70)
+    out.append(f"\n" + "-" * 70)
+    out.append("HTF TRENDS")
+    out.append("-" * 70)
     for tf, trend in result["htf_trends"].items():
-        print(f"  {tf:10}: {trend}")
+        out.append(f"  {tf:10}: {trend}")
     
-    print(f"\n  Computed direction: {result['computed_direction']}")
-    print(f"  Expected direction: {expected_direction}")
+    out.append(f"\n  Computed direction: {result['computed_direction']}")
+    out.append(f"  Expected direction: {expected_direction}")
     match_status = "✅ MATCH" if result["direction_match"] else "❌ MISMATCH"
-    print(f"  Status:            {match_status}")
+    out.append(f"  Status:            {match_status}")
     
-    print(f"\n" + "-" * 70)
-    print("CONFLUENCE FLAGS")
-    print("-" * 70)
+    out.append(f"\n" + "-" * 70)
+    out.append("CONFLUENCE FLAGS")
+    out.append("-" * 70)
     for flag, status in result["flags"].items():
         note = result["notes"].get(flag, "")[:40]
-        print(f"  {status} {flag:15}: {note}")
+        out.append(f"  {status} {flag:15}: {note}")
     
     conf = result["confluence"]
     qual = result["quality"]
     
-    print(f"\n  Confluence: {conf['score']}/{conf['required']} {'✅ PASS' if conf['passes'] else '❌ FAIL'}")
-    print(f"  Quality:    {qual['score']}/{qual['required']} {'✅ PASS' if qual['passes'] else '❌ FAIL'}")
+    out.append(f"\n  Confluence: {conf['score']}/{conf['required']} {'✅ PASS' if conf['passes'] else '❌ FAIL'}")
+    out.append(f"  Quality:    {qual['score']}/{qual['required']} {'✅ PASS' if qual['passes'] else '❌ FAIL'}")
     
-    print(f"\n" + "-" * 70)
-    print("FINAL STATUS")
-    print("-" * 70)
-    print(f"  {result['status']}")
+    out.append(f"\n" + "-" * 70)
+    out.append("FINAL STATUS")
+    out.append("-" * 70)
+    out.append(f"  {result['status']}")
     
     if result["status"] != "ACTIVE":
-        print(f"\n  ⚠️  WHY NOT ACTIVE:")
+        out.append(f"\n  ⚠️  WHY NOT ACTIVE:")
         if not conf['passes']:
-            print(f"      - Confluence too low ({conf['score']} < {conf['required']})")
+            out.append(f"      - Confluence too low ({conf['score']} < {conf['required']})")
         if not qual['passes']:
-            print(f"      - Quality factors too low ({qual['score']} < {qual['required']})")
+            out.append(f"      - Quality factors too low ({qual['score']} < {qual['required']})")
         if not result["direction_match"]:
-            print(f"      - Direction mismatch (computed {result['computed_direction']}, expected {expected_direction})")
+            out.append(f"      - Direction mismatch (computed {result['computed_direction']}, expected {expected_direction})")
     
-    print(f"\n" + "-" * 70)
-    print("TRADE LEVELS")
-    print("-" * 70)
+    out.append(f"\n" + "-" * 70)
+    out.append("TRADE LEVELS")
+    out.append("-" * 70)
     levels = result["trade_levels"]
-    print(f"  Entry: {levels['entry']}")
-    print(f"  SL:    {levels['stop_loss']}")
-    print(f"  TP1:   {levels['tp1']}")
-    print(f"  TP2:   {levels['tp2']}")
-    print(f"  TP3:   {levels['tp3']}")
-    print(f"  TP4:   {levels['tp4']}")
-    print(f"  TP5:   {levels['tp5']}")
+    out.append(f"  Entry: {levels['entry']}")
+    out.append(f"  SL:    {levels['stop_loss']}")
+    out.append(f"  TP1:   {levels['tp1']}")
+    out.append(f"  TP2:   {levels['tp2']}")
+    out.append(f"  TP3:   {levels['tp3']}")
+    out.append(f"  TP4:   {levels['tp4']}")
+    out.append(f"  TP5:   {levels['tp5']}")
     
     if "last_daily_candle" in result:
-        print(f"\n" + "-" * 70)
-        print("LAST DAILY CANDLE")
-        print("-" * 70)
+        out.append(f"\n" + "-" * 70)
+        out.append("LAST DAILY CANDLE")
+        out.append("-" * 70)
         c = result["last_daily_candle"]
-        print(f"  Time:  {c['time']}")
-        print(f"  OHLC:  {c['open']:.5f} / {c['high']:.5f} / {c['low']:.5f} / {c['close']:.5f}")
+        out.append(f"  Time:  {c['time']}")
+        out.append(f"  OHLC:  {c['open']:.5f} / {c['high']:.5f} / {c['low']:.5f} / {c['close']:.5f}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def compare_both_directions(date_str: str, symbol: str) -> None:
     """
     Compare what both bullish and bearish would produce on a date.
     """
-    print("=" * 70)
-    print(f"DUAL DIRECTION ANALYSIS: {symbol} on {date_str}")
-    print("=" * 70)
+    out: List[str] = []  # Whole report is written in one go at the end
+    out.append("=" * 70)
+    out.append(f"DUAL DIRECTION ANALYSIS: {symbol} on {date_str}")
+    out.append("=" * 70)
     
     params = load_strategy_params()
+    # Data load, slicing and HTF trends are the same for both directions - do them once
+    ctx = _prepare_context(symbol, date_str)
     
     for direction in ["bullish", "bearish"]:
-        print(f"\n{'='*35}")
-        print(f"Direction: {direction.upper()}")
-        print(f"{'='*35}")
+        out.append(f"\n{'='*35}")
+        out.append(f"Direction: {direction.upper()}")
+        out.append(f"{'='*35}")
         
-        result = analyze_signal_on_date(symbol, date_str, direction, params)
+        result = _analyze_with_context(ctx, symbol, date_str, direction, params)
         
         if "status" in result and "INSUFFICIENT" in result.get("status", ""):
-            print(f"  ❌ {result['reason']}")
+            out.append(f"  ❌ {result['reason']}")
             continue
         
-        print(f"\n  HTF Trends: M={result['htf_trends']['monthly']}, W={result['htf_trends']['weekly']}, D={result['htf_trends']['daily']}")
-        print(f"  Computed direction: {result['computed_direction']}")
-        print(f"\n  Confluence: {result['confluence']['score']}/{result['confluence']['required']} {'✅' if result['confluence']['passes'] else '❌'}")
-        print(f"  Quality:    {result['quality']['score']}/{result['quality']['required']} {'✅' if result['quality']['passes'] else '❌'}")
-        print(f"\n  Status: {result['status']}")
+        out.append(f"\n  HTF Trends: M={result['htf_trends']['monthly']}, W={result['htf_trends']['weekly']}, D={result['htf_trends']['daily']}")
+        out.append(f"  Computed direction: {result['computed_direction']}")
+        out.append(f"\n  Confluence: {result['confluence']['score']}/{result['confluence']['required']} {'✅' if result['confluence']['passes'] else '❌'}")
+        out.append(f"  Quality:    {result['quality']['score']}/{result['quality']['required']} {'✅' if result['quality']['passes'] else '❌'}")
+        out.append(f"\n  Status: {result['status']}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -35,15 +35,28 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime, timedelta, timezone, date
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field
 from collections import defaultdict
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
 import logging
 
+try:
+    import pyarrow  # noqa: F401  (needed for the parquet cache)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Parquet copies of the CSVs live in <data_dir>/_parquet_cache/ (gitignored), shared with
+# analyze_discrepancy.py. Files are named <csv stem>.<format tag>.parquet; this loader stores
+# sorted, lowercased frames with UTC-aware times. Bump the tag when that format changes.
+PARQUET_CACHE_FORMAT = "utc-v1"
+
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -180,18 +193,28 @@ CONTRACT_SPECS = {
     "US30_USD": {"pip_size": 1.0, "contract_size": 1, "pip_value_per_lot": 1.0, "commission_per_lot": 0.0},
 }
 
+DEFAULT_SPECS = {"pip_size": 0.0001, "contract_size": 100000, "pip_value_per_lot": 10.0, "commission_per_lot": 4.0}
+
+# Same table keyed without underscores (CSV symbols are e.g. EURUSD); first key wins, like the old scan
+_SPECS_BY_CLEAN: Dict[str, Dict] = {}
+for _key, _specs in CONTRACT_SPECS.items():
+    _SPECS_BY_CLEAN.setdefault(_key.replace("_", ""), _specs)
+
+# symbol -> resolved specs (symbols come from a fixed set of CSV files)
+_specs_cache: Dict[str, Dict] = {}
+
+
 def get_specs(symbol: str) -> Dict:
     """Get contract specs for symbol."""
-    # Try exact match first
-    if symbol in CONTRACT_SPECS:
-        return CONTRACT_SPECS[symbol]
-    # Try without underscore
-    clean = symbol.replace("_", "")
-    for key, specs in CONTRACT_SPECS.items():
-        if key.replace("_", "") == clean:
-            return specs
-    # Default forex specs
-    return {"pip_size": 0.0001, "contract_size": 100000, "pip_value_per_lot": 10.0, "commission_per_lot": 4.0}
+    specs = _specs_cache.get(symbol)
+    if specs is not None:
+        return specs
+    # Try exact match first, then without underscore, then default forex specs
+    specs = CONTRACT_SPECS.get(symbol)
+    if specs is None:
+        specs = _SPECS_BY_CLEAN.get(symbol.replace("_", ""), DEFAULT_SPECS)
+    _specs_cache[symbol] = specs
+    return specs
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -208,7 +231,7 @@ class OrderStatus(Enum):
     CANCELLED = "cancelled"             # Cancelled (DDD halt, etc.)
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
     """Trading signal from compute_confluence()."""
     symbol: str
@@ -227,7 +250,7 @@ class Signal:
         self.risk = abs(self.entry - self.stop_loss)
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingSetup:
     """
     Pending trading setup - matches main_live_bot.py's PendingSetup class.
@@ -243,7 +266,7 @@ class PendingSetup:
             self.queue_time = self.signal.signal_time
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     Open position - matches main_live_bot.py's position management.
@@ -266,6 +289,7 @@ class Position:
     
     # Trailing SL
     trailing_sl: Optional[float] = None
+    progressive_trail_applied: bool = False  # Progressive trail only once per position
     
     # Final state
     closed: bool = False
@@ -273,9 +297,13 @@ class Position:
     exit_price: Optional[float] = None
     realized_pnl: float = 0.0
     realized_r: float = 0.0
+    
+    # Equity cache: last bar looked up (run() asks for equity several times per bar)
+    _last_equity_time: Optional[datetime] = field(default=None, repr=False, compare=False)
+    _last_equity_bar: Optional[Any] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class DailySnapshot:
     """Daily state snapshot for analysis."""
     date: str
@@ -296,6 +324,19 @@ class DailySnapshot:
 # DATA LOADING (CSV instead of MT5 API)
 # ═══════════════════════════════════════════════════════════════════════════
 
+class IntradayBar(NamedTuple):
+    """Single intraday bar (H1 or M15) returned by get_h1_bar."""
+    open: float
+    high: float
+    low: float
+    close: float
+    time: datetime
+
+
+# (times_ns, open, high, low, close) - parallel arrays sorted by time
+IntradayArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
 class CSVDataProvider:
     """
     Provides OHLCV data from CSV files.
@@ -305,8 +346,16 @@ class CSVDataProvider:
     def __init__(self, data_dir: Path = None, intraday_tf: str = "H1"):
         self.data_dir = data_dir or Path(__file__).parent.parent / "data" / "ohlcv"
         self.cache: Dict[str, pd.DataFrame] = {}
-        self.intraday_cache: Dict[str, Dict[datetime, Dict]] = {}
+        self.ts_cache: Dict[str, np.ndarray] = {}  # cache_key -> sorted int64 UTC ns times
+        # cache_key -> ((start, end), records) of the last window requested
+        self._records_cache: Dict[str, Tuple[Tuple[int, int], List[Dict]]] = {}
+        self.intraday_cache: Dict[str, IntradayArrays] = {}
         self.intraday_tf = intraday_tf  # "H1" or "M15"
+        # Per symbol, the index of the last bar returned; the backtest moves
+        # forward in time, so the next bar is usually at cursor + 1
+        self._h1_cursor: Dict[str, int] = {}
+        # Last (time, rounded time, int64 key): all positions ask for the same time within a bar
+        self._bar_key: Optional[Tuple[datetime, datetime, int]] = None
         
     def load_timeframe(self, symbol: str, timeframe: str) -> pd.DataFrame:
         """Load data for a specific timeframe."""
@@ -335,17 +384,79 @@ class CSVDataProvider:
         
         for path in patterns:
             if path.exists():
-                df = pd.read_csv(path, parse_dates=['time'])
-                df = df.sort_values('time').reset_index(drop=True)
-                
-                # Normalize column names to lowercase for consistency
-                df.columns = [c.lower() if c != 'time' else c for c in df.columns]
+                df = self._read_parquet_cache(path)
+                if df is None:
+                    df = pd.read_csv(path, parse_dates=['time'])
+                    df = df.sort_values('time').reset_index(drop=True)
+                    
+                    # Normalize column names to lowercase for consistency
+                    df.columns = [c.lower() if c != 'time' else c for c in df.columns]
+                    # CSV times are UTC: store tz-aware once so lookups need no tz handling
+                    df['time'] = pd.to_datetime(df['time'], utc=True)
+                    self._write_parquet_cache(path, df)
                 
                 self.cache[cache_key] = df
                 return df
         
         return pd.DataFrame()
     
+    def _parquet_cache_path(self, csv_path: Path) -> Path:
+        return self.data_dir / "_parquet_cache" / f"{csv_path.stem}.{PARQUET_CACHE_FORMAT}.parquet"
+    
+    def _read_parquet_cache(self, csv_path: Path) -> Optional[pd.DataFrame]:
+        """Return the cached parquet copy of csv_path if it is newer than the CSV."""
+        if not PARQUET_AVAILABLE:
+            return None
+        pq_path = self._parquet_cache_path(csv_path)
+        try:
+            if pq_path.stat().st_mtime < csv_path.stat().st_mtime:
+                return None
+            return pd.read_parquet(pq_path, engine='pyarrow', memory_map=True)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(f"Could not read parquet cache {pq_path}: {e}")
+            return None
+    
+    def _write_parquet_cache(self, csv_path: Path, df: pd.DataFrame) -> None:
+        """Store the parsed CSV as parquet so the next run skips CSV parsing."""
+        if not PARQUET_AVAILABLE:
+            return
+        pq_path = self._parquet_cache_path(csv_path)
+        try:
+            pq_path.parent.mkdir(exist_ok=True)
+            df.to_parquet(pq_path, engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            log.warning(f"Could not write parquet cache {pq_path}: {e}")
+    
+    def preload_all(
+        self,
+        symbols: List[str],
+        timeframes: Optional[List[str]] = None,
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Load all symbol/timeframe CSVs up front in parallel.
+        
+        pd.read_csv spends most of its time in the C parser, so threads
+        overlap well. Results land in self.cache (one key per task), so
+        later load_timeframe calls are plain cache hits.
+        """
+        if timeframes is None:
+            timeframes = ["MN", "W1", "D1", "H4", self.intraday_tf]
+        
+        tasks = [
+            (symbol, tf) for symbol in symbols for tf in timeframes
+            if f"{symbol}_{tf}" not in self.cache
+        ]
+        if not tasks:
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="csv-preload") as pool:
+            futures = [pool.submit(self.load_timeframe, symbol, tf) for symbol, tf in tasks]
+            for future in futures:
+                future.result()
+    
     def get_candle_data(self, symbol: str, as_of: datetime) -> Dict[str, List[Dict]]:
         """
         Get multi-timeframe candle data as of a specific time.
@@ -384,85 +495,148 @@ class CSVDataProvider:
         Returns:
             DataFrame with OHLCV data, or None if not available
         """
+        window = self._ohlcv_window(symbol, timeframe, as_of, lookback)
+        if window is None:
+            return None
+        df, start, end = window
+        return df.iloc[start:end].reset_index(drop=True)
+    
+    def get_ohlcv_records(self, symbol: str, timeframe: str, as_of: datetime, lookback: int = 100) -> Optional[List[Dict]]:
+        """
+        Same bars as get_ohlcv(), as a list of candle dicts for compute_confluence().
+        
+        The last window per symbol/timeframe is memoised on its (start, end) rows:
+        MN and W1 windows stay the same for weeks of daily scans, so their
+        to_dict('records') conversion is reused. Returns a fresh list each call.
+        """
+        window = self._ohlcv_window(symbol, timeframe, as_of, lookback)
+        if window is None:
+            return None
+        df, start, end = window
+        
+        cache_key = f"{symbol}_{timeframe}"
+        cached = self._records_cache.get(cache_key)
+        if cached is not None and cached[0] == (start, end):
+            return list(cached[1])
+        
+        records = df.iloc[start:end].to_dict('records')
+        self._records_cache[cache_key] = ((start, end), records)
+        return list(records)
+    
+    def _ohlcv_window(self, symbol: str, timeframe: str, as_of: datetime, lookback: int) -> Optional[Tuple[pd.DataFrame, int, int]]:
+        """Locate the last `lookback` rows strictly before as_of: (df, start, end) or None."""
         df = self.load_timeframe(symbol, timeframe)
         if df.empty:
             return None
         
-        # Ensure timezone-aware comparison
+        # Naive as_of is taken as UTC (df times are UTC since load_timeframe)
         as_of_ts = pd.Timestamp(as_of)
         if as_of_ts.tzinfo is None:
             as_of_ts = as_of_ts.tz_localize('UTC')
         
-        # Make df time column timezone aware if needed
-        if df['time'].dt.tz is None:
-            df['time'] = df['time'].dt.tz_localize('UTC')
-        
-        # Filter to data BEFORE as_of (no look-ahead bias)
-        df_filtered = df[df['time'] < as_of_ts].copy()
-        
-        if df_filtered.empty:
+        cache_key = f"{symbol}_{timeframe}"
+        ts = self.ts_cache.get(cache_key)
+        if ts is None:
+            ts = pd.DatetimeIndex(df['time']).as_unit('ns').asi8
+            self.ts_cache[cache_key] = ts
+        
+        # Bars strictly BEFORE as_of (no look-ahead bias); df is sorted on time
+        end = int(np.searchsorted(ts, as_of_ts.value, side='left'))
+        if end == 0:
             return None
         
-        # Return last 'lookback' bars
-        return df_filtered.tail(lookback).reset_index(drop=True)
+        # Last 'lookback' bars
+        start = max(0, end - lookback)
+        return df, start, end
     
-    def build_h1_index(self, symbol: str) -> Dict[datetime, Dict]:
-        """Build fast lookup index for intraday data (H1 or M15)."""
+    def build_h1_index(self, symbol: str) -> IntradayArrays:
+        """
+        Build fast lookup index for intraday data (H1 or M15).
+        
+        Stored as parallel numpy arrays (times as int64 UTC nanoseconds),
+        sorted on time, so get_h1_bar can binary-search instead of hashing
+        a datetime per lookup.
+        """
         if symbol in self.intraday_cache:
             return self.intraday_cache[symbol]
         
         df = self.load_timeframe(symbol, self.intraday_tf)
         if df.empty:
-            self.intraday_cache[symbol] = {}
-            return {}
-        
-        index = {}
-        for _, row in df.iterrows():
-            t = row['time']
-            if isinstance(t, pd.Timestamp):
-                t = t.to_pydatetime()
-            if t.tzinfo is None:
-                t = t.replace(tzinfo=timezone.utc)
-            index[t] = {
-                'open': row['open'],
-                'high': row['high'],
-                'low': row['low'],
-                'close': row['close'],
-                'time': t,
-            }
-        
+            empty = np.empty(0, dtype=np.float64)
+            index = (np.empty(0, dtype=np.int64), empty, empty, empty, empty)
+            self.intraday_cache[symbol] = index
+            return index
+        
+        index = (
+            pd.DatetimeIndex(df['time']).as_unit('ns').asi8,
+            df['open'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+        )
         self.intraday_cache[symbol] = index
         return index
     
-    def get_h1_bar(self, symbol: str, time: datetime) -> Optional[Dict]:
+    def get_h1_bar(self, symbol: str, time: datetime) -> Optional[IntradayBar]:
         """Get intraday bar for specific time (H1 or M15)."""
-        index = self.build_h1_index(symbol)
+        times_ns, opens, highs, lows, closes = self.build_h1_index(symbol)
         
-        # Normalize time based on timeframe
-        if self.intraday_tf == "M15":
-            # Round to nearest 15-min
-            minutes = (time.minute // 15) * 15
-            t = time.replace(minute=minutes, second=0, microsecond=0)
+        if self._bar_key is not None and self._bar_key[0] == time:
+            _, t, key = self._bar_key
         else:
-            # Round to hour
-            t = time.replace(minute=0, second=0, microsecond=0)
-        
-        if t.tzinfo is None:
-            t = t.replace(tzinfo=timezone.utc)
-        
-        return index.get(t)
+            # Normalize time based on timeframe
+            if self.intraday_tf == "M15":
+                # Round to nearest 15-min
+                minutes = (time.minute // 15) * 15
+                t = time.replace(minute=minutes, second=0, microsecond=0)
+            else:
+                # Round to hour
+                t = time.replace(minute=0, second=0, microsecond=0)
+            
+            if t.tzinfo is None:
+                t = t.replace(tzinfo=timezone.utc)
+            
+            # Seconds/microseconds are already 0, so this is exact
+            key = int(t.timestamp()) * 1_000_000_000
+            self._bar_key = (time, t, key)
+        
+        # Fast path: the same bar as last time, or the next one
+        n = len(times_ns)
+        cursor = self._h1_cursor.get(symbol, 0)
+        for idx in (cursor, cursor + 1):
+            if idx < n and times_ns[idx] == key and (idx + 1 == n or times_ns[idx + 1] != key):
+                break
+        else:
+            # side='right' - 1: with duplicate timestamps the last row wins
+            idx = int(np.searchsorted(times_ns, key, side='right')) - 1
+            if idx < 0 or times_ns[idx] != key:
+                return None
+        
+        self._h1_cursor[symbol] = idx
+        return IntradayBar(
+            float(opens[idx]), float(highs[idx]), float(lows[idx]), float(closes[idx]), t
+        )
     
     def get_h1_timeline(self, start: datetime, end: datetime) -> List[datetime]:
         """Get all intraday timestamps (H1 or M15) in range across all symbols."""
-        all_times = set()
+        start_ns = pd.Timestamp(start).value
+        end_ns = pd.Timestamp(end).value
         
+        # Cut each symbol to the [start, end] window, then take one sorted int64 union
+        windows = []
         for symbol in self.get_available_symbols():
-            index = self.build_h1_index(symbol)
-            for t in index.keys():
-                if start <= t <= end:
-                    all_times.add(t)
-        
-        return sorted(all_times)
+            times_ns = self.build_h1_index(symbol)[0]
+            lo = np.searchsorted(times_ns, start_ns, side='left')
+            hi = np.searchsorted(times_ns, end_ns, side='right')
+            if hi > lo:
+                windows.append(times_ns[lo:hi])
+        
+        if not windows:
+            return []
+        
+        all_ns = reduce(np.union1d, windows[1:], np.unique(windows[0]))
+        # Convert back to datetime once at the end (the run loop works with datetimes)
+        return list(pd.DatetimeIndex(all_ns, tz='UTC').to_pydatetime())
     
     def get_available_symbols(self) -> List[str]:
         """Get list of available symbols."""
@@ -535,6 +709,10 @@ class BacktestMainLiveBot:
         self.pending_setups: Dict[str, PendingSetup] = {}  # Entry queue
         self.open_positions: Dict[str, Position] = {}
         self.closed_trades: List[Position] = []
+        # Columns of closed_trades for the final stats (capacity doubles when full)
+        self._closed_pnl = np.empty(256, dtype=np.float64)
+        self._closed_r = np.empty(256, dtype=np.float64)
+        self._closed_count = 0
         
         # DDD/TDD state (matching main_live_bot.py)
         self.ddd_halted = False
@@ -542,6 +720,14 @@ class BacktestMainLiveBot:
         self.ddd_halt_date: Optional[date] = None
         self.current_date: Optional[date] = None
         
+        # Read the DDD/TDD thresholds from CONFIG once (check_ddd/check_tdd run every bar)
+        self._ddd_limits = (
+            CONFIG.daily_loss_halt_pct,
+            CONFIG.daily_loss_reduce_pct,
+            CONFIG.daily_loss_warning_pct,
+        )
+        self._tdd_limit = CONFIG.max_total_dd_pct
+        
         # Track last scan date to prevent duplicates (CRITICAL for M15)
         self.last_scan_date: Optional[date] = None
         
@@ -589,7 +775,7 @@ class BacktestMainLiveBot:
         equity = self.balance
         
         for pos in self.open_positions.values():
-            bar = self.data_provider.get_h1_bar(pos.signal.symbol, current_time)
+            bar = self._equity_bar(pos, current_time)
             if not bar:
                 continue
             
@@ -597,15 +783,15 @@ class BacktestMainLiveBot:
             if use_price == 'worst':
                 # Worst case: Low for longs, High for shorts
                 if pos.signal.direction == 'bullish':
-                    current_price = bar['low']
+                    current_price = bar.low
                 else:
-                    current_price = bar['high']
+                    current_price = bar.high
             elif use_price == 'low':
-                current_price = bar['low']
+                current_price = bar.low
             elif use_price == 'high':
-                current_price = bar['high']
+                current_price = bar.high
             else:
-                current_price = bar['close']
+                current_price = bar.close
             
             # Calculate floating PnL
             if pos.signal.direction == 'bullish':
@@ -622,6 +808,45 @@ class BacktestMainLiveBot:
         
         return equity
     
+    def calculate_worst_and_close_equity(self, current_time: datetime) -> Tuple[float, float]:
+        """
+        Worst-case and close equity in one pass over the open positions.
+        Same result as calculate_equity(t, 'worst') and calculate_equity(t, 'close').
+        """
+        worst_equity = self.balance
+        close_equity = self.balance
+        
+        for pos in self.open_positions.values():
+            bar = self._equity_bar(pos, current_time)
+            if not bar:
+                continue
+            
+            signal = pos.signal
+            risk = signal.risk
+            if risk <= 0:
+                continue  # 0R -> no floating PnL
+            
+            # Worst case: Low for longs, High for shorts
+            if signal.direction == 'bullish':
+                worst_diff = bar.low - pos.fill_price
+                close_diff = bar.close - pos.fill_price
+            else:
+                worst_diff = pos.fill_price - bar.high
+                close_diff = pos.fill_price - bar.close
+            
+            # Same order as calculate_equity: (diff / risk) * risk_usd * remaining
+            worst_equity += worst_diff / risk * pos.risk_usd * pos.remaining_pct
+            close_equity += close_diff / risk * pos.risk_usd * pos.remaining_pct
+        
+        return worst_equity, close_equity
+    
+    def _equity_bar(self, pos: Position, current_time: datetime) -> Optional[IntradayBar]:
+        """Intraday bar for a position, looked up once per timestamp."""
+        if pos._last_equity_time != current_time:
+            pos._last_equity_bar = self.data_provider.get_h1_bar(pos.signal.symbol, current_time)
+            pos._last_equity_time = current_time
+        return pos._last_equity_bar
+    
     # ═══════════════════════════════════════════════════════════════════════
     # DDD/TDD CHECKS (EXACT COPY from main_live_bot.py)
     # ═══════════════════════════════════════════════════════════════════════
@@ -634,18 +859,19 @@ class BacktestMainLiveBot:
         Returns: (dd_pct, action)
         action: 'ok', 'warning', 'reduce', 'halt'
         """
-        if self.day_start_equity <= 0:
+        day_start = self.day_start_equity
+        if day_start <= 0:
             return 0.0, 'ok'
         
         # DDD = (day_start - current) / day_start * 100
-        daily_pnl = equity - self.day_start_equity
-        dd_pct = abs(min(0, daily_pnl)) / self.day_start_equity * 100
+        dd_pct = (day_start - equity) / day_start * 100 if equity < day_start else 0.0
         
-        if dd_pct >= CONFIG.daily_loss_halt_pct:
+        halt_pct, reduce_pct, warning_pct = self._ddd_limits
+        if dd_pct >= halt_pct:
             return dd_pct, 'halt'
-        elif dd_pct >= CONFIG.daily_loss_reduce_pct:
+        elif dd_pct >= reduce_pct:
             return dd_pct, 'reduce'
-        elif dd_pct >= CONFIG.daily_loss_warning_pct:
+        elif dd_pct >= warning_pct:
             return dd_pct, 'warning'
         return dd_pct, 'ok'
     
@@ -660,7 +886,7 @@ class BacktestMainLiveBot:
             return 0.0, False
         
         dd_pct = (self.initial_balance - equity) / self.initial_balance * 100
-        breached = dd_pct >= CONFIG.max_total_dd_pct
+        breached = dd_pct >= self._tdd_limit
         return dd_pct, breached
     
     # ═══════════════════════════════════════════════════════════════════════
@@ -679,7 +905,7 @@ class BacktestMainLiveBot:
             pos = self.open_positions[symbol]
             bar = self.data_provider.get_h1_bar(symbol, current_time)
             if bar:
-                self._close_position(pos, current_time, bar['close'], reason)
+                self._close_position(pos, current_time, bar.close, reason)
         
         # Cancel all pending setups
         cancelled_count = len(self.pending_setups)
@@ -720,12 +946,23 @@ class BacktestMainLiveBot:
         
         # Move to closed trades
         self.closed_trades.append(pos)
+        self._record_closed(pos)
         symbol = pos.signal.symbol
         if symbol in self.open_positions:
             del self.open_positions[symbol]
         
         log.debug(f"  Closed {symbol}: {reason} | PnL: ${pos.realized_pnl:+.2f} ({pos.realized_r:+.2f}R)")
     
+    def _record_closed(self, pos: Position):
+        """Append a closed trade's PnL/R to the columnar arrays."""
+        n = self._closed_count
+        if n == len(self._closed_pnl):
+            self._closed_pnl = np.resize(self._closed_pnl, 2 * n)
+            self._closed_r = np.resize(self._closed_r, 2 * n)
+        self._closed_pnl[n] = pos.realized_pnl
+        self._closed_r[n] = pos.realized_r
+        self._closed_count = n + 1
+    
     # ═══════════════════════════════════════════════════════════════════════
     # SIGNAL PROCESSING (matching main_live_bot.py's scan_symbol())
     # ═══════════════════════════════════════════════════════════════════════
@@ -750,11 +987,12 @@ class BacktestMainLiveBot:
             
             # Get multi-timeframe data (EXACT same as main_live_bot.py)
             # Data should be sliced to BEFORE current_time (no look-ahead bias)
+            # (as list of dicts for compute_confluence; MN/W1 conversions are reused between days)
             try:
-                monthly_data = self.data_provider.get_ohlcv(symbol, 'MN', current_time, lookback=12)
-                weekly_data = self.data_provider.get_ohlcv(symbol, 'W1', current_time, lookback=52)
-                daily_data = self.data_provider.get_ohlcv(symbol, 'D1', current_time, lookback=100)
-                h4_data = self.data_provider.get_ohlcv(symbol, 'H4', current_time, lookback=100)
+                monthly_data = self.data_provider.get_ohlcv_records(symbol, 'MN', current_time, lookback=12)
+                weekly_data = self.data_provider.get_ohlcv_records(symbol, 'W1', current_time, lookback=52)
+                daily_data = self.data_provider.get_ohlcv_records(symbol, 'D1', current_time, lookback=100)
+                h4_data = self.data_provider.get_ohlcv_records(symbol, 'H4', current_time, lookback=100)
             except Exception as e:
                 log.debug(f"  [{symbol}] Data error: {e}")
                 continue
@@ -764,11 +1002,10 @@ class BacktestMainLiveBot:
             if weekly_data is None or len(weekly_data) < 10:
                 continue
             
-            # Convert to list of dicts for compute_confluence
-            monthly_candles = monthly_data.to_dict('records') if monthly_data is not None and len(monthly_data) > 0 else []
-            weekly_candles = weekly_data.to_dict('records') if weekly_data is not None else []
-            daily_candles = daily_data.to_dict('records') if daily_data is not None else []
-            h4_candles = h4_data.to_dict('records') if h4_data is not None else daily_candles[-20:]
+            monthly_candles = monthly_data or []
+            weekly_candles = weekly_data
+            daily_candles = daily_data
+            h4_candles = h4_data if h4_data is not None else daily_candles[-20:]
             
             # Infer trends (EXACT same as main_live_bot.py)
             mn_trend = _infer_trend(monthly_candles) if monthly_candles else "mixed"
@@ -866,17 +1103,24 @@ class BacktestMainLiveBot:
         Process entry queue - check if price is close enough for entry.
         EXACT copy of main_live_bot.py's _process_awaiting_entry().
         """
-        for symbol in list(self.pending_setups.keys()):
-            setup = self.pending_setups[symbol]
-            
-            if setup.status != OrderStatus.AWAITING_ENTRY:
-                continue
-            
+        # Only setups still awaiting entry; placed limit orders (PENDING) are handled by
+        # process_pending_orders. Snapshot, because fills/expiry delete from the dict.
+        awaiting = [
+            (symbol, setup) for symbol, setup in self.pending_setups.items()
+            if setup.status == OrderStatus.AWAITING_ENTRY
+        ]
+        if not awaiting:
+            return
+        
+        # Expiry cutoff once per bar: queue_time < cutoff <=> waited longer than max_entry_wait_hours
+        expiry_cutoff = current_time - timedelta(hours=CONFIG.max_entry_wait_hours)
+        
+        for symbol, setup in awaiting:
             signal = setup.signal
             
             # Check expiry (120 hours = 5 days)
-            hours_waiting = (current_time - setup.queue_time).total_seconds() / 3600
-            if hours_waiting > CONFIG.max_entry_wait_hours:
+            if setup.queue_time < expiry_cutoff:
+                hours_waiting = (current_time - setup.queue_time).total_seconds() / 3600
                 log.debug(f"  [{symbol}] Entry expired after {hours_waiting:.0f}h")
                 setup.status = OrderStatus.EXPIRED
                 del self.pending_setups[symbol]
@@ -887,7 +1131,7 @@ class BacktestMainLiveBot:
             if not bar:
                 continue
             
-            current_price = bar['close']
+            current_price = bar.close
             
             # Calculate distance to entry in R
             entry = signal.entry
@@ -918,8 +1162,6 @@ class BacktestMainLiveBot:
         ddd_pct, _ = self.check_ddd(self.calculate_equity(current_time))
         risk_pct = CONFIG.get_risk_pct(ddd_pct)
         
-        specs = get_specs(symbol)
-        
         lot_result = calculate_lot_size(
             symbol=symbol,
             account_balance=self.balance,  # Current balance for compounding
@@ -990,8 +1232,8 @@ class BacktestMainLiveBot:
             if not bar:
                 continue
             
-            high = bar['high']
-            low = bar['low']
+            high = bar.high
+            low = bar.low
             entry = signal.entry
             
             # Check if price touched entry
@@ -1015,8 +1257,6 @@ class BacktestMainLiveBot:
         ddd_pct, _ = self.check_ddd(self.calculate_equity(current_time))
         risk_pct = CONFIG.get_risk_pct(ddd_pct)
         
-        specs = get_specs(symbol)
-        
         lot_result = calculate_lot_size(
             symbol=symbol,
             account_balance=self.balance,
@@ -1072,9 +1312,9 @@ class BacktestMainLiveBot:
             if not bar:
                 continue
             
-            high = bar['high']
-            low = bar['low']
-            close_price = bar['close']
+            high = bar.high
+            low = bar.low
+            close_price = bar.close
             
             signal = pos.signal
             risk = signal.risk
@@ -1128,7 +1368,7 @@ class BacktestMainLiveBot:
         
         # PROGRESSIVE TRAILING: Between TP1 and TP2, at trigger R move SL to trail level
         # Check BEFORE TP1 if trail_to_r < tp1_r, otherwise progressive trail gets skipped
-        if not pos.tp2_hit and self.use_progressive_trailing and not getattr(pos, 'progressive_trail_applied', False):
+        if not pos.tp2_hit and self.use_progressive_trailing and not pos.progressive_trail_applied:
             # Calculate current R
             if signal.direction == 'bullish':
                 current_r = (high - signal.entry) / risk if risk > 0 else 0
@@ -1197,8 +1437,9 @@ class BacktestMainLiveBot:
         
         log.info(f"  Symbols: {len(symbols)}")
         
-        # Pre-build H1 indices
+        # Load all CSVs in parallel, then pre-build H1 indices
         print(f"Loading {self.intraday_tf} data for {len(symbols)} symbols...")
+        self.data_provider.preload_all(symbols)
         for i, symbol in enumerate(symbols, 1):
             print(f"  [{i}/{len(symbols)}] {symbol}...", end='\r', flush=True)
             self.data_provider.build_h1_index(symbol)
@@ -1271,8 +1512,7 @@ class BacktestMainLiveBot:
             # DDD/TDD PROTECTION (matching main_live_bot.py's 5-sec loop)
             # ═══════════════════════════════════════════════════════════════
             # Calculate worst-case equity (using H1 High/Low)
-            worst_equity = self.calculate_equity(current_time, use_price='worst')
-            close_equity = self.calculate_equity(current_time, use_price='close')
+            worst_equity, close_equity = self.calculate_worst_and_close_equity(current_time)
             
             day_low_equity = min(day_low_equity, worst_equity)
             day_high_equity = max(day_high_equity, close_equity)
@@ -1352,7 +1592,7 @@ class BacktestMainLiveBot:
                 pos = self.open_positions[symbol]
                 bar = self.data_provider.get_h1_bar(symbol, last_time)
                 if bar:
-                    self._close_position(pos, last_time, bar['close'], "END")
+                    self._close_position(pos, last_time, bar.close, "END")
         
         # ═══════════════════════════════════════════════════════════════════
         # RESULTS
@@ -1361,12 +1601,16 @@ class BacktestMainLiveBot:
     
     def _compile_results(self, max_ddd: float, max_tdd: float) -> Dict[str, Any]:
         """Compile simulation results."""
-        total_trades = len(self.closed_trades)
-        winners = sum(1 for t in self.closed_trades if t.realized_pnl > 0)
+        total_trades = self._closed_count
+        pnl = self._closed_pnl[:total_trades]
+        r_multiples = self._closed_r[:total_trades]
+        
+        winners = int(np.count_nonzero(pnl > 0))
         losers = total_trades - winners
         
-        total_pnl = sum(t.realized_pnl for t in self.closed_trades)
-        total_r = sum(t.realized_r for t in self.closed_trades)
+        # cumsum adds left to right like sum() (np.sum uses pairwise summation)
+        total_pnl = float(pnl.cumsum()[-1]) if total_trades else 0.0
+        total_r = float(r_multiples.cumsum()[-1]) if total_trades else 0.0
         
         results = {
             'initial_balance': self.initial_balance,
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test the fallback news blackout schedule in main_live_bot.py
+
+The fallback windows are precomputed per weekday and searched with bisect.
+These tests compare that against the straightforward per-event datetime check
+it replaced, over a full week and on the exact window boundaries.
+"""
+
+import logging
+import signal
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# main_live_bot installs SIGINT/SIGTERM handlers on import, and tradr.utils.logger wraps
+# stdout/stderr in UTF-8 TextIOWrappers (which would close pytest's capture files when
+# collected). Import it, then hand pytest back its own handlers and streams.
+# The "tradr" logger is registered up front without handlers, so setup_logger() hands
+# main_live_bot that logger instead of one writing to logs/tradr_live.log.
+_saved_handlers = {s: signal.getsignal(s) for s in (signal.SIGINT, signal.SIGTERM)}
+_saved_streams = (sys.stdout, sys.stderr)
+from tradr.utils import logger as tradr_logger  # noqa: E402
+tradr_logger._loggers.setdefault("tradr", logging.getLogger("tradr"))
+import main_live_bot as mlb  # noqa: E402
+for _sig, _handler in _saved_handlers.items():
+    signal.signal(_sig, _handler)
+for _log_handler in list(logging.getLogger("tradr").handlers):
+    if isinstance(_log_handler, logging.FileHandler):
+        logging.getLogger("tradr").removeHandler(_log_handler)
+        _log_handler.close()
+for _wrapped, _original in zip((sys.stdout, sys.stderr), _saved_streams):
+    if _wrapped is not _original:
+        for _log_handler in logging.getLogger("tradr").handlers:
+            if getattr(_log_handler, "stream", None) is _wrapped:
+                _log_handler.setStream(_original)
+        _wrapped.detach()
+sys.stdout, sys.stderr = _saved_streams
+
+
+class NoCalendarMT5:
+    """MT5 stub whose economic calendar is unavailable, forcing the fallback schedule."""
+    def get_high_impact_news(self, hours_ahead, hours_behind):
+        raise RuntimeError("calendar unavailable")
+
+
+def reference_blackout(now):
+    """The original per-event loop: inclusive [event - before, event + after] on the event's weekday."""
+    cfg = mlb.FIVEERS_CONFIG
+    for day_of_week, hour, minute in cfg.major_news_events:
+        if now.weekday() != day_of_week:
+            continue
+        news_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        blackout_start = news_time - timedelta(minutes=cfg.news_blackout_minutes_before)
+        blackout_end = news_time + timedelta(minutes=cfg.news_blackout_minutes_after)
+        if blackout_start <= now <= blackout_end:
+            return True
+    return False
+
+
+def make_bot():
+    """LiveTradingBot without __init__ (no MT5 connection), with fresh news windows."""
+    bot = mlb.LiveTradingBot.__new__(mlb.LiveTradingBot)
+    bot.mt5 = NoCalendarMT5()
+    bot._news_windows = bot._build_news_windows()
+    return bot
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze main_live_bot's datetime.now(); set clock.now_value to move it."""
+    class FrozenDatetime(datetime):
+        now_value = None
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(mlb, "datetime", FrozenDatetime)
+    return FrozenDatetime
+
+
+def assert_matches_reference(bot, clock, times):
+    for now in times:
+        clock.now_value = now
+        assert bot.is_news_blackout() == reference_blackout(now), now
+
+
+def week_sweep(step_seconds=30):
+    """Every step over one Monday-Sunday week, plus a sub-second offset to exercise fractions."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)  # Monday
+    t = start
+    while t < start + timedelta(days=7):
+        yield t
+        yield t + timedelta(microseconds=500_000)
+        t += timedelta(seconds=step_seconds)
+
+
+def boundary_times(now_day, events, before, after):
+    """Exact window edges and the microseconds just outside them."""
+    one_us = timedelta(microseconds=1)
+    for day_of_week, hour, minute in events:
+        day = now_day + timedelta(days=(day_of_week - now_day.weekday()) % 7)
+        event = day.replace(hour=hour, minute=minute)
+        start = event - timedelta(minutes=before)
+        end = event + timedelta(minutes=after)
+        for t in (start - one_us, start, start + one_us, event, end - one_us, end, end + one_us):
+            yield t
+
+
+def test_week_sweep_matches_reference(clock):
+    """The bisect lookup agrees with the per-event loop over a whole week."""
+    bot = make_bot()
+    assert_matches_reference(bot, clock, week_sweep())
+
+
+def test_window_edges_are_inclusive(clock):
+    """Start and end of each window block; one microsecond outside does not."""
+    cfg = mlb.FIVEERS_CONFIG
+    bot = make_bot()
+    monday = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    times = list(boundary_times(monday, cfg.major_news_events,
+                                cfg.news_blackout_minutes_before, cfg.news_blackout_minutes_after))
+    assert_matches_reference(bot, clock, times)
+
+    day_of_week, hour, minute = cfg.major_news_events[0]
+    event = monday + timedelta(days=day_of_week, hours=hour, minutes=minute)
+    for t, expected in (
+        (event - timedelta(minutes=cfg.news_blackout_minutes_before), True),
+        (event + timedelta(minutes=cfg.news_blackout_minutes_after), True),
+        (event - timedelta(minutes=cfg.news_blackout_minutes_before, microseconds=1), False),
+        (event + timedelta(minutes=cfg.news_blackout_minutes_after, microseconds=1), False),
+    ):
+        clock.now_value = t
+        assert bot.is_news_blackout() is expected, t
+
+
+def test_overlapping_and_midnight_windows_match_reference(clock, monkeypatch):
+    """Several events on one day (overlapping windows) and windows that cross midnight."""
+    events = [
+        (0, 0, 10),    # Window starts the previous evening - only Monday's part counts
+        (0, 8, 30),
+        (0, 9, 0),     # Overlaps the 08:30 window
+        (0, 23, 50),   # Window runs past midnight - Tuesday morning is not blacked out
+        (2, 12, 0),
+        (2, 12, 0),    # Duplicate event
+    ]
+    monkeypatch.setattr(mlb.FIVEERS_CONFIG, "major_news_events", events)
+    bot = make_bot()
+    monday = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    times = list(boundary_times(monday, events, mlb.FIVEERS_CONFIG.news_blackout_minutes_before,
+                                mlb.FIVEERS_CONFIG.news_blackout_minutes_after))
+    assert_matches_reference(bot, clock, times)
+    assert_matches_reference(bot, clock, week_sweep(step_seconds=60))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test params_loader caching
+
+Verifies that the cached params file is re-read when it changes, that
+save_optimized_params drops the cache, and that callers get private copies.
+"""
+
+import json
+import math
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from params import params_loader
+
+
+def _write_params(path, min_confluence):
+    """Write a params file in the optimizer's nested format (plus the top-level getter key)."""
+    data = {
+        "optimization_mode": "test",
+        "min_confluence": min_confluence,
+        "parameters": {"min_confluence": min_confluence, "min_quality_factors": 2},
+    }
+    path.write_text(json.dumps(data, indent=2))
+
+
+@pytest.fixture
+def params_file(tmp_path, monkeypatch):
+    """Point PARAMS_FILE at a temp file and start/end with an empty cache."""
+    path = tmp_path / "current_params.json"
+    _write_params(path, 3)
+    monkeypatch.setattr(params_loader, "PARAMS_FILE", path)
+    params_loader.invalidate_params_cache()
+    yield path
+    params_loader.invalidate_params_cache()
+
+
+def _strict_loads(blob):
+    """Parse like orjson does: NaN/Infinity tokens are a decode error."""
+    def reject(token):
+        raise json.JSONDecodeError(f"unexpected {token}", "", 0)
+    return json.loads(blob, parse_constant=reject)
+
+
+# Stand-in for orjson's parser, which rejects the NaN/Infinity tokens json.dumps writes
+STRICT_JSON_LIB = SimpleNamespace(loads=_strict_loads, JSONDecodeError=json.JSONDecodeError)
+
+
+def test_file_rewrite_is_picked_up(params_file):
+    """Rewriting the params file must not keep serving the old parse."""
+    assert params_loader.load_params_dict()["parameters"]["min_confluence"] == 3
+    assert params_loader.load_strategy_params().min_confluence == 3
+    assert params_loader.get_min_confluence() == 3
+
+    _write_params(params_file, 11)
+    # Make sure the mtime moves even on filesystems with coarse timestamps
+    stat = params_file.stat()
+    os.utime(params_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert params_loader.load_params_dict()["parameters"]["min_confluence"] == 11
+    assert params_loader.load_strategy_params().min_confluence == 11
+    assert params_loader.get_min_confluence() == 11
+
+
+def test_save_optimized_params_invalidates_cache(params_file):
+    """save_optimized_params drops the cache, so the next load reads the new file."""
+    assert params_loader.load_strategy_params().min_confluence == 3
+    assert params_loader._params_cache is not None
+
+    params_loader.save_optimized_params(
+        {"parameters": {"min_confluence": 7, "min_quality_factors": 2}}, backup=False
+    )
+
+    assert params_loader._params_cache is None
+    assert params_loader._strategy_params_cache is None
+    assert params_loader.load_params_dict()["parameters"]["min_confluence"] == 7
+    assert params_loader.load_strategy_params().min_confluence == 7
+
+
+def test_load_params_dict_returns_private_copy(params_file):
+    """Mutating a returned dict (including nested values) must not leak into the cache."""
+    first = params_loader.load_params_dict()
+    first["parameters"]["min_confluence"] = 99
+    first["optimization_mode"] = "mutated"
+    del first["parameters"]["min_quality_factors"]
+
+    second = params_loader.load_params_dict()
+    assert second["parameters"]["min_confluence"] == 3
+    assert second["parameters"]["min_quality_factors"] == 2
+    assert second["optimization_mode"] == "test"
+
+
+def test_load_strategy_params_returns_private_copy(params_file):
+    """Changing a returned StrategyParams must not change the next one handed out."""
+    first = params_loader.load_strategy_params()
+    first.min_confluence = 99
+
+    second = params_loader.load_strategy_params()
+    assert second is not first
+    assert second.min_confluence == 3
+
+
+@pytest.mark.parametrize("json_lib", [json, STRICT_JSON_LIB], ids=["stdlib", "strict"])
+def test_saved_non_finite_values_read_back(params_file, monkeypatch, json_lib):
+    """A NaN/Inf metric saved by save_optimized_params must not break the getters."""
+    monkeypatch.setattr(params_loader, "_json_lib", json_lib)
+    params_loader.save_optimized_params(
+        {
+            "min_confluence": 5,
+            "parameters": {"min_confluence": 5, "min_quality_factors": 2},
+            "metrics": {"sharpe": float("nan"), "profit_factor": float("inf")},
+        },
+        backup=False,
+    )
+
+    data = params_loader.load_params_dict()
+    assert math.isnan(data["metrics"]["sharpe"])
+    assert data["metrics"]["profit_factor"] == float("inf")
+    assert params_loader.load_strategy_params().min_confluence == 5
+    assert params_loader.get_min_confluence() == 5
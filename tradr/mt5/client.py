@@ -62,6 +62,8 @@ class TradeResult:
     price: float = 0.0
     volume: float = 0.0
     error: str = ""
+    retcode: int = 0  # MT5 trade server return code on failure (0 = unknown / no reply)
+    sl_modified: bool = False  # partial_close_and_modify: SL update accepted
 
 
 class MT5Client:
@@ -386,6 +388,33 @@ class MT5Client:
             spread=tick.ask - tick.bid,
         )
     
+    def get_ticks(self, symbols) -> Dict[str, TickData]:
+        """
+        Get current ticks for several symbols in one pass.
+        
+        Symbols without a tick are left out of the result.
+        """
+        if not self.connected:
+            return {}
+        
+        mt5 = self._import_mt5()
+        symbol_info_tick = mt5.symbol_info_tick
+        ticks = {}
+        
+        for symbol in symbols:
+            tick = symbol_info_tick(symbol)
+            if tick is None:
+                continue
+            ticks[symbol] = TickData(
+                symbol=symbol,
+                bid=tick.bid,
+                ask=tick.ask,
+                time=datetime.fromtimestamp(tick.time, tz=timezone.utc),
+                spread=tick.ask - tick.bid,
+            )
+        
+        return ticks
+    
     def get_ohlcv(
         self,
         symbol: str,
@@ -596,7 +625,7 @@ class MT5Client:
         
         if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
             error = result.comment if result else "Unknown error"
-            return TradeResult(success=False, error=error)
+            return TradeResult(success=False, error=error, retcode=result.retcode if result else 0)
         
         return TradeResult(
             success=True,
@@ -606,6 +635,18 @@ class MT5Client:
             volume=result.volume,
         )
     
+    def close_positions_bulk(self, tickets: List[int]) -> List[TradeResult]:
+        """
+        Close several positions one after another (emergency close path).
+        
+        Returns:
+            One TradeResult per ticket, in the same order as tickets
+        """
+        if not self.connected:
+            return [TradeResult(success=False, error="Not connected") for _ in tickets]
+        
+        return [self.close_position(ticket) for ticket in tickets]
+    
     def partial_close(self, ticket: int, volume: float) -> TradeResult:
         """
         Partially close a position by volume.
@@ -626,7 +667,11 @@ class MT5Client:
         if not position:
             return TradeResult(success=False, error=f"Position {ticket} not found")
         
-        position = position[0]
+        return self._send_partial_close(mt5, position[0], volume)
+    
+    def _send_partial_close(self, mt5, position, volume: float) -> TradeResult:
+        """Send the partial-close deal for an already fetched position."""
+        ticket = position.ticket
         symbol = position.symbol
         current_volume = position.volume
         
@@ -669,7 +714,11 @@ class MT5Client:
         
         if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
             error = result.comment if result else "Unknown error"
-            return TradeResult(success=False, error=f"Partial close failed: {error}")
+            return TradeResult(
+                success=False,
+                error=f"Partial close failed: {error}",
+                retcode=result.retcode if result else 0,
+            )
         
         return TradeResult(
             success=True,
@@ -679,6 +728,47 @@ class MT5Client:
             volume=result.volume,
         )
     
+    def partial_close_and_modify(self, ticket: int, volume: float, new_sl: float) -> TradeResult:
+        """
+        Partially close a position and move its SL right after the deal.
+        
+        The position is fetched once; the SLTP request is sent straight after
+        the partial deal instead of via a second modify_sl_tp() lookup. If the
+        broker rejects the SL, retry once straight away through the regular
+        modify_sl_tp() path, which re-reads the settled position.
+        
+        Returns:
+            TradeResult of the partial close, with sl_modified set
+        """
+        if not self.connected:
+            return TradeResult(success=False, error="Not connected")
+        
+        mt5 = self._import_mt5()
+        
+        position = mt5.positions_get(ticket=ticket)
+        if not position:
+            return TradeResult(success=False, error=f"Position {ticket} not found")
+        position = position[0]
+        
+        result = self._send_partial_close(mt5, position, volume)
+        if not result.success:
+            return result
+        
+        request = {
+            "action": mt5.TRADE_ACTION_SLTP,
+            "symbol": position.symbol,
+            "position": ticket,
+            "sl": new_sl,
+            "tp": position.tp,
+        }
+        sl_result = mt5.order_send(request)
+        if sl_result is not None and sl_result.retcode == mt5.TRADE_RETCODE_DONE:
+            result.sl_modified = True
+        else:
+            result.sl_modified = self.modify_sl_tp(ticket, sl=new_sl)
+        
+        return result
+    
     def get_positions(self, symbol: str = None) -> List[Position]:
         """Get open positions."""
         if not self.connected:
@@ -927,6 +1017,31 @@ class MT5Client:
         
         return result is not None and result.retcode == mt5.TRADE_RETCODE_DONE
     
+    def cancel_pending_orders_bulk(self, tickets: List[int]) -> List[bool]:
+        """
+        Cancel several pending orders back-to-back.
+        
+        Sends the TRADE_ACTION_REMOVE requests in a tight loop (one import,
+        no per-order lookups) - use when many orders must go at once.
+        
+        Returns:
+            One success flag per ticket, in the same order as tickets
+        """
+        if not self.connected:
+            return [False] * len(tickets)
+        
+        mt5 = self._import_mt5()
+        order_send = mt5.order_send
+        remove_action = mt5.TRADE_ACTION_REMOVE
+        done = mt5.TRADE_RETCODE_DONE
+        
+        results = []
+        for ticket in tickets:
+            result = order_send({"action": remove_action, "order": ticket})
+            results.append(result is not None and result.retcode == done)
+        
+        return results
+    
     def get_pending_orders(self, symbol: str = None) -> List[PendingOrder]:
         """Get pending orders, optionally filtered by symbol."""
         if not self.connected: